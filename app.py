@@ -1,17 +1,21 @@
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 import os
-import json
-import sqlite3
 from werkzeug.utils import secure_filename
-from datetime import datetime
 import PyPDF2
-import docx2txt
-from custom_resume_parser import ResumeParser
-import csv
+from ner_routing import DEFAULT_ROUTING
+from ingest_queue import IngestQueue, QueueFullError, StageTimer
+from job_index import JobIndex
+from job_catalog import JobCatalog
+from job_sync import sync_job_matches
+from resume_search import clamp_page, highlight, search_fts
+from db import (get_connection, init_db, insert_job_matches, insert_resume, load_job_matches, load_resume,
+                store_ranked_matches)
+from pagination import DEFAULT_PER_PAGE, clamp_per_page, job_matches_page, list_jobs_page, list_resumes_page
+from parse_cache import ParseCache
+from text_extraction import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_SPILL_THRESHOLD, UploadedResume
 from PyPDF2 import PdfReader
 from io import StringIO
 from pdfminer.high_level import extract_text as pdfminer_extract_text
-import fitz
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -22,127 +26,154 @@ UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
-# Create uploads directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs('models/resume_ner_model', exist_ok=True)
-
-# Initialize the custom resume parser
-resume_parser = ResumeParser('models/resume_ner_model')
-
-# Load job descriptions
-
-
-def load_jobs_from_csv(file_path='data/jobs/all_job_post.csv'):
-    jobs = []
-    with open(file_path, 'r') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            jobs.append({
-                "id": int(row["job_id"]),
-                "category": row["category"],
-                "title": row["job_title"],
-                "description": row["job_description"],
-                "skills": [skill.strip().lower() for skill in eval(row["job_skill_set"])]
-            })
-    return jobs
-
-# Initialize database
-def init_db():
-    conn = sqlite3.connect('resumes.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS resumes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        phone TEXT,
-        skills TEXT,
-        education TEXT,
-        experience TEXT,
-        job_titles TEXT,
-        companies TEXT,
-        projects TEXT,
-        certifications TEXT,
-        uploaded_at TIMESTAMP,
-        filename TEXT,
-        raw_text TEXT
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS job_matches (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        resume_id INTEGER,
-        job_id INTEGER,
-        job_title TEXT,
-        match_score REAL,
-        FOREIGN KEY (resume_id) REFERENCES resumes (id)
-    )
-    ''')
-    
-    conn.commit()
-    conn.close()
+# Uploads are parsed from memory; larger files spill to a temp file, and originals
+# are only kept (named by content hash) when archiving is enabled
+app.config['UPLOAD_SPILL_THRESHOLD'] = int(os.environ.get('RESUME_UPLOAD_SPILL_BYTES', DEFAULT_SPILL_THRESHOLD))
+app.config['ARCHIVE_UPLOADS'] = os.environ.get('RESUME_ARCHIVE_UPLOADS', '0') == '1'
+
+# Page/character budget for PDF extraction (0 disables a limit)
+app.config['PDF_MAX_PAGES'] = int(os.environ.get('RESUME_PDF_MAX_PAGES', DEFAULT_MAX_PAGES))
+app.config['PDF_MAX_CHARS'] = int(os.environ.get('RESUME_PDF_MAX_CHARS', DEFAULT_MAX_CHARS))
 
-init_db()
+# Ingest mode: 'sync' parses in the request, 'async' queues to background workers
+app.config['INGEST_MODE'] = os.environ.get('RESUME_INGEST_MODE', 'sync')
+app.config['INGEST_WORKERS'] = int(os.environ.get('RESUME_INGEST_WORKERS', 2))
+app.config['INGEST_QUEUE_SIZE'] = int(os.environ.get('RESUME_INGEST_QUEUE_SIZE', 32))
+
+# Where entities come from: 'custom', 'hybrid' (custom + en_core_web_sm names) or 'statistical'
+app.config['NER_ROUTING'] = os.environ.get('RESUME_NER_ROUTING', DEFAULT_ROUTING)
+
+# Share of the TF-IDF text similarity in job match scores (0 = skill overlap only)
+app.config['MATCH_TEXT_WEIGHT'] = float(os.environ.get('RESUME_MATCH_TEXT_WEIGHT', 0))
+
+# Shared objects used by the routes, created by create_app()
+resume_parser = None
+job_catalog = None
+parse_cache = None
+ingest_queue = None
+catalog_sync_queue = None
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(pdf_path):
+def match_jobs(skills, jobs, top_k=10):
+    """Return the top job matches for a list of skills, given a job list or a prebuilt JobIndex."""
+    if not isinstance(jobs, JobIndex):
+        jobs = JobIndex(jobs)
+    return jobs.match(skills, top_k=top_k)
+
+def process_resume(upload, filename, timer=None):
+    """
+    Run the full ingest pipeline for an uploaded resume.
+
+    Args:
+        upload: UploadedResume holding the file bytes (or its spilled temp file)
+        filename: Original (secured) file name stored with the record
+        timer: Optional StageTimer collecting per-stage timings
+
+    Returns:
+        int: The id of the new resume row
+    """
+    timer = timer or StageTimer()
+    conn = get_connection()
+
+    # Re-uploads of the same file with the same models reuse the earlier parse
+    file_hash = upload.content_hash
+    with timer.stage('cache_lookup'):
+        cached_resume_id = parse_cache.lookup(conn, file_hash)
+    if cached_resume_id is not None:
+        app.logger.debug("Parse cache hit for %s: resume %s", filename, cached_resume_id)
+        return cached_resume_id
+
+    # Extract text from resume
+    with timer.stage('extract'):
+        text = upload.extract_text(max_pages=app.config['PDF_MAX_PAGES'], max_chars=app.config['PDF_MAX_CHARS'])
+    if not text:
+        raise ValueError('Could not extract text from the file')
+
+    # Parse resume using custom NER model
+    with timer.stage('parse'):
+        parsed_data = resume_parser.parse(text, timer)
+
+    # Match jobs; job_matches keeps skill-overlap scores, blended rankings are stored apart
+    with timer.stage('match'):
+        job_matches = match_jobs(parsed_data["skills"], job_catalog.index())
+        text_weight = app.config['MATCH_TEXT_WEIGHT']
+        ranked_matches = None
+        if text_weight:
+            ranked_matches = job_catalog.vector_index().match(text, parsed_data["skills"], text_weight=text_weight)
+
+    # Store in database
+    with timer.stage('store'):
+        with conn:
+            cursor = conn.cursor()
+
+            resume_id = insert_resume(cursor, parsed_data, filename, text)
+            insert_job_matches(cursor, resume_id, job_matches)
+            if ranked_matches is not None:
+                store_ranked_matches(cursor, [(resume_id, ranked_matches)], text_weight)
+
+            parse_ms = sum(timer.stages[stage] for stage in ('extract', 'parse', 'match'))
+            parse_cache.store(conn, file_hash, resume_id, parse_ms)
+
+    return resume_id
+
+def _run_ingest_job(payload, timer):
     try:
-        # Extract text using PyMuPDF (fitz)
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-    except Exception as e:
-        print(f"PyMuPDF extraction failed: {e}")
-        text = ""
-
-    # Normalize whitespace to ensure only one newline between paragraphs
-    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
-
-def extract_text_from_docx(docx_path):
-    text = docx2txt.process(docx_path)
-    # Clean up and normalize whitespace
-    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
-
-def extract_text(file_path):
-    if file_path.endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx') or file_path.endswith('.doc'):
-        return extract_text_from_docx(file_path)
-    return ""
-
-def match_jobs(skills, jobs):
-    # Normalize skills to lowercase for matching
-    normalized_skills = [skill.lower() for skill in skills]
-    matches = []
-
-    for job in jobs:
-        # Calculate match score based on job skills
-        matched_skills = [skill for skill in job["skills"] if skill in normalized_skills]
-        match_score = len(matched_skills) / len(job["skills"]) if job["skills"] else 0
-
-        # Add to matches if score is above threshold
-        if match_score > 0:
-            matches.append({
-            "job_id": job["id"],
-            "job_title": job["title"],
-            "match_score": match_score,
-            "category": job["category"],
-            "matched_skills": matched_skills,
-            "total_skills": len(job["skills"])
-            })
-
-        # Sort matches by score (descending)
-        matches.sort(key=lambda x: x["match_score"], reverse=True)
-
-        # Limit to top 10 matches
-        matches = matches[:10]
-    matches.sort(key=lambda x: x["match_score"], reverse=True)
-    return matches
+        resume_id = process_resume(payload["upload"], payload["filename"], timer)
+    finally:
+        payload["upload"].close()
+    return {"resume_id": resume_id}
+
+def _run_catalog_sync(jobs, timer):
+    with timer.stage('sync'):
+        return sync_job_matches(get_connection(), jobs)
+
+def create_app():
+    """
+    Create the upload and model directories, the database schema and the objects the routes share.
+
+    Importing this module has no side effects, so the processes it spawns (PDF page
+    workers re-import the main script) stay lean. Serve it with `python app.py` or
+    through the factory, e.g. `flask --app "app:create_app()" run`.
+
+    Returns:
+        Flask: The initialized application
+    """
+    global resume_parser, job_catalog, parse_cache, ingest_queue, catalog_sync_queue
+    # Imported here: spaCy is only needed by a process that serves requests
+    from custom_resume_parser import ResumeParser
+
+    # Create uploads directory if it doesn't exist
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    os.makedirs('models/resume_ner_model', exist_ok=True)
+
+    # Initialize the custom resume parser (spaCy models are loaded lazily through the
+    # shared model registry the first time a resume is parsed)
+    resume_parser = ResumeParser('models/resume_ner_model', routing=app.config['NER_ROUTING'])
+
+    # Load job descriptions (cached, re-read only when the CSV changes)
+    job_catalog = JobCatalog()
+
+    # Initialize database
+    init_db()
+
+    # Content-addressed cache of already parsed uploads
+    parse_cache = ParseCache('models/resume_ner_model', routing=app.config['NER_ROUTING'],
+                             text_weight=app.config['MATCH_TEXT_WEIGHT'], max_pages=app.config['PDF_MAX_PAGES'],
+                             max_chars=app.config['PDF_MAX_CHARS'])
+
+    # Background ingest workers used when uploads are processed asynchronously
+    ingest_queue = IngestQueue(
+        _run_ingest_job,
+        num_workers=app.config['INGEST_WORKERS'],
+        max_queue_size=app.config['INGEST_QUEUE_SIZE']
+    )
+
+    # One background worker for catalog syncs; at most one more sync waits behind a running one
+    catalog_sync_queue = IngestQueue(_run_catalog_sync, num_workers=1, max_queue_size=1)
+
+    return app
 
 @app.route('/')
 def index():
@@ -162,213 +193,231 @@ def upload_file():
     
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # Read the upload once, hashing it on the way; no copy lands in uploads/
+        upload = UploadedResume(file.stream, filename, app.config['UPLOAD_SPILL_THRESHOLD'])
+        if app.config['ARCHIVE_UPLOADS']:
+            upload.archive(app.config['UPLOAD_FOLDER'])
+
+        # Async ingest: accept the upload now and let a worker do the rest
+        if app.config['INGEST_MODE'] == 'async' or request.args.get('async') == '1':
+            try:
+                job_id = ingest_queue.submit({"upload": upload, "filename": filename}, filename=filename)
+            except QueueFullError as e:
+                upload.close()
+                response = jsonify({'error': str(e)})
+                response.headers['Retry-After'] = '5'
+                return response, 429
+            status_url = url_for('get_job_status', job_id=job_id)
+            return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': status_url}), 202, {'Location': status_url}
         
         try:
-            # Extract text from resume
-            text = extract_text(filepath)
-            print(f"Extracted text: {text}...")  # Print first 100 characters for debugging
-            if not text:
-                flash('Could not extract text from the file')
-                return redirect(url_for('index'))
-            
-            # Parse resume using custom NER model
-            parsed_data = resume_parser.parse(text)
-            
-            # Match jobs
-            # Load jobs from CSV
-            job_data = load_jobs_from_csv()
-
-            # Match jobs
-            job_matches = match_jobs(parsed_data["skills"], job_data)
-            
-            # Store in database
-            conn = sqlite3.connect('resumes.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO resumes (
-                name, email, phone, skills, education, experience, 
-                job_titles, companies, projects, certifications, 
-                uploaded_at, filename, raw_text
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                parsed_data["name"],
-                parsed_data["email"],
-                parsed_data["phone"],
-                json.dumps(parsed_data["skills"]),
-                json.dumps(parsed_data["education"]),
-                json.dumps(parsed_data["experience"]),
-                json.dumps(parsed_data["job_titles"]),
-                json.dumps(parsed_data["companies"]),
-                json.dumps(parsed_data["projects"]),
-                json.dumps(parsed_data["certifications"]),
-                datetime.now(),
-                filename,
-                text
-            ))
-            
-            resume_id = cursor.lastrowid
-            
-            # Store job matches
-            for match in job_matches:
-                cursor.execute('''
-                INSERT INTO job_matches (resume_id, job_id, job_title, match_score)
-                VALUES (?, ?, ?, ?)
-                ''', (
-                    resume_id,
-                    match["job_id"],
-                    match["job_title"],
-                    match["match_score"]
-                ))
-            
-            conn.commit()
-            conn.close()
-            
+            resume_id = process_resume(upload, filename)
             return redirect(url_for('view_resume', resume_id=resume_id))
         
         except Exception as e:
             flash(f'Error analyzing resume: {str(e)}')
             return redirect(url_for('index'))
+        finally:
+            upload.close()
     
     flash('File type not allowed')
     return redirect(url_for('index'))
 
+@app.route('/api/jobs/<job_id>/status')
+def get_job_status(job_id):
+    job = ingest_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    result = job.pop('result') or {}
+    job['resume_id'] = result.get('resume_id')
+    job['view_url'] = url_for('view_resume', resume_id=job['resume_id']) if job['resume_id'] else None
+    job['queue_depth'] = ingest_queue.depth()
+    return jsonify(job)
+
 @app.route('/view/<int:resume_id>')
 def view_resume(resume_id):
-    conn = sqlite3.connect('resumes.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM resumes WHERE id = ?', (resume_id,))
-    resume = cursor.fetchone()
-    if not resume:
+    conn = get_connection()
+    resume_dict = load_resume(conn, resume_id)
+    if not resume_dict:
         flash('Resume not found')
-        conn.close()
         return redirect(url_for('index'))
 
-    # Get job matches
-    cursor.execute('SELECT * FROM job_matches WHERE resume_id = ? ORDER BY match_score DESC', (resume_id,))
-    job_matches = cursor.fetchall()
-    conn.close()
-
-    # Convert to dict and parse JSON fields
-    resume_dict = dict(resume)
-    resume_dict['skills'] = json.loads(resume_dict['skills']) if resume_dict['skills'] else []
-    resume_dict['education'] = json.loads(resume_dict['education']) if resume_dict['education'] else []
-    resume_dict['experience'] = json.loads(resume_dict['experience']) if resume_dict['experience'] else []
-    resume_dict['job_titles'] = json.loads(resume_dict['job_titles']) if resume_dict['job_titles'] else []
-    resume_dict['companies'] = json.loads(resume_dict['companies']) if resume_dict['companies'] else []
-    resume_dict['projects'] = json.loads(resume_dict['projects']) if resume_dict['projects'] else []
-    resume_dict['certifications'] = json.loads(resume_dict['certifications']) if resume_dict['certifications'] else []
-
-    # Calculate the resume score
-    parser = ResumeParser()
-    resume_dict['score'] = parser.calculate_resume_score(resume_dict)
+    # Get the best job matches
+    job_matches = load_job_matches(conn, resume_id)
+
+    # Calculate the resume score (pure arithmetic, no model needed)
+    resume_dict['score'] = resume_parser.calculate_resume_score(resume_dict)
 
     return render_template('view_resume.html', resume=resume_dict, job_matches=job_matches)
+def _page_args():
+    return request.args.get('cursor', ''), request.args.get('per_page', DEFAULT_PER_PAGE, type=int)
+
 @app.route('/resumes')
 def list_resumes():
-    conn = sqlite3.connect('resumes.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT id, name, email, uploaded_at FROM resumes ORDER BY uploaded_at DESC')
-    resumes = cursor.fetchall()
-    conn.close()
+    cursor, per_page = _page_args()
+    try:
+        resumes, next_cursor = list_resumes_page(get_connection(), cursor, per_page)
+    except ValueError:
+        flash('Invalid page link, showing the first page')
+        return redirect(url_for('list_resumes'))
     
-    return render_template('resumes.html', resumes=resumes)
+    return render_template('resumes.html', resumes=resumes, cursor=cursor, next_cursor=next_cursor,
+                           per_page=clamp_per_page(per_page))
+
+@app.route('/api/resumes')
+def list_resumes_json():
+    cursor, per_page = _page_args()
+    try:
+        resumes, next_cursor = list_resumes_page(get_connection(), cursor, per_page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'per_page': clamp_per_page(per_page), 'next_cursor': next_cursor, 'results': resumes})
 
 @app.route('/jobs')
 def list_jobs():
-    jobs = load_jobs_from_csv()
-    return render_template('jobs.html', jobs=jobs)
+    cursor, per_page = _page_args()
+    try:
+        jobs, next_cursor = list_jobs_page(job_catalog, cursor, per_page)
+    except ValueError:
+        flash('Invalid page link, showing the first page')
+        return redirect(url_for('list_jobs'))
+    return render_template('jobs.html', jobs=jobs, cursor=cursor, next_cursor=next_cursor,
+                           per_page=clamp_per_page(per_page))
+
+@app.route('/api/catalog/jobs')
+def list_jobs_json():
+    cursor, per_page = _page_args()
+    try:
+        jobs, next_cursor = list_jobs_page(job_catalog, cursor, per_page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'per_page': clamp_per_page(per_page), 'next_cursor': next_cursor, 'results': jobs})
 
 @app.route('/job/<int:job_id>')
 def view_job(job_id):
-    jobs = load_jobs_from_csv()
-    job = next((job for job in jobs if job["id"] == job_id), None)
+    job = job_catalog.get(job_id)
     
     if not job:
         flash('Job not found')
         return redirect(url_for('list_jobs'))
     
-    # Fetch matching resumes for the job
-    conn = sqlite3.connect('resumes.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    # Fetch one page of matching resumes for the job
+    cursor, per_page = _page_args()
+    try:
+        matching_resumes, next_cursor = job_matches_page(get_connection(), job_id, cursor, per_page)
+    except ValueError:
+        flash('Invalid page link, showing the first page')
+        return redirect(url_for('view_job', job_id=job_id))
     
-    cursor.execute('''
-    SELECT r.id, r.name, r.email, jm.match_score 
-    FROM resumes r
-    JOIN job_matches jm ON r.id = jm.resume_id
-    WHERE jm.job_id = ?
-    ORDER BY jm.match_score DESC
-    ''', (job_id,))
+    return render_template('view_job.html', job=job, matching_resumes=matching_resumes, cursor=cursor,
+                           next_cursor=next_cursor, per_page=clamp_per_page(per_page))
+
+@app.route('/api/catalog/jobs/<int:job_id>')
+def get_job_json(job_id):
+    job = job_catalog.get(job_id)
     
-    matching_resumes = cursor.fetchall()
-    conn.close()
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
     
-    return render_template('view_job.html', job=job, matching_resumes=matching_resumes)
+    cursor, per_page = _page_args()
+    try:
+        matches, next_cursor = job_matches_page(get_connection(), job_id, cursor, per_page)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'job': job, 'per_page': clamp_per_page(per_page), 'next_cursor': next_cursor,
+                    'matching_resumes': matches})
+
+def _search_args():
+    query = request.args.get('query', '')
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    return (query,) + clamp_page(page, per_page)
+
 @app.route('/search')
 def search_resumes():
-    query = request.args.get('query', '')
+    query, page, per_page = _search_args()
     
     if not query:
         return redirect(url_for('list_resumes'))
     
-    conn = sqlite3.connect('resumes.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    conn = get_connection()
     
-    # Search in name, email, skills, raw_text
-    cursor.execute('''
-    SELECT id, name, email, uploaded_at FROM resumes 
-    WHERE name LIKE ? OR email LIKE ? OR skills LIKE ? OR raw_text LIKE ? 
-    ORDER BY uploaded_at DESC
-    ''', (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
+    # Ranked full-text search over name, email, skills and raw_text
+    resumes, has_next = search_fts(conn, query, page, per_page)
     
-    resumes = cursor.fetchall()
-    conn.close()
+    for resume in resumes:
+        resume['snippet'] = highlight(resume['snippet'])
     
-    return render_template('resumes.html', resumes=resumes, query=query)
+    return render_template('resumes.html', resumes=resumes, query=query, page=page, per_page=per_page, has_next=has_next)
 
-@app.route('/api/resume/<int:resume_id>')
-def get_resume_json(resume_id):
-    conn = sqlite3.connect('resumes.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+@app.route('/api/search')
+def search_resumes_json():
+    query, page, per_page = _search_args()
     
-    cursor.execute('SELECT * FROM resumes WHERE id = ?', (resume_id,))
-    resume = cursor.fetchone()
+    if not query:
+        return jsonify({'error': 'Missing query'}), 400
     
-    if not resume:
-        conn.close()
-        return jsonify({'error': 'Resume not found'}), 404
+    conn = get_connection()
+    resumes, has_next = search_fts(conn, query, page, per_page)
     
-    # Get job matches
-    cursor.execute('SELECT job_id, job_title, match_score FROM job_matches WHERE resume_id = ? ORDER BY match_score DESC', (resume_id,))
-    job_matches = cursor.fetchall()
+    for resume in resumes:
+        resume['snippet'] = str(highlight(resume['snippet']))
+    
+    return jsonify({'query': query, 'page': page, 'per_page': per_page, 'has_next': has_next, 'results': resumes})
+
+@app.route('/api/resume/<int:resume_id>')
+def get_resume_json(resume_id):
+    conn = get_connection()
     
-    conn.close()
+    resume_dict = load_resume(conn, resume_id)
     
-    # Convert to dict and parse JSON fields
-    resume_dict = dict(resume)
-    resume_dict['skills'] = json.loads(resume_dict['skills']) if resume_dict['skills'] else []
-    resume_dict['education'] = json.loads(resume_dict['education']) if resume_dict['education'] else []
-    resume_dict['experience'] = json.loads(resume_dict['experience']) if resume_dict['experience'] else []
-    resume_dict['job_titles'] = json.loads(resume_dict['job_titles']) if resume_dict['job_titles'] else []
-    resume_dict['companies'] = json.loads(resume_dict['companies']) if resume_dict['companies'] else []
-    resume_dict['projects'] = json.loads(resume_dict['projects']) if resume_dict['projects'] else []
-    resume_dict['certifications'] = json.loads(resume_dict['certifications']) if resume_dict['certifications'] else []
-    resume_dict['job_matches'] = [dict(match) for match in job_matches]
+    if not resume_dict:
+        return jsonify({'error': 'Resume not found'}), 404
     
-    # Remove raw text to reduce response size
-    if 'raw_text' in resume_dict:
-        del resume_dict['raw_text']
+    # Get the best job matches
+    resume_dict['job_matches'] = [dict(match) for match in load_job_matches(conn, resume_id)]
     
     return jsonify(resume_dict)
 
+@app.route('/api/catalog/stats')
+def get_catalog_stats():
+    return jsonify(job_catalog.stats())
+
+@app.route('/api/catalog/sync', methods=['POST'])
+def sync_catalog_matches():
+    # Rescore only the jobs added or changed since the last sync against all stored
+    # resumes, in the background; poll the status URL for the result
+    try:
+        jobs = job_catalog.all()
+    except FileNotFoundError:
+        return jsonify({'error': 'Job catalog not found'}), 404
+    try:
+        sync_id = catalog_sync_queue.submit(jobs)
+    except QueueFullError:
+        response = jsonify({'error': 'A catalog sync is already queued'})
+        response.headers['Retry-After'] = '30'
+        return response, 429
+    status_url = url_for('get_catalog_sync_status', sync_id=sync_id)
+    return jsonify({'sync_id': sync_id, 'status': 'queued', 'status_url': status_url}), 202, {'Location': status_url}
+
+@app.route('/api/catalog/sync/<sync_id>')
+def get_catalog_sync_status(sync_id):
+    sync = catalog_sync_queue.get(sync_id)
+    if not sync:
+        return jsonify({'error': 'Sync not found'}), 404
+    return jsonify(sync)
+
+@app.route('/api/cache/stats')
+def get_parse_cache_stats():
+    return jsonify(parse_cache.stats())
+
+@app.route('/api/models')
+def get_model_stats():
+    from model_registry import registry
+
+    # Load time and memory of every spaCy model loaded by this process
+    return jsonify(registry.stats())
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
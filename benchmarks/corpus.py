@@ -0,0 +1,47 @@
+import glob
+import json
+import os
+import random
+
+CORPUS_DIR = "data/json"
+
+
+def load_corpus(corpus_dir=CORPUS_DIR, limit=None, seed=0):
+    """
+    Load annotated resumes from the data/json corpus.
+
+    Args:
+        corpus_dir: Directory containing the *_annotated.json files
+        limit: Optional number of files to sample
+        seed: Seed for the sample so repeated runs use the same files
+
+    Returns:
+        list: (file_path, data) tuples where data has "text" and "annotations"
+    """
+    json_files = sorted(glob.glob(os.path.join(corpus_dir, "*.json")))
+    if limit is not None and limit < len(json_files):
+        json_files = sorted(random.Random(seed).sample(json_files, limit))
+
+    corpus = []
+    for file_path in json_files:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading {file_path}: {e}")
+            continue
+        if data.get("text"):
+            corpus.append((file_path, data))
+    return corpus
+
+
+def load_corpus_texts(corpus_dir=CORPUS_DIR, limit=None, seed=0):
+    """Return only the resume texts of the sampled corpus files."""
+    return [data["text"] for _, data in load_corpus(corpus_dir, limit, seed)]
+
+
+def gold_skills(data):
+    """Lowercased skill strings annotated in one corpus file."""
+    text = data["text"]
+    return {text[start:end].strip().lower() for start, end, label in data["annotations"]
+            if label.startswith("SKILL") and text[start:end].strip()}
@@ -0,0 +1,83 @@
+"""
+Job matching on a synthetic catalog: linear scan vs. JobIndex.
+
+Run from the repository root:
+    python -m benchmarks.job_matching --jobs 100000 --resumes 200
+"""
+import argparse
+import random
+import statistics
+import time
+
+from job_index import JobIndex
+from skill_index import SKILLS_FILE_PATH, load_gazetteer
+
+
+def linear_match_jobs(skills, jobs):
+    """The previous match_jobs implementation, kept as the reference."""
+    normalized_skills = [skill.lower() for skill in skills]
+    matches = []
+
+    for job in jobs:
+        matched_skills = [skill for skill in job["skills"] if skill in normalized_skills]
+        match_score = len(matched_skills) / len(job["skills"]) if job["skills"] else 0
+
+        if match_score > 0:
+            matches.append({
+            "job_id": job["id"],
+            "job_title": job["title"],
+            "match_score": match_score,
+            "category": job["category"],
+            "matched_skills": matched_skills,
+            "total_skills": len(job["skills"])
+            })
+
+        matches.sort(key=lambda x: x["match_score"], reverse=True)
+        matches = matches[:10]
+    matches.sort(key=lambda x: x["match_score"], reverse=True)
+    return matches
+
+
+def synthetic_catalog(num_jobs, gazetteer, rng):
+    # A skewed skill distribution, like real postings where a few skills dominate
+    weights = [1 / (rank + 1) for rank in range(len(gazetteer))]
+    return [{
+        "id": job_id,
+        "category": f"Category {job_id % 25}",
+        "title": f"Job {job_id}",
+        "description": "",
+        "skills": rng.choices(gazetteer, weights=weights, k=rng.randint(3, 15)),
+    } for job_id in range(1, num_jobs + 1)]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--jobs", type=int, default=100000)
+    arg_parser.add_argument("--resumes", type=int, default=200)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    gazetteer = load_gazetteer(SKILLS_FILE_PATH)
+    jobs = synthetic_catalog(args.jobs, gazetteer, rng)
+    resumes = [rng.sample(gazetteer[:300], rng.randint(5, 30)) for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    index = JobIndex(jobs)
+    print(f"Built JobIndex over {len(jobs)} jobs in {time.perf_counter() - start:.2f}s")
+
+    for label, func in (("linear scan", lambda skills: linear_match_jobs(skills, jobs)),
+                        ("JobIndex", lambda skills: index.match(skills))):
+        timings = []
+        for skills in resumes:
+            start = time.perf_counter()
+            func(skills)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{label:<12} mean {statistics.mean(timings):9.2f} ms  p50 {statistics.median(timings):9.2f} ms")
+
+    identical = all(linear_match_jobs(skills, jobs) == index.match(skills) for skills in resumes[:20])
+    print(f"Results identical to linear scan: {identical}")
+
+
+if __name__ == "__main__":
+    main()
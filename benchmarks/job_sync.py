@@ -0,0 +1,99 @@
+"""
+Reverse matching after a catalog edit: full rescoring vs. incremental sync_job_matches.
+
+A synthetic catalog is synced once against synthetic resumes (every job is new),
+then --changed jobs get new skill lists, a few jobs are added and removed, and the
+catalog is synced again; only the affected jobs are rescored. A third sync of the
+unchanged catalog shows the cost of the version check alone. Each job keeps its
+best --top-k resumes; the stored scores are checked against JobIndex.match for a
+sample of resumes.
+
+Run from the repository root:
+    python -m benchmarks.job_sync --resumes 20000 --jobs 5000 --changed 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.job_matching import synthetic_catalog
+from benchmarks.synthetic_db import create_benchmark_db
+from db import connect, load_resume
+from job_index import JobIndex
+from job_sync import DEFAULT_TOP_K, sync_job_matches
+from skill_index import SKILLS_FILE_PATH, load_gazetteer
+
+
+def edit_catalog(jobs, num_changed, gazetteer, rng):
+    """Change the skills of `num_changed` jobs, drop a few and append a few new ones."""
+    jobs = [dict(job) for job in jobs]
+    for job in rng.sample(jobs, num_changed):
+        job["skills"] = rng.sample(gazetteer, len(job["skills"]))
+    removed = {job["id"] for job in rng.sample(jobs, max(1, num_changed // 10))}
+    jobs = [job for job in jobs if job["id"] not in removed]
+    added = synthetic_catalog(max(1, num_changed // 10), gazetteer, rng)
+    next_id = max(job["id"] for job in jobs) + 1
+    for offset, job in enumerate(added):
+        job["id"] = next_id + offset
+        job["title"] = f"Job {job['id']}"
+    return jobs + added
+
+
+def check_scores(conn, jobs, sample, rng):
+    """Check the stored scores of `sample` random resumes against JobIndex.match."""
+    index = JobIndex(jobs)
+    resume_ids = [row[0] for row in conn.execute('SELECT id FROM resumes')]
+    for resume_id in rng.sample(resume_ids, min(sample, len(resume_ids))):
+        expected = {match["job_id"]: match["match_score"]
+                    for match in index.match(load_resume(conn, resume_id)["skills"], top_k=len(jobs))}
+        stored = dict(conn.execute('SELECT job_id, match_score FROM job_matches WHERE resume_id = ?', (resume_id,)))
+        # Per-job top-k cuts keep a subset of a resume's matches, with the same scores
+        if any(expected.get(job_id) != score for job_id, score in stored.items()):
+            raise ValueError(f"Stored matches of resume {resume_id} differ from JobIndex.match")
+
+
+def report(label, stats):
+    print(f"{label:<13} {stats['seconds']:8.2f}s  {stats['changed']:6d} rescored {stats['removed']:4d} removed "
+          f"{stats['unchanged']:6d} unchanged  {stats['matches']:9d} matches written")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--resumes", type=int, default=20000)
+    arg_parser.add_argument("--jobs", type=int, default=5000)
+    arg_parser.add_argument("--changed", type=int, default=50, help="Jobs whose skills change between syncs")
+    arg_parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K,
+                            help="Resumes kept per job (0 keeps every resume with a shared skill)")
+    arg_parser.add_argument("--check", type=int, default=50, help="Resumes whose scores are verified")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    gazetteer = sorted(load_gazetteer(SKILLS_FILE_PATH))
+    jobs = synthetic_catalog(args.jobs, gazetteer, rng)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench_resumes.db")
+        create_benchmark_db(db_path, args.resumes).close()
+        # Reopen with the row factory load_resume expects
+        conn = connect(db_path)
+
+        top_k = args.top_k or None
+        report("full sync", sync_job_matches(conn, jobs, top_k=top_k))
+        jobs = edit_catalog(jobs, args.changed, gazetteer, rng)
+        report("incremental", sync_job_matches(conn, jobs, top_k=top_k))
+        start = time.perf_counter()
+        stats = sync_job_matches(conn, jobs, top_k=top_k)
+        stats["seconds"] = time.perf_counter() - start
+        report("unchanged", stats)
+
+        check_scores(conn, jobs, args.check, rng)
+        matches_per_resume = conn.execute('SELECT COUNT(*) FROM job_matches').fetchone()[0] / args.resumes
+        print(f"Stored scores match JobIndex.match for {args.check} sampled resumes "
+              f"({matches_per_resume:.1f} matches per resume)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Accuracy and latency of the parser's NER routing modes on held-out resumes.
+
+models/resume_ner_model was not trained on data/json, so every corpus file is
+held out. Extracted skills are scored against the SKILL annotations of each file
+(lowercased, micro-averaged); the corpus has no name annotations, so for names
+only the share of resumes with one is reported.
+
+Run from the repository root:
+    python -m benchmarks.ner_routing --limit 300
+"""
+import argparse
+import time
+
+from benchmarks.corpus import gold_skills, load_corpus
+from custom_resume_parser import ROUTING_MODES, ResumeParser
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def evaluate(parser, corpus):
+    true_positives = predicted = expected = named = 0
+    timings = []
+    for _, data in corpus:
+        start = time.perf_counter()
+        result = parser.parse(data["text"])
+        timings.append(time.perf_counter() - start)
+
+        found = {skill.strip().lower() for skill in result["skills"]}
+        gold = gold_skills(data)
+        true_positives += len(found & gold)
+        predicted += len(found)
+        expected += len(gold)
+        named += bool(result["name"])
+
+    precision = true_positives / predicted if predicted else 0.0
+    recall = true_positives / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "named": named / len(corpus),
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--limit", type=int, default=300, help="Number of corpus files to evaluate on")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--modes", nargs="+", choices=ROUTING_MODES, default=list(ROUTING_MODES))
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus(limit=args.limit, seed=args.seed)
+    print(f"Evaluating on {len(corpus)} held-out resumes")
+
+    print(f"{'routing':<12} {'skill P':>8} {'skill R':>8} {'skill F1':>8} {'named':>7} {'mean ms':>8} {'p95 ms':>8}")
+    for routing in args.modes:
+        parser = ResumeParser(routing=routing)
+        # Warm up the models so loading time is not counted
+        parser.parse(corpus[0][1]["text"])
+        scores = evaluate(parser, corpus)
+        print(f"{routing:<12} {scores['precision']:8.3f} {scores['recall']:8.3f} {scores['f1']:8.3f} "
+              f"{scores['named']:7.1%} {scores['mean_ms']:8.1f} {scores['p95_ms']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Query + render time of /resumes, /jobs and /job/<id> as the data grows.
+
+For each size, a scratch database gets that many resumes and that many matches for
+one job, and a synthetic catalog gets that many jobs. Each page is timed:
+    full       every row through the template, as before pagination
+               (skipped above --full-max rows)
+    first      the first keyset page
+    deep       a keyset page from the middle of the list
+    offset     the same middle page fetched with LIMIT/OFFSET, for comparison
+Templates are rendered in a bare Flask app, so the real app (and resumes.db) is
+never touched.
+
+Run from the repository root:
+    python -m benchmarks.page_render --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask, render_template
+
+from benchmarks.job_matching import synthetic_catalog
+from db import connect, init_db
+from pagination import DEFAULT_PER_PAGE, encode_cursor, job_matches_page, list_jobs_page, list_resumes_page
+from skill_index import SKILLS_FILE_PATH, load_gazetteer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = {
+    'index': '/', 'list_resumes': '/resumes', 'list_jobs': '/jobs', 'view_job': '/job/<int:job_id>',
+    'view_resume': '/view/<int:resume_id>', 'search_resumes': '/search',
+}
+
+
+class StaticCatalog:
+    """The JobCatalog interface used by list_jobs_page, over an in-memory job list."""
+
+    def __init__(self, jobs):
+        self._jobs = jobs
+        self._positions = {job["id"]: position for position, job in enumerate(jobs)}
+
+    def page(self, after_id=None, limit=20):
+        start = self._positions[after_id] + 1 if after_id is not None else 0
+        return [{field: job[field] for field in ("id", "category", "title", "skills")}
+                for job in self._jobs[start:start + limit]]
+
+
+def render_app():
+    app = Flask('page_render', template_folder=os.path.join(ROOT, 'templates'),
+                static_folder=os.path.join(ROOT, 'static'))
+    for endpoint, rule in ENDPOINTS.items():
+        app.add_url_rule(rule, endpoint, lambda **kwargs: '')
+    return app
+
+
+def fill_database(path, size, rng):
+    """Insert `size` resumes and `size` matches for job 1."""
+    init_db(path)
+    conn = connect(path)
+    start_time = datetime(2024, 1, 1)
+    with conn:
+        conn.executemany('INSERT INTO resumes (name, email, uploaded_at, filename) VALUES (?, ?, ?, ?)', (
+            (f"Candidate {i}", f"candidate{i}@example.com", start_time + timedelta(seconds=i * 37), f"cv_{i}.pdf")
+            for i in range(size)))
+        conn.executemany('INSERT INTO job_matches (resume_id, job_id, job_title, match_score) VALUES (?, 1, ?, ?)',
+                         ((resume_id, "Job 1", round(rng.random(), 3)) for resume_id in range(1, size + 1)))
+    return conn
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(html)
+
+
+def middle_keys(conn, jobs, size):
+    """Cursors pointing at the middle of each list."""
+    middle = size // 2
+    resume = conn.execute('SELECT uploaded_at, id FROM resumes ORDER BY uploaded_at DESC, id DESC LIMIT 1 OFFSET ?',
+                          (middle,)).fetchone()
+    match = conn.execute('SELECT match_score, id FROM job_matches WHERE job_id = 1 '
+                         'ORDER BY match_score DESC, id LIMIT 1 OFFSET ?', (middle,)).fetchone()
+    return {
+        "resumes": encode_cursor(list(resume)),
+        "job": encode_cursor(list(match)),
+        "jobs": encode_cursor([jobs[middle]["id"]]),
+    }
+
+
+def bench_size(app, size, full_max, repeat, rng, gazetteer):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = fill_database(os.path.join(tmp_dir, "bench_resumes.db"), size, rng)
+        jobs = synthetic_catalog(size, gazetteer, rng)
+        catalog = StaticCatalog(jobs)
+        job = dict(jobs[0], description="Synthetic job")
+        cursors = middle_keys(conn, jobs, size)
+        per_page = DEFAULT_PER_PAGE
+
+        def resumes_page(cursor=''):
+            resumes, next_cursor = list_resumes_page(conn, cursor, per_page)
+            return render_template('resumes.html', resumes=resumes, cursor=cursor, next_cursor=next_cursor,
+                                   per_page=per_page)
+
+        def resumes_full():
+            resumes = conn.execute('SELECT id, name, email, uploaded_at FROM resumes '
+                                   'ORDER BY uploaded_at DESC').fetchall()
+            return render_template('resumes.html', resumes=resumes)
+
+        def resumes_offset():
+            resumes = conn.execute('SELECT id, name, email, uploaded_at FROM resumes '
+                                   'ORDER BY uploaded_at DESC, id DESC LIMIT ? OFFSET ?',
+                                   (per_page, size // 2)).fetchall()
+            return render_template('resumes.html', resumes=resumes)
+
+        def jobs_page(cursor=''):
+            page, next_cursor = list_jobs_page(catalog, cursor, per_page)
+            return render_template('jobs.html', jobs=page, cursor=cursor, next_cursor=next_cursor,
+                                   per_page=per_page)
+
+        def jobs_full():
+            return render_template('jobs.html', jobs=jobs)
+
+        def job_page(cursor=''):
+            matches, next_cursor = job_matches_page(conn, 1, cursor, per_page)
+            return render_template('view_job.html', job=job, matching_resumes=matches, cursor=cursor,
+                                   next_cursor=next_cursor, per_page=per_page)
+
+        def job_full():
+            matches = conn.execute('''
+            SELECT r.id, r.name, r.email, jm.match_score
+            FROM resumes r
+            JOIN job_matches jm ON r.id = jm.resume_id
+            WHERE jm.job_id = ?
+            ORDER BY jm.match_score DESC
+            ''', (1,)).fetchall()
+            return render_template('view_job.html', job=job, matching_resumes=matches)
+
+        def job_offset():
+            matches = conn.execute('''
+            SELECT r.id, r.name, r.email, jm.match_score
+            FROM job_matches jm
+            JOIN resumes r ON r.id = jm.resume_id
+            WHERE jm.job_id = ?
+            ORDER BY jm.match_score DESC, jm.id
+            LIMIT ? OFFSET ?
+            ''', (1, per_page, size // 2)).fetchall()
+            return render_template('view_job.html', job=job, matching_resumes=matches)
+
+        pages = {
+            "/resumes": (resumes_full, resumes_page, cursors["resumes"], resumes_offset),
+            "/jobs": (jobs_full, jobs_page, cursors["jobs"], None),
+            "/job/<id>": (job_full, job_page, cursors["job"], job_offset),
+        }
+        with app.test_request_context():
+            for route, (full, page, deep_cursor, offset) in pages.items():
+                cells = []
+                if size <= full_max:
+                    ms, length = timed(full, 1)
+                    cells.append(f"{ms:9.1f} ms {length / 1024:7.0f} KB")
+                else:
+                    cells.append(f"{'skipped':>20}")
+                for func in (page, lambda: page(deep_cursor)) + ((offset,) if offset else ()):
+                    ms, length = timed(func, repeat)
+                    cells.append(f"{ms:9.2f} ms {length / 1024:6.0f} KB")
+                print(f"{size:>8} {route:<10} " + "  ".join(cells))
+        conn.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    arg_parser.add_argument("--full-max", type=int, default=100000,
+                            help="Largest size at which the unpaginated page is rendered")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    gazetteer = sorted(load_gazetteer(SKILLS_FILE_PATH))
+    app = render_app()
+    print(f"{'rows':>8} {'page':<10} {'full':>20}  {'first':>19}  {'deep':>19}  {'offset':>19}")
+    for size in args.sizes:
+        bench_size(app, size, args.full_max, args.repeat, rng, gazetteer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-resume latency of ResumeParser.parse against the previous two-pass parse.
+
+The previous parse ran the full en_core_web_sm pipeline over the resume and, when
+NER found no skills, ran it again over the skills section (or the whole text) for
+noun chunks. parse() now runs only NER up front and adds tags and the dependency
+parse to the same Doc when the skills fallback needs them. Both are measured on
+en_core_web_sm ('statistical' routing), the only pipeline the previous parse had.
+
+Run from the repository root:
+    python -m benchmarks.parse_latency --limit 300
+"""
+import argparse
+import time
+
+from benchmarks.corpus import load_corpus_texts
+from custom_resume_parser import ResumeParser
+from skill_index import SKILLS_FILE_PATH, get_skill_index
+
+
+def legacy_parse(parser, text):
+    """The spaCy work and skill lookup of the previous parse() on a resume without NER skills."""
+    nlp = parser.nlp_statistical
+    nlp(text)
+    skills_text = parser._extract_sections(text).get("SKILLS", "").lower() or text.lower()
+    skill_index = get_skill_index(SKILLS_FILE_PATH)
+    found_skills = dict.fromkeys(skill_index.find_all(skills_text))
+    for chunk in nlp(skills_text).noun_chunks:
+        if chunk.text.lower() in skill_index:
+            found_skills[chunk.text.lower()] = None
+    return list(found_skills)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--limit", type=int, default=300, help="Number of corpus texts to parse")
+    args = arg_parser.parse_args()
+
+    texts = load_corpus_texts(limit=args.limit)
+    # legacy_parse only ever used en_core_web_sm, so compare against the same pipeline
+    parser = ResumeParser(routing='statistical')
+    print(f"Loaded {len(texts)} texts, pipeline: {parser.nlp_statistical.pipe_names}")
+    print(f"Skipped in the first pass: {parser._skipped_components(parser.nlp_statistical)}")
+
+    # Warm up the model so loading time is not counted
+    parser.parse(texts[0])
+
+    timings = {"two-pass (previous)": [], "single pass": []}
+    fallback = same_skills = 0
+    for text in texts:
+        start = time.perf_counter()
+        legacy_skills = legacy_parse(parser, text)
+        timings["two-pass (previous)"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = parser.parse(text)
+        timings["single pass"].append(time.perf_counter() - start)
+
+        if not any(ent.label_ == "SKILL" for ent in parser.nlp_statistical(text).ents):
+            fallback += 1
+            same_skills += set(result["skills"]) == set(legacy_skills)
+
+    for label, values in timings.items():
+        print(f"{label:<20} mean {sum(values) / len(values) * 1000:7.1f} ms  "
+              f"p50 {percentile(values, 50) * 1000:7.1f} ms  p95 {percentile(values, 95) * 1000:7.1f} ms")
+    print(f"{fallback} of {len(texts)} resumes used the skills fallback; "
+          f"{same_skills} of them got the same skills as the two-pass parse "
+          f"(noun chunks now come from the original-case text instead of a lowercased copy)")
+
+
+if __name__ == "__main__":
+    main()
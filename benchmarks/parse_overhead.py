@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of ResumeParser.parse overhead outside spaCy.
+
+Times the regex contact extraction and section splitting that run on every
+parse, comparing the previous per-call pattern strings and header regex with
+the patterns and header table compiled in the constructor.
+
+Run from the repository root:
+    python -m benchmarks.parse_overhead --limit 1000
+"""
+import argparse
+import re
+import time
+
+from benchmarks.corpus import load_corpus_texts
+from custom_resume_parser import DEFAULT_SECTION_HEADERS, ResumeParser
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+PHONE_PATTERN = r'(\+\d{1,3}[-.\s]?)?(\d{3}[-.\s]?\d{3}[-.\s]?\d{4}|$$\d{3}$$[-.\s]?\d{3}[-.\s]?\d{4})'
+URL_PATTERN = r'(https?:\/\/)?(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)'
+
+
+def legacy_sections(text, section_headers):
+    """The previous _extract_sections: header map and alternation regex rebuilt per call."""
+    sections = {}
+    current_section = None
+    header_to_canonical = {}
+    for canonical, aliases in section_headers.items():
+        for alias in aliases:
+            header_to_canonical[alias] = canonical
+    section_pattern = re.compile(
+        r'|'.join([rf'^\s*{re.escape(alias)}\s*[:\-]?\s*$' for alias in header_to_canonical.keys()]),
+        re.IGNORECASE
+    )
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        match = section_pattern.match(line)
+        if match:
+            matched_header = match.group(0).strip()
+            current_section = header_to_canonical.get(matched_header.upper(), matched_header)
+            sections.setdefault(current_section, [])
+        elif current_section:
+            sections[current_section].append(line)
+    return {header: ' '.join(content) for header, content in sections.items() if content}
+
+
+def legacy_overhead(text):
+    re.findall(EMAIL_PATTERN, text)
+    re.findall(PHONE_PATTERN, text)
+    re.findall(URL_PATTERN, text)
+    section_headers = {canonical: list(aliases) for canonical, aliases in DEFAULT_SECTION_HEADERS.items()}
+    return legacy_sections(text, section_headers)
+
+
+def compiled_overhead(parser, text):
+    parser.email_pattern.search(text)
+    parser.phone_pattern.search(text)
+    parser.url_pattern.findall(text)
+    return parser._extract_sections(text)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--limit", type=int, default=1000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    texts = load_corpus_texts(limit=args.limit)
+    parser = ResumeParser()
+
+    for label, func in (("per-call patterns", legacy_overhead),
+                        ("compiled patterns", lambda text: compiled_overhead(parser, text))):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for text in texts:
+                func(text)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<18} {best / len(texts) * 1e6:8.1f} us per resume")
+
+    differing = sum(1 for text in texts if legacy_overhead(text) != compiled_overhead(parser, text))
+    print(f"Resumes with different sections: {differing} "
+          f"(headers followed by ':' or '-' are now mapped to their canonical section)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Throughput of ResumeParser.parse_many with 1, 2 and 4 processes.
+
+Run from the repository root:
+    python -m benchmarks.parse_throughput --limit 500
+"""
+import argparse
+import time
+
+from benchmarks.corpus import load_corpus_texts
+from custom_resume_parser import ResumeParser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--limit", type=int, default=500, help="Number of corpus texts to parse")
+    arg_parser.add_argument("--batch-size", type=int, default=64)
+    arg_parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    arg_parser.add_argument("--check", type=int, default=20, help="Texts compared against parse() for equality")
+    args = arg_parser.parse_args()
+
+    texts = load_corpus_texts(limit=args.limit)
+    parser = ResumeParser()
+    print(f"Loaded {len(texts)} texts")
+
+    # Warm up the model so loading time is not counted
+    parser.parse(texts[0])
+
+    expected = [parser.parse(text) for text in texts[:args.check]]
+    start = time.perf_counter()
+    for text in texts:
+        parser.parse(text)
+    baseline = len(texts) / (time.perf_counter() - start)
+    print(f"parse() loop:        {baseline:8.1f} docs/sec")
+
+    for n_process in args.processes:
+        start = time.perf_counter()
+        results = list(parser.parse_many(texts, batch_size=args.batch_size, n_process=n_process))
+        elapsed = time.perf_counter() - start
+        identical = results[:args.check] == expected
+        print(f"parse_many n_process={n_process}: {len(texts) / elapsed:8.1f} docs/sec "
+              f"({len(texts) / elapsed / baseline:.2f}x, identical to parse(): {identical})")
+
+
+if __name__ == "__main__":
+    main()
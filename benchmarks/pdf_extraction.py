@@ -0,0 +1,78 @@
+"""
+PDF text extraction on synthetic multi-page documents.
+
+Compares the previous serial `text += page.get_text()` loop with the page-level
+engine in text_extraction, serially, across the process pool, and with a budget.
+
+Run from the repository root:
+    python -m benchmarks.pdf_extraction --pages 10 50 300
+"""
+import argparse
+import time
+
+import fitz
+
+from benchmarks.corpus import load_corpus_texts
+from text_extraction import extract_pdf, normalize_text
+
+
+def synthetic_pdf(num_pages, texts):
+    """Build an in-memory PDF whose pages are filled with corpus resume text."""
+    doc = fitz.open()
+    for number in range(num_pages):
+        page = doc.new_page()
+        text = texts[number % len(texts)][:3000]
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=7)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def legacy_extract(data):
+    """The previous extract_text_from_pdf loop."""
+    doc = fitz.open(stream=data, filetype='pdf')
+    text = ""
+    for page in doc:
+        text += page.get_text()
+    doc.close()
+    return normalize_text(text)
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 300])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--max-chars", type=int, default=200000)
+    args = arg_parser.parse_args()
+
+    texts = load_corpus_texts(limit=50)
+
+    # Start the worker pool outside the timings
+    warmup = synthetic_pdf(2, texts)
+    extract_pdf(data=warmup, max_pages=None, max_chars=None, parallel_threshold=1)
+
+    for num_pages in args.pages:
+        data = synthetic_pdf(num_pages, texts)
+        legacy_ms, legacy_text = timed(lambda: legacy_extract(data), args.repeat)
+        serial_ms, serial = timed(lambda: extract_pdf(data=data, max_pages=None, max_chars=None, parallel_threshold=None), args.repeat)
+        parallel_ms, parallel = timed(lambda: extract_pdf(data=data, max_pages=None, max_chars=None, parallel_threshold=1), args.repeat)
+        budget_ms, budget = timed(lambda: extract_pdf(data=data, max_chars=args.max_chars), args.repeat)
+
+        print(f"{num_pages:4d} pages  legacy {legacy_ms:8.1f} ms  serial {serial_ms:8.1f} ms  "
+              f"process pool {parallel_ms:8.1f} ms  budget {budget_ms:8.1f} ms "
+              f"({budget['pages_extracted']}/{budget['page_count']} pages, {len(budget['text'])} chars)")
+        print(f"            same text as legacy: serial {serial['text'] == legacy_text}, "
+              f"process pool {parallel['text'] == legacy_text}")
+
+
+if __name__ == "__main__":
+    main()
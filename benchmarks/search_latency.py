@@ -0,0 +1,64 @@
+"""
+/search latency: LIKE '%q%' scan vs. the FTS5 index, on synthetic resumes.
+
+Run from the repository root:
+    python -m benchmarks.search_latency --resumes 100000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic_db import create_benchmark_db
+from resume_search import search_fts
+
+QUERIES = ["python", "machine learning", "java", "Khan", "sql", "kubernetes", "data scien*", "react", "excel", "nlp"]
+
+
+def like_search(conn, query):
+    """The previous /search query (the text now comes from the resume_documents view)."""
+    cursor = conn.cursor()
+    cursor.execute('''
+    SELECT d.id, d.name, d.email, r.uploaded_at FROM resume_documents d
+    JOIN resumes r ON r.id = d.id
+    WHERE d.name LIKE ? OR d.email LIKE ? OR d.skills LIKE ? OR d.raw_text LIKE ?
+    ORDER BY r.uploaded_at DESC
+    ''', (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
+    return cursor.fetchall()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(label, func, queries, repeat):
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            func(query)
+            timings.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<14} p50 {statistics.median(timings):9.2f} ms  p99 {percentile(timings, 0.99):9.2f} ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--resumes", type=int, default=100000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench_resumes.db")
+        start = time.perf_counter()
+        conn = create_benchmark_db(db_path, args.resumes)
+        print(f"Created {args.resumes} synthetic resumes in {time.perf_counter() - start:.1f}s")
+
+        measure("LIKE scan", lambda query: like_search(conn, query), QUERIES, args.repeat)
+        measure("FTS5 (bm25)", lambda query: search_fts(conn, query), QUERIES, args.repeat)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Per-resume skill-extraction latency: per-skill regex scans vs. the compiled skill index.
+
+Only the gazetteer lookup is timed (the spaCy noun-chunk pass is the same on both sides).
+
+Run from the repository root:
+    python -m benchmarks.skill_extraction --limit 1000
+"""
+import argparse
+import re
+import statistics
+import time
+
+from benchmarks.corpus import load_corpus_texts
+from skill_index import SKILLS_FILE_PATH, SkillIndex, build_skill_index, load_gazetteer
+
+
+def regex_skill_scan(skills_text):
+    """The previous implementation: re-read the CSV and run one regex per skill."""
+    common_skills = load_gazetteer(SKILLS_FILE_PATH)
+    found_skills = set()
+    for skill in common_skills:
+        if re.search(r'\b' + re.escape(skill) + r'\b', skills_text):
+            found_skills.add(skill)
+    return found_skills
+
+
+def time_per_text(func, texts):
+    timings = []
+    results = []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(func(text))
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, results
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(timings):8.3f} ms  p50 {statistics.median(timings):8.3f} ms  p95 {p95:8.3f} ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--limit", type=int, default=1000, help="Number of corpus texts to use")
+    args = arg_parser.parse_args()
+
+    texts = [text.lower() for text in load_corpus_texts(limit=args.limit)]
+    print(f"Loaded {len(texts)} texts")
+
+    start = time.perf_counter()
+    index = SkillIndex(load_gazetteer(SKILLS_FILE_PATH))
+    print(f"Built skill index with {len(index)} skills in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    build_skill_index(SKILLS_FILE_PATH)  # make sure the on-disk copy exists
+    start = time.perf_counter()
+    index = build_skill_index(SKILLS_FILE_PATH)
+    print(f"Loaded persisted skill index in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    regex_timings, regex_results = time_per_text(regex_skill_scan, texts)
+    index_timings, index_results = time_per_text(lambda text: set(index.find_all(text)), texts)
+
+    report("per-skill regex", regex_timings)
+    report("skill index", index_timings)
+    print(f"Speedup: {statistics.mean(regex_timings) / statistics.mean(index_timings):.1f}x")
+
+    mismatches = sum(1 for a, b in zip(regex_results, index_results) if a != b)
+    print(f"Texts with different skill sets: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+"Resumes with skill X" latency: scanning and decoding the JSON skills column vs.
+the normalized resume_skills join, on synthetic resumes.
+
+The JSON scan is what the old schema allowed: a LIKE prefilter on resumes.skills
+followed by json.loads of every candidate to check exact membership.
+
+Run from the repository root:
+    python -m benchmarks.skill_filter --resumes 100000
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic_db import create_benchmark_db
+from db import find_resumes_with_skills
+
+QUERIES = [["python"], ["java"], ["sql"], ["machine learning"], ["excel"], ["python", "sql"],
+           ["java", "spring"], ["html", "css", "javascript"], ["tableau"], ["kubernetes"]]
+
+
+def json_scan(conn, skills):
+    """Filter on the JSON skills column the only way the old schema allowed."""
+    wanted = {skill.lower() for skill in skills}
+    clauses = ' AND '.join('skills LIKE ?' for _ in skills)
+    rows = conn.execute(f'SELECT id, skills FROM resumes WHERE {clauses} ORDER BY id DESC',
+                        [f'%"{skill}"%' for skill in skills])
+    return [resume_id for resume_id, value in rows
+            if wanted <= {skill.lower() for skill in json.loads(value)}]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(label, func, queries, repeat):
+    timings = []
+    for _ in range(repeat):
+        for skills in queries:
+            start = time.perf_counter()
+            func(skills)
+            timings.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<16} p50 {statistics.median(timings):9.2f} ms  p99 {percentile(timings, 0.99):9.2f} ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--resumes", type=int, default=100000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench_resumes.db")
+        start = time.perf_counter()
+        conn = create_benchmark_db(db_path, args.resumes)
+        print(f"Created {args.resumes} synthetic resumes in {time.perf_counter() - start:.1f}s")
+
+        for skills in QUERIES:
+            expected = json_scan(conn, skills)
+            found = find_resumes_with_skills(conn, skills, limit=-1)
+            if found != expected:
+                raise ValueError(f"Results differ for {skills}: {len(expected)} vs {len(found)} resumes")
+            print(f"  {' + '.join(skills):<28} {len(found):7d} resumes")
+
+        measure("JSON scan", lambda skills: json_scan(conn, skills), QUERIES, args.repeat)
+        measure("resume_skills", lambda skills: find_resumes_with_skills(conn, skills, limit=-1), QUERIES,
+                args.repeat)
+        measure("resume_skills@20", lambda skills: find_resumes_with_skills(conn, skills, limit=20), QUERIES,
+                args.repeat)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+End-to-end resume parsing benchmark with golden outputs from data/json.
+
+Each sampled corpus resume is rendered to a PDF and sent through the ingest
+pipeline stage by stage, recording the time spent in each stage:
+    extract  - text extraction from the PDF
+    spacy, entities, person, regex, sections, skills, score - ResumeParser.parse stages
+    match    - job matching against the catalog
+    store    - writing the resume and its matches to a scratch database
+Parsing runs on the annotated text, so the extracted skills can be scored against
+the corpus SKILL annotations (the golden outputs).
+
+Results (p50/p95/p99 per stage, docs/sec, peak RSS, skill P/R/F1 and a digest
+of every parse result) are written to --output. With --baseline, the run is
+diffed against an earlier results file and exits with status 1 when latency,
+throughput or memory get worse by more than --threshold (latency also by more
+than --min-ms), F1 drops by more than --f1-threshold, or parse results change.
+
+Run from the repository root:
+    python -m benchmarks.suite --limit 200 --output bench_results.json
+    python -m benchmarks.suite --limit 200 --baseline bench_results.json --output bench_new.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import fitz
+import spacy
+
+from benchmarks.corpus import gold_skills, load_corpus
+from benchmarks.job_matching import synthetic_catalog
+from custom_resume_parser import DEFAULT_ROUTING, ROUTING_MODES, ResumeParser
+from db import connect, init_db, insert_job_matches, insert_resume
+from ingest_queue import StageTimer
+from job_catalog import JobCatalog
+from job_index import JobIndex
+from skill_index import SKILLS_FILE_PATH, load_gazetteer
+from text_extraction import extract_pdf
+
+STAGES = ("extract", "spacy", "entities", "person", "regex", "sections", "skills", "score", "match", "store")
+
+
+def resume_pdf(text, chars_per_page=3000):
+    """Render a resume text to an in-memory PDF, spreading it over as many pages as needed."""
+    doc = fitz.open()
+    for start in range(0, max(len(text), 1), chars_per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text[start:start + chars_per_page], fontsize=7)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def load_job_index(num_jobs, seed):
+    """The real job catalog when its CSV exists, otherwise a synthetic one."""
+    try:
+        return JobCatalog().index(), "catalog"
+    except FileNotFoundError:
+        jobs = synthetic_catalog(num_jobs, sorted(load_gazetteer(SKILLS_FILE_PATH)), random.Random(seed))
+        return JobIndex(jobs), f"synthetic ({num_jobs} jobs)"
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def at(pct):
+        return round(values[min(len(values) - 1, int(len(values) * pct / 100))], 3)
+
+    return {"p50": at(50), "p95": at(95), "p99": at(99), "mean": round(sum(values) / len(values), 3)}
+
+
+def result_digest(result):
+    return hashlib.sha256(json.dumps(result, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def run(corpus, parser, job_index, db_path):
+    """Run every corpus resume through the pipeline and collect timings, scores and digests."""
+    init_db(db_path)
+    conn = connect(db_path)
+    stage_ms = {stage: [] for stage in STAGES}
+    total_ms = []
+    outputs = {}
+    true_positives = predicted = expected = 0
+
+    # Render outside the timed loop; only extraction of the bytes is measured
+    pdfs = [resume_pdf(data["text"]) for _, data in corpus]
+
+    start = time.perf_counter()
+    for (file_path, data), pdf in zip(corpus, pdfs):
+        timer = StageTimer()
+        with timer.stage('extract'):
+            extract_pdf(data=pdf)
+        result = parser.parse(data["text"], timer)
+        with timer.stage('match'):
+            job_matches = job_index.match(result["skills"])
+        with timer.stage('store'), conn:
+            resume_id = insert_resume(conn.cursor(), result, os.path.basename(file_path), data["text"])
+            insert_job_matches(conn.cursor(), resume_id, job_matches)
+
+        for stage in STAGES:
+            stage_ms[stage].append(timer.stages.get(stage, 0.0))
+        total_ms.append(sum(timer.stages.get(stage, 0.0) for stage in STAGES))
+
+        found = {skill.strip().lower() for skill in result["skills"]}
+        gold = gold_skills(data)
+        true_positives += len(found & gold)
+        predicted += len(found)
+        expected += len(gold)
+        outputs[os.path.basename(file_path)] = result_digest(result)
+    elapsed = time.perf_counter() - start
+    conn.close()
+
+    precision = true_positives / predicted if predicted else 0.0
+    recall = true_positives / expected if expected else 0.0
+    return {
+        "stages": {stage: percentiles(values) for stage, values in stage_ms.items()},
+        "end_to_end_ms": percentiles(total_ms),
+        "docs_per_sec": round(len(corpus) / elapsed, 3),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "accuracy": {
+            "skills": {
+                "precision": round(precision, 4),
+                "recall": round(recall, 4),
+                "f1": round(2 * precision * recall / (precision + recall) if precision + recall else 0.0, 4),
+            },
+        },
+        "outputs": outputs,
+    }
+
+
+def compare(baseline, current, threshold, f1_threshold, min_ms=1.0):
+    """
+    Diff two results files.
+
+    Latency changes smaller than `min_ms` are ignored, so sub-millisecond stages
+    do not flag timer noise as regressions.
+
+    Returns:
+        list: Human readable regressions (empty if none)
+    """
+    regressions = []
+
+    def slower(label, old, new, floor=min_ms):
+        if old and new > old * (1 + threshold) and new - old > floor:
+            regressions.append(f"{label}: {old} -> {new} (+{(new / old - 1):.1%})")
+
+    for stage, stats in current["stages"].items():
+        for key in ("p50", "p95", "p99"):
+            slower(f"{stage} {key} ms", baseline["stages"].get(stage, {}).get(key), stats.get(key))
+    for key in ("p50", "p95", "p99"):
+        slower(f"end-to-end {key} ms", baseline["end_to_end_ms"].get(key), current["end_to_end_ms"].get(key))
+    slower("peak RSS MB", baseline["peak_rss_mb"], current["peak_rss_mb"], floor=0)
+
+    old_rate, new_rate = baseline["docs_per_sec"], current["docs_per_sec"]
+    if old_rate and new_rate < old_rate * (1 - threshold):
+        regressions.append(f"docs/sec: {old_rate} -> {new_rate} ({(new_rate / old_rate - 1):.1%})")
+
+    old_f1 = baseline["accuracy"]["skills"]["f1"]
+    new_f1 = current["accuracy"]["skills"]["f1"]
+    if new_f1 < old_f1 - f1_threshold:
+        regressions.append(f"skill F1: {old_f1} -> {new_f1}")
+
+    shared = set(baseline["outputs"]) & set(current["outputs"])
+    changed = sorted(name for name in shared if baseline["outputs"][name] != current["outputs"][name])
+    if changed:
+        regressions.append(f"parse results changed for {len(changed)} of {len(shared)} resumes, "
+                           f"e.g. {', '.join(changed[:5])}")
+    return regressions
+
+
+def print_report(results):
+    meta = results["meta"]
+    print(f"\n{meta['docs']} resumes, routing '{meta['routing']}', job index: {meta['job_index']}")
+    print(f"{'stage':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for stage, stats in list(results["stages"].items()) + [("total", results["end_to_end_ms"])]:
+        print(f"{stage:<10} {stats['p50']:9.2f} {stats['p95']:9.2f} {stats['p99']:9.2f} {stats['mean']:9.2f}")
+    skills = results["accuracy"]["skills"]
+    print(f"{results['docs_per_sec']:.1f} docs/sec, peak RSS {results['peak_rss_mb']:.0f} MB, "
+          f"skill P {skills['precision']:.3f} R {skills['recall']:.3f} F1 {skills['f1']:.3f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--limit", type=int, default=200, help="Number of corpus resumes to sample")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--routing", choices=ROUTING_MODES, default=DEFAULT_ROUTING)
+    arg_parser.add_argument("--jobs", type=int, default=10000, help="Synthetic catalog size when no job CSV exists")
+    arg_parser.add_argument("--output", default="bench_results.json", help="Where to write the results")
+    arg_parser.add_argument("--baseline", help="Earlier results file to diff against")
+    arg_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="Allowed relative slowdown / memory growth before it counts as a regression")
+    arg_parser.add_argument("--min-ms", type=float, default=1.0,
+                            help="Latency changes smaller than this many ms are never regressions")
+    arg_parser.add_argument("--f1-threshold", type=float, default=0.005, help="Allowed absolute drop in skill F1")
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus(limit=args.limit, seed=args.seed)
+    parser = ResumeParser(routing=args.routing)
+    job_index, job_index_source = load_job_index(args.jobs, args.seed)
+
+    # Warm up the models so loading time is not counted
+    parser.parse(corpus[0][1]["text"])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = run(corpus, parser, job_index, os.path.join(tmp_dir, "bench_resumes.db"))
+    results["meta"] = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "docs": len(corpus),
+        "seed": args.seed,
+        "routing": args.routing,
+        "job_index": job_index_source,
+        "python": platform.python_version(),
+        "spacy": spacy.__version__,
+        "cpus": os.cpu_count(),
+    }
+
+    print_report(results)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if (baseline["meta"]["docs"], baseline["meta"]["seed"]) != (len(corpus), args.seed):
+            print("Warning: the baseline was run on a different sample (--limit/--seed)")
+        regressions = compare(baseline, results, args.threshold, args.f1_threshold, args.min_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.corpus import load_corpus
+from db import connect, init_db, insert_resume
+
+FIRST_NAMES = ["Ali", "Sara", "John", "Maria", "Wei", "Fatima", "Carlos", "Aisha", "David", "Priya"]
+LAST_NAMES = ["Khan", "Smith", "Garcia", "Chen", "Ahmed", "Patel", "Brown", "Kim", "Lopez", "Singh"]
+
+
+def synthetic_resume_rows(num_resumes, seed=0, corpus_limit=2000):
+    """
+    Yield resume rows shaped like the resumes table, built from the data/json corpus.
+
+    Texts are reused round-robin; names, emails and upload times are randomized.
+    """
+    rng = random.Random(seed)
+    corpus = load_corpus(limit=corpus_limit, seed=seed)
+    start_time = datetime(2024, 1, 1)
+
+    for i in range(num_resumes):
+        data = corpus[i % len(corpus)][1]
+        skills = sorted({annotation[2].split(":", 1)[-1].strip().lower() for annotation in data["annotations"]})[:30]
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "phone": "",
+            "skills": skills,
+            "uploaded_at": start_time + timedelta(seconds=i * 37 + rng.randint(0, 30)),
+            "filename": f"cv_{i}.pdf",
+            "raw_text": data["text"],
+        }
+
+
+def create_benchmark_db(path, num_resumes, seed=0):
+    """Create a resumes.db-compatible database filled with synthetic resumes."""
+    init_db(path)
+    conn = connect(path)
+    cursor = conn.cursor()
+    for row in synthetic_resume_rows(num_resumes, seed):
+        insert_resume(cursor, row, row["filename"], row["raw_text"], row["uploaded_at"])
+    conn.commit()
+    return conn
@@ -0,0 +1,121 @@
+"""
+Database size and page reads with raw_text inline in resumes vs. compressed in resume_texts.
+
+A synthetic database is built with the current schema, then copied and converted
+back to the old layout (raw_text in resumes, the FTS index over resumes). Both
+copies are vacuumed, then compared on:
+    size        file size and pages per table (from dbstat)
+    view        --lookups random resume loads (load_resume, plus the old
+                SELECT * of the whole row on the inline layout)
+    scan        a full scan of resumes (id, skills), like the old JSON skill filter
+    search      --searches full-text searches with snippets
+Bytes read are counted from /proc/self/io with memory mapping off and a tiny page
+cache, so they approximate pages read from the file.
+
+Run from the repository root:
+    python -m benchmarks.text_storage --resumes 20000
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.search_latency import QUERIES
+from benchmarks.synthetic_db import create_benchmark_db
+from db import connect, load_resume
+from resume_search import create_fts_index, drop_fts_index, search_fts
+from text_store import DEFAULT_CODEC
+
+
+def to_inline_layout(path):
+    """Convert a database copy back to raw_text stored in resumes."""
+    conn = connect(path)
+    with conn:
+        cursor = conn.cursor()
+        drop_fts_index(cursor)
+        cursor.execute('UPDATE resumes SET raw_text = (SELECT raw_text FROM resume_documents d WHERE d.id = resumes.id)')
+        cursor.execute('DROP VIEW resume_documents')
+        cursor.execute('DROP TABLE resume_texts')
+        create_fts_index(cursor)
+    conn.execute('VACUUM')
+    conn.close()
+
+
+def table_pages(conn):
+    return dict(conn.execute('SELECT name, COUNT(*) FROM dbstat GROUP BY name').fetchall())
+
+
+def bytes_read():
+    with open('/proc/self/io') as f:
+        return dict(line.split(': ') for line in f.read().splitlines())['rchar']
+
+
+def measure(path, func):
+    """Run func(conn) on a cold connection; return (ms, bytes read)."""
+    conn = connect(path)
+    conn.execute('PRAGMA mmap_size = 0')
+    conn.execute('PRAGMA cache_size = -64')
+    before = int(bytes_read())
+    start = time.perf_counter()
+    func(conn)
+    elapsed = (time.perf_counter() - start) * 1000
+    read = int(bytes_read()) - before
+    conn.close()
+    return elapsed, read
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--resumes", type=int, default=20000)
+    arg_parser.add_argument("--lookups", type=int, default=1000)
+    arg_parser.add_argument("--searches", type=int, default=3, help="Rounds over the search queries")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ids = [rng.randint(1, args.resumes) for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compressed_path = os.path.join(tmp_dir, "compressed.db")
+        conn = create_benchmark_db(compressed_path, args.resumes)
+        conn.execute('VACUUM')
+        conn.close()
+        inline_path = os.path.join(tmp_dir, "inline.db")
+        shutil.copyfile(compressed_path, inline_path)
+        to_inline_layout(inline_path)
+
+        workloads = {
+            "inline": {
+                # The old SELECT * on top of the list fields load_resume reads
+                "view": lambda conn: [(dict(conn.execute('SELECT * FROM resumes WHERE id = ?', (i,)).fetchone()),
+                                       load_resume(conn, i)) for i in ids],
+            },
+            "compressed": {
+                "view": lambda conn: [load_resume(conn, i) for i in ids],
+            },
+        }
+        for layout in workloads.values():
+            layout["scan"] = lambda conn: conn.execute('SELECT id, skills FROM resumes').fetchall()
+            layout["search"] = lambda conn: [search_fts(conn, query) for _ in range(args.searches)
+                                             for query in QUERIES]
+
+        print(f"{args.resumes} synthetic resumes, text codec {DEFAULT_CODEC}")
+        print(f"{'layout':<11} {'file MB':>8} {'resumes pg':>11} {'texts pg':>9} {'fts pg':>8}  "
+              f"{'view ms':>8} {'view MB':>8}  {'scan ms':>8} {'scan MB':>8}  {'search ms':>8} {'search MB':>8}")
+        for name, path in (("inline", inline_path), ("compressed", compressed_path)):
+            conn = connect(path)
+            pages = table_pages(conn)
+            conn.close()
+            fts_pages = sum(count for table, count in pages.items() if table.startswith('resumes_fts'))
+            cells = []
+            for workload in ("view", "scan", "search"):
+                ms, read = measure(path, workloads[name][workload])
+                cells.append(f"{ms:8.1f} {read / 1e6:8.2f}")
+            print(f"{name:<11} {os.path.getsize(path) / 1e6:8.1f} {pages.get('resumes', 0):11d} "
+                  f"{pages.get('resume_texts', 0):9d} {fts_pages:8d}  " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
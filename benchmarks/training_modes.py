@@ -0,0 +1,106 @@
+"""
+Wall-clock comparison of the NER training modes on a sample of the compiled corpus.
+
+    per-example  the previous test_train_ner_model.py loop: nlp.update() on one example at a time
+    loop         train_ner_model(): compounding minibatches over Examples built once
+    spacy        `spacy train` with the sharded corpus reader and --workers loader threads
+    sweep        --variants dropout variants trained concurrently in --workers processes
+
+Every mode trains for --epochs epochs from a blank pipeline. For the sweep, the
+summed training time of the variants shows what training them one after another
+would have cost.
+
+Run from the repository root (after process_json_data.py):
+    python -m benchmarks.training_modes --limit 300 --epochs 3 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import spacy
+from spacy.tokens import DocBin
+
+from ner_corpus import compile_corpus, load_docs, load_examples
+from train_ner_model import create_pipeline, evaluate, sweep, train_ner_model, train_with_spacy
+
+
+def sample_corpus(corpus, limit, sample_dir, shard_size=50):
+    """Write the first `limit` train docs (and a proportional dev sample) as DocBin shards."""
+    nlp = spacy.blank("en")
+    sample = {"labels": corpus["labels"]}
+    for split, count in (("train", limit), ("dev", max(1, limit // 4))):
+        docs = load_docs(corpus[f"{split}_path"], nlp)[:count]
+        split_dir = os.path.join(sample_dir, split)
+        os.makedirs(split_dir)
+        for i in range(0, len(docs), shard_size):
+            DocBin(docs=docs[i:i + shard_size], store_user_data=False).to_disk(
+                os.path.join(split_dir, f"{split}-{i // shard_size:05d}.spacy"))
+        sample[f"{split}_path"] = split_dir
+        sample[split] = len(docs)
+    return sample
+
+
+def per_example_loop(corpus, epochs, dropout=0.2):
+    nlp = create_pipeline(corpus["labels"])
+    train_examples = load_examples(corpus["train_path"], nlp)
+    optimizer = nlp.initialize(lambda: train_examples)
+    for _ in range(epochs):
+        random.shuffle(train_examples)
+        losses = {}
+        for example in train_examples:
+            nlp.update([example], drop=dropout, sgd=optimizer, losses=losses)
+    return evaluate(nlp, load_examples(corpus["dev_path"], nlp))["ents_f"]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--source", default="data/processed")
+    arg_parser.add_argument("--limit", type=int, default=300, help="Training docs in the sample")
+    arg_parser.add_argument("--epochs", type=int, default=3)
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--variants", type=int, default=4, help="Number of dropout variants in the sweep")
+    arg_parser.add_argument("--modes", nargs="+", default=["per-example", "loop", "spacy", "sweep"])
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = sample_corpus(compile_corpus(args.source), args.limit, os.path.join(tmp, "corpus"))
+        print(f"Sample: {corpus['train']} train / {corpus['dev']} dev docs, {args.epochs} epochs, "
+              f"{os.cpu_count()} CPUs")
+
+        timings = {}
+        if "per-example" in args.modes:
+            start = time.perf_counter()
+            f_score = per_example_loop(corpus, args.epochs)
+            timings["per-example"] = (time.perf_counter() - start, f"dev F {f_score:.3f}")
+
+        if "loop" in args.modes:
+            nlp = create_pipeline(corpus["labels"])
+            start = time.perf_counter()
+            train_examples = load_examples(corpus["train_path"], nlp, workers=args.workers)
+            dev_examples = load_examples(corpus["dev_path"], nlp, workers=args.workers)
+            log = train_ner_model(nlp, train_examples, dev_examples, os.path.join(tmp, "loop"), n_iter=args.epochs)
+            timings["loop"] = (time.perf_counter() - start, f"dev F {max(entry['ents_f'] for entry in log):.3f}")
+
+        if "spacy" in args.modes:
+            start = time.perf_counter()
+            train_with_spacy(corpus, os.path.join(tmp, "spacy"), workers=args.workers, n_iter=args.epochs)
+            timings["spacy"] = (time.perf_counter() - start, "")
+
+        if "sweep" in args.modes:
+            variants = [{"dropout": round(0.1 + 0.1 * i, 2)} for i in range(args.variants)]
+            start = time.perf_counter()
+            results = sweep(corpus, variants, os.path.join(tmp, "sweep"), workers=args.workers, n_iter=args.epochs)
+            elapsed = time.perf_counter() - start
+            sequential = sum(result["seconds"] for result in results)
+            timings["sweep"] = (elapsed, f"{len(variants)} variants, {sequential:.1f}s summed training, "
+                                         f"best dev F {results[0]['best_f']:.3f}")
+
+    print(f"\n{'mode':<12} {'seconds':>9}")
+    for mode, (seconds, note) in timings.items():
+        print(f"{mode:<12} {seconds:9.1f}  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Bulk import a directory tree of PDF/DOCX resumes into resumes.db.
+
+Files are hashed first and those already in the parse cache are skipped; the
+rest are extracted and parsed in a process pool with the same code as /upload,
+and rows are written from the main process in batched transactions. Every committed
+file is appended to a checkpoint file, so an interrupted run picks up where it
+stopped when started again with the same checkpoint.
+
+Usage:
+    python bulk_import.py path/to/resumes --workers 8 --batch-size 200
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from custom_resume_parser import DEFAULT_ROUTING, ROUTING_MODES, ResumeParser
+from db import DB_PATH, connect, init_db, insert_job_matches, insert_resume
+from ingest_queue import StageTimer
+from job_catalog import JobCatalog
+from parse_cache import ParseCache
+from text_extraction import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, UploadedResume, file_extension, hash_file
+
+RESUME_EXTENSIONS = {'pdf', 'docx', 'doc'}
+MODEL_PATH = 'models/resume_ner_model'
+
+_worker_parser = None
+
+
+def find_resumes(root_dir):
+    """Yield resume file paths under root_dir in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if file_extension(filename) in RESUME_EXTENSIONS:
+                yield os.path.abspath(os.path.join(dirpath, filename))
+
+
+def load_checkpoint(checkpoint_path):
+    """Return the set of file paths committed by a previous run (failed files are retried)."""
+    done = set()
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a partially written last line from an interrupted run
+                if entry.get("status") == "failed":
+                    done.discard(entry["path"])
+                else:
+                    done.add(entry["path"])
+    return done
+
+
+def _init_worker(model_path, routing):
+    global _worker_parser
+    _worker_parser = ResumeParser(model_path, routing=routing)
+
+
+def _parse_file(path):
+    """
+    Extract and parse one file in a worker process.
+
+    Long PDFs are read serially here: the import already keeps every CPU busy with
+    one worker per core, and a page pool per worker would oversubscribe them.
+    """
+    timer = StageTimer()
+    try:
+        with timer.stage('read'):
+            upload = UploadedResume.from_path(path)
+        try:
+            with timer.stage('extract'):
+                text = upload.extract_text(max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                                           parallel_threshold=0)
+        finally:
+            upload.close()
+        if not text:
+            raise ValueError('Could not extract text from the file')
+
+        with timer.stage('parse'):
+            parsed_data = _worker_parser.parse(text, timer)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}", "stages": timer.stages}
+
+    return {
+        "path": path,
+        "content_hash": upload.content_hash,
+        "text": text,
+        "parsed": parsed_data,
+        "stages": timer.stages,
+    }
+
+
+class BulkImporter:
+    def __init__(self, db_path=DB_PATH, model_path=MODEL_PATH, checkpoint_path='bulk_import_checkpoint.jsonl',
+                 workers=None, batch_size=200, routing=DEFAULT_ROUTING):
+        self.db_path = db_path
+        self.model_path = model_path
+        self.routing = routing
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.parse_cache = ParseCache(model_path, routing=routing, max_pages=DEFAULT_MAX_PAGES,
+                                      max_chars=DEFAULT_MAX_CHARS)
+        self.stage_totals = {}
+        self.failures = []
+        self.counts = {"imported": 0, "cached": 0, "failed": 0, "skipped": 0}
+
+        try:
+            self.job_index = JobCatalog().index()
+        except FileNotFoundError as e:
+            print(f"Job catalog not available, importing without job matches: {e}")
+            self.job_index = None
+
+    def run(self, root_dir):
+        init_db(self.db_path)
+        done = load_checkpoint(self.checkpoint_path)
+        paths = [path for path in find_resumes(root_dir) if path not in done]
+        self.counts["skipped"] = len(done)
+        print(f"{len(paths)} files to import ({len(done)} already done according to {self.checkpoint_path})")
+
+        start = time.perf_counter()
+        conn = connect(self.db_path)
+        batch = []
+        try:
+            cached, paths = self._split_cached(conn, paths)
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.model_path, self.routing)) as pool, \
+                    open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+                if cached:
+                    self._write_batch(conn, cached, checkpoint)
+                for result in pool.map(_parse_file, paths, chunksize=4):
+                    batch.append(result)
+                    if len(batch) >= self.batch_size:
+                        self._write_batch(conn, batch, checkpoint)
+                        batch = []
+                        self._progress(start)
+                if batch:
+                    self._write_batch(conn, batch, checkpoint)
+        finally:
+            conn.close()
+
+        self._report(time.perf_counter() - start)
+
+    def _split_cached(self, conn, paths):
+        """
+        Hash every file and look it up in the parse cache before anything is sent to the pool.
+
+        Returns:
+            tuple: (results for the files already parsed, paths still to parse)
+        """
+        timer = StageTimer()
+        cached = []
+        to_parse = []
+        with timer.stage('cache_lookup'):
+            for path in paths:
+                try:
+                    content_hash = hash_file(path)
+                except OSError:
+                    to_parse.append(path)  # the worker reports the read error
+                    continue
+                if self.parse_cache.lookup(conn, content_hash) is not None:
+                    cached.append({"path": path, "content_hash": content_hash, "cached": True, "stages": {}})
+                else:
+                    to_parse.append(path)
+        self.stage_totals['cache_lookup'] = self.stage_totals.get('cache_lookup', 0) + timer.stages['cache_lookup']
+        print(f"{len(cached)} files already in the parse cache, {len(to_parse)} to parse")
+        return cached, to_parse
+
+    def _write_batch(self, conn, batch, checkpoint):
+        timer = StageTimer()
+        with timer.stage('match'):
+            for result in batch:
+                if "parsed" in result and self.job_index is not None:
+                    result["job_matches"] = self.job_index.match(result["parsed"]["skills"])
+
+        with timer.stage('store'), conn:
+            cursor = conn.cursor()
+            for result in batch:
+                if "error" in result or result.get("cached"):
+                    continue
+                # Duplicates within this run were parsed in parallel; keep the first one committed
+                if self.parse_cache.lookup(conn, result["content_hash"]) is not None:
+                    result["cached"] = True
+                    continue
+                filename = os.path.basename(result["path"])
+                resume_id = insert_resume(cursor, result["parsed"], filename, result["text"])
+                insert_job_matches(cursor, resume_id, result.get("job_matches", []))
+                parse_ms = result["stages"].get("extract", 0) + result["stages"].get("parse", 0)
+                self.parse_cache.store(conn, result["content_hash"], resume_id, parse_ms)
+
+        # Only checkpoint once the rows are committed
+        for result in batch:
+            status = "failed" if "error" in result else "cached" if result.get("cached") else "imported"
+            self.counts[status] += 1
+            if status == "failed":
+                self.failures.append((result["path"], result["error"]))
+            checkpoint.write(json.dumps({"path": result["path"], "status": status}) + '\n')
+            for stage, ms in result["stages"].items():
+                self.stage_totals[stage] = self.stage_totals.get(stage, 0) + ms
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+
+        for stage, ms in timer.stages.items():
+            self.stage_totals[stage] = self.stage_totals.get(stage, 0) + ms
+
+    def _progress(self, start):
+        processed = self.counts["imported"] + self.counts["cached"] + self.counts["failed"]
+        print(f"{processed} files processed ({processed / (time.perf_counter() - start):.1f} files/sec)")
+
+    def _report(self, elapsed):
+        processed = self.counts["imported"] + self.counts["cached"] + self.counts["failed"]
+        print(f"\nProcessed {processed} files in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f} files/sec)")
+        print(f"Imported {self.counts['imported']}, already parsed {self.counts['cached']}, "
+              f"failed {self.counts['failed']}, skipped from checkpoint {self.counts['skipped']}")
+        print("Time per stage (summed over workers for read/extract/parse):")
+        for stage, ms in sorted(self.stage_totals.items(), key=lambda item: -item[1]):
+            print(f"  {stage:<8} {ms / 1000:10.2f}s")
+        if self.failures:
+            print("Failures:")
+            for path, error in self.failures:
+                print(f"  {path}: {error}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("directory", help="Directory tree containing PDF/DOCX resumes")
+    arg_parser.add_argument("--db", default=DB_PATH, help="SQLite database to import into")
+    arg_parser.add_argument("--model", default=MODEL_PATH, help="Custom NER model directory")
+    arg_parser.add_argument("--routing", choices=ROUTING_MODES, default=DEFAULT_ROUTING,
+                            help="Which NER models entities are taken from")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("--batch-size", type=int, default=200, help="Files written per transaction")
+    arg_parser.add_argument("--checkpoint", default="bulk_import_checkpoint.jsonl",
+                            help="Checkpoint file used to resume an interrupted import")
+    args = arg_parser.parse_args()
+
+    importer = BulkImporter(db_path=args.db, model_path=args.model, checkpoint_path=args.checkpoint,
+                            workers=args.workers, batch_size=args.batch_size, routing=args.routing)
+    importer.run(args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,125 +1,263 @@
+from contextlib import nullcontext
 from datetime import datetime
 import os
-import spacy
 import re
 import json
 import csv
 import pandas as pd  # Add this import at the top of the file
+from model_registry import get_model
+from ner_routing import DEFAULT_ROUTING, ROUTING_MODES
+from skill_index import SKILLS_FILE_PATH, get_skill_index
+
+# Canonical section names and the header lines that introduce them
+DEFAULT_SECTION_HEADERS = {
+    "EXPERIENCE": ["EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT"],
+    "PROJECTS": ["PROJECTS", "KEY PROJECTS", "PROJECT EXPERIENCE"],
+    "EDUCATION": ["EDUCATION", "ACADEMIC BACKGROUND", "QUALIFICATIONS", "DEGREE"],
+    "CERTIFICATIONS": ["CERTIFICATIONS", "LICENSES", "CREDENTIALS", "ACHIEVEMENTS"],
+    "SKILLS": ["SKILLS", "TECHNICAL SKILLS", "PROFESSIONAL SKILLS"]
+}
+
+# Entity label -> result field(s) it fills. Covers the labels of the trained custom
+# model, en_core_web_sm, and the SKILL-style labels of the data/json annotations.
+DEFAULT_LABEL_MAP = {
+    "Name": "name",
+    "Skills": "skills",
+    "Companies worked at": "companies",
+    "Designation": ("job_titles", "designation"),
+    "College Name": ("education", "college_name"),
+    "College": "education",
+    "University": "education",
+    "Degree": ("education", "degree"),
+    "Certifications": "certifications",
+    "projects": "projects",
+    "PERSON": "name",
+    "SKILL": "skills",
+    "EDUCATION": "education",
+    "COMPANY": "companies",
+    "JOB_TITLE": "job_titles",
+    "PROJECT": "projects",
+    "CERTIFICATION": "certifications",
+}
+
+# Separates the individual skills inside a "Skills" entity
+SKILL_SEPARATOR_PATTERN = re.compile(r'[,;|\n\u2022]')
+
+# Components producing doc.ents, and the ones doc.noun_chunks depends on
+ENTITY_COMPONENTS = ("ner", "entity_ruler")
+NOUN_CHUNK_COMPONENTS = ("tok2vec", "tagger", "morphologizer", "attribute_ruler", "parser")
+
+# Matches date ranges like "Jan 2020 - Dec 2022"
+DATE_RANGE_PATTERN = re.compile(r'(\b\w{3,9}\s\d{4})\s*-\s*(\b\w{3,9}\s\d{4}|Present)')
+
+
+def normalize_header(line):
+    """Normalize a line for header lookup: trim, drop one trailing ':' or '-', uppercase."""
+    line = line.strip()
+    if line[-1:] in (':', '-'):
+        line = line[:-1].rstrip()
+    return line.upper()
+
+
+def _untimed(name):
+    """Stand-in for StageTimer.stage when a parse is not being timed."""
+    return nullcontext()
+
 
 class ResumeParser:
     """Custom resume parser using a trained NER model."""
     
-    def __init__(self, model_path="models/resume_ner_model"):
+    def __init__(self, model_path="models/resume_ner_model", section_headers=None, label_map=None,
+                 routing=DEFAULT_ROUTING):
         """
         Initialize the parser with a trained model and a statistical model for linguistic features.
+
+        Both pipelines come from the process-wide model registry and are only loaded
+        the first time they are used, so constructing a parser is cheap.
+
+        Args:
+            model_path: Directory of the custom NER model
+            section_headers: Optional dict of canonical section name -> header aliases,
+                             defaults to DEFAULT_SECTION_HEADERS
+            label_map: Optional dict of entity label -> result field (or tuple of fields),
+                       defaults to DEFAULT_LABEL_MAP
+            routing: One of ROUTING_MODES, which models entities are taken from
         """
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model not found at {model_path}. Please check the path.")
+        if routing not in ROUTING_MODES:
+            raise ValueError(f"Unknown routing mode '{routing}', expected one of {', '.join(ROUTING_MODES)}")
+        self.model_path = model_path
+        self.routing = routing
+
+        # Entity label -> tuple of result fields it fills
+        self.label_map = {}
+        for label, fields in (label_map or DEFAULT_LABEL_MAP).items():
+            self.label_map[label] = (fields,) if isinstance(fields, str) else tuple(fields)
         
+        # Additional regex patterns for information not covered by NER, compiled once
+        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        self.phone_pattern = re.compile(r'(\+\d{1,3}[-.\s]?)?(\d{3}[-.\s]?\d{3}[-.\s]?\d{4}|$$\d{3}$$[-.\s]?\d{3}[-.\s]?\d{4})')
+        self.url_pattern = re.compile(r'(https?:\/\/)?(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)')
+
+        # Header lookup table: normalized header line -> canonical section name
+        self.section_headers = section_headers or DEFAULT_SECTION_HEADERS
+        self.header_to_canonical = {}
+        for canonical, aliases in self.section_headers.items():
+            for alias in aliases:
+                self.header_to_canonical[normalize_header(alias)] = canonical
+
+    @property
+    def nlp_custom(self):
+        """The custom NER model, shared through the model registry."""
         try:
-            # Load the custom NER model
-            self.nlp_custom = spacy.load(model_path)
-            print(f"Loaded custom NER model from {model_path}")
+            return get_model(self.model_path)
         except OSError:
-            raise FileNotFoundError(f"Custom model not found at {model_path}. Please check the path.")
-        
-        # Load the statistical model for linguistic features
+            raise FileNotFoundError(f"Custom model not found at {self.model_path}. Please check the path.")
+
+    @property
+    def nlp_statistical(self):
+        """The statistical model for linguistic features, shared through the model registry."""
         try:
-            self.nlp_statistical = spacy.load("en_core_web_sm")
-            print("Loaded spaCy statistical model 'en_core_web_sm'")
+            return get_model("en_core_web_sm")
         except OSError:
             raise FileNotFoundError("Statistical model 'en_core_web_sm' not found. Install it using: python3 -m spacy download en_core_web_sm")
-        
-        # Additional regex patterns for information not covered by NER
-        self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        self.phone_pattern = r'(\+\d{1,3}[-.\s]?)?(\d{3}[-.\s]?\d{3}[-.\s]?\d{4}|$$\d{3}$$[-.\s]?\d{3}[-.\s]?\d{4})'
-        self.url_pattern = r'(https?:\/\/)?(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)' 
-    
-    
 
-    def _extract_skills(self, text, all_sections):
-        """Extract skills from the skills section if present, otherwise use the entire text."""
+    @property
+    def nlp_primary(self):
+        """The model whose entities fill the result: en_core_web_sm in 'statistical' routing, else the custom model."""
+        return self.nlp_statistical if self.routing == "statistical" else self.nlp_custom
+
+    def _extract_skills(self, doc, all_sections, section_blocks):
+        """
+        Extract skills from the skills section if present, otherwise use the entire text.
+
+        Noun chunks are read from the Doc parse() already produced: the skills section
+        is sliced out of it as spans instead of running it through spaCy again.
+        """
         # Check if a skills section is present in the extracted sections
         skills_text = all_sections.get("SKILLS", "").lower()
+        if skills_text:
+            blocks = section_blocks["SKILLS"]
+        else:
+            # If no skills section is found, fallback to using the entire text
+            skills_text = doc.text.lower()
+            blocks = [(0, len(doc.text))]
+        spans = self._noun_chunk_spans(doc, blocks)
 
-        # If no skills section is found, fallback to using the entire text
-        if not skills_text:
-            skills_text = text.lower()
+        # The gazetteer automaton is built once per process (and cached on disk)
+        skill_index = get_skill_index(SKILLS_FILE_PATH)
 
-        # Load predefined skills from the CSV file
-        skills_file_path = "data/skills/skills.csv"
-        if not os.path.exists(skills_file_path):
-            raise FileNotFoundError(f"Skills file not found at {skills_file_path}. Please check the path.")
-        
-        try:
-            with open(skills_file_path, 'r') as file:
-                skills_line = file.readline().strip()
-                common_skills = [skill.strip().lower() for skill in skills_line.split(',') if skill.strip()]
-        except Exception as e:
-            raise ValueError(f"Error reading skills file: {e}")
-        
-        # Use spaCy to extract noun chunks
-        doc = self.nlp_statistical(skills_text)
-        noun_chunks = [chunk.text.lower() for chunk in doc.noun_chunks]
-
-        # Find skills in the text
-        found_skills = set()
-        for skill in common_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', skills_text):
-                found_skills.add(skill)
+        noun_chunks = [chunk.text.lower() for span in spans if span is not None for chunk in span.noun_chunks]
+
+        # Find skills in the text in a single pass over it
+        found_skills = dict.fromkeys(skill_index.find_all(skills_text))
         for chunk in noun_chunks:
-            if chunk in common_skills:
-                found_skills.add(chunk)
+            if chunk in skill_index:
+                found_skills[chunk] = None
 
         return list(found_skills)
 
+    def _skipped_components(self, nlp):
+        """
+        Names of the pipeline components the first pass over a resume can skip.
+
+        Only doc.ents is needed up front, so everything but the entity recognizer (and a
+        shared tok2vec it listens to) is disabled; the lemmatizer is never needed.
+        """
+        needed = set(ENTITY_COMPONENTS)
+        for name, component in nlp.pipeline:
+            if needed.intersection(getattr(component, "listening_components", [])):
+                needed.add(name)
+        return [name for name in nlp.pipe_names if name not in needed]
+
+    def _noun_chunk_spans(self, doc, blocks):
+        """
+        Return spans covering the [start_char, end_char] `blocks` of `doc`, with noun chunks available.
+
+        A Doc from en_core_web_sm gets the missing syntax added in place and is sliced.
+        A Doc from the custom model shares no vocab with en_core_web_sm, so only the
+        text of the blocks is tokenized and parsed by it, not the whole resume.
+        """
+        nlp = self.nlp_statistical
+        if doc.vocab is nlp.vocab:
+            doc = self._add_noun_chunk_annotations(doc, self._skipped_components(nlp))
+            return [doc.char_span(start, end, alignment_mode="expand") for start, end in blocks]
+        return [self._add_noun_chunk_annotations(nlp.make_doc(doc.text[start:end]), nlp.pipe_names)[:]
+                for start, end in blocks]
+
+    def _add_noun_chunk_annotations(self, doc, skipped):
+        """Run the components noun chunks depend on that the first pass skipped."""
+        if doc.has_annotation("DEP"):
+            return doc
+        for name, component in self.nlp_statistical.pipeline:
+            if name in skipped and name in NOUN_CHUNK_COMPONENTS:
+                doc = component(doc)
+        return doc
 
-    def _extract_sections(self, text, section_headers):
+    def _extract_sections(self, text):
         """
         Extract all sections from the resume at once using aliasing for section headers.
 
         Args:
             text (str): The resume text.
-            section_headers (dict): A dictionary where keys are canonical section names
-                                    and values are lists of aliases for those sections.
 
         Returns:
             dict: A dictionary where keys are canonical section names and values are the extracted content.
         """
-        sections = {}
-        lines = text.split('\n')
-        current_section = None
+        sections, _ = self._split_sections(text)
+        return self._format_sections(sections)
 
-        # Flatten the section headers dictionary into a regex pattern
-        header_to_canonical = {}
-        for canonical, aliases in section_headers.items():
-            for alias in aliases:
-                header_to_canonical[alias] = canonical
+    def _split_sections(self, text):
+        """
+        Split the resume into sections and record where each one sits in the text.
+
+        A line is a header when, once normalized, it is one of the configured aliases.
+
+        Args:
+            text (str): The resume text.
 
-        section_pattern = re.compile(
-            r'|'.join([rf'^\s*{re.escape(alias)}\s*[:\-]?\s*$' for alias in header_to_canonical.keys()]),
-            re.IGNORECASE
-        )
+        Returns:
+            tuple: (dict of canonical section name -> content lines,
+                    dict of canonical section name -> list of [start_char, end_char]
+                    ranges, one per run of lines under a header)
+        """
+        sections = {}
+        blocks = {}
+        current_section = None
+        block = None
+        header_to_canonical = self.header_to_canonical
 
-        for line in lines:
-            line = line.strip()
+        position = 0
+        for raw_line in text.split('\n'):
+            line_start = position
+            position += len(raw_line) + 1
+            line = raw_line.strip()
             if not line:
                 continue  # Skip empty lines
 
-            # Check if the line matches a section header
-            match = section_pattern.match(line)
-            if match:
-                # Map the matched alias to its canonical name
-                matched_header = match.group(0).strip()
-                canonical_name = header_to_canonical.get(matched_header.upper(), matched_header)
+            # Check if the line is a section header
+            canonical_name = header_to_canonical.get(normalize_header(line))
+            if canonical_name:
                 current_section = canonical_name
+                block = None
                 if current_section not in sections:
                     sections[current_section] = []  # Initialize a new section
             elif current_section:
                 # Add content to the current section
                 sections[current_section].append(line)
+                start = line_start + len(raw_line) - len(raw_line.lstrip())
+                if block is None:
+                    block = [start, start + len(line)]
+                    blocks.setdefault(current_section, []).append(block)
+                else:
+                    block[1] = start + len(line)
+
+        return sections, blocks
 
-        # Format all sections into a single dictionary
+    @staticmethod
+    def _format_sections(sections):
+        """Join the content lines of each non-empty section into a single string."""
         formatted_sections = {}
         for header, content in sections.items():
             if content:
@@ -130,20 +268,65 @@ class ResumeParser:
 
         return formatted_sections
 
-    def parse(self, text):
+    def parse(self, text, timer=None):
         """
         Parse resume text and extract structured information.
         
         Args:
             text: The text content of the resume
+            timer: Optional StageTimer collecting the time spent in each parse stage
             
         Returns:
             dict: Structured information extracted from the resume
         """
-        # Use the custom NER model for entity extraction
-        doc = self.nlp_statistical(text)
-        
-      
+        # Only entity recognition runs here; the syntax needed for the skills
+        # fallback is added to the same Doc later, if it is needed at all
+        stage = timer.stage if timer is not None else _untimed
+        with stage('spacy'):
+            nlp = self.nlp_primary
+            doc = nlp(text, disable=self._skipped_components(nlp))
+        return self._build_result(text, doc, timer)
+
+    def parse_many(self, texts, batch_size=64, n_process=1):
+        """
+        Parse many resume texts, streaming them through nlp.pipe.
+
+        Results are yielded in input order and are identical to calling parse()
+        on each text; only the spaCy pass is batched (and optionally spread over
+        several processes), the regex, section and skill extraction still run per doc.
+
+        Args:
+            texts: An iterable of resume texts
+            batch_size: Number of texts spaCy processes per batch
+            n_process: Number of worker processes used by nlp.pipe
+
+        Yields:
+            dict: Structured information extracted from each resume
+        """
+        nlp = self.nlp_primary
+        docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=self._skipped_components(nlp))
+        for doc in docs:
+            # The tokenizer is non-destructive, so doc.text is the original input
+            yield self._build_result(doc.text, doc)
+
+    def _add_entity(self, result, ent):
+        """Add an entity to every result field its label is mapped to."""
+        for field in self.label_map.get(ent.label_, ()):
+            if field == "skills":
+                # The custom model tags whole skill lists; keep the individual skills
+                values = [value.strip() for value in SKILL_SEPARATOR_PATTERN.split(ent.text) if value.strip()]
+            else:
+                values = [ent.text]
+            for value in values:
+                if isinstance(result[field], list):
+                    if value not in result[field]:
+                        result[field].append(value)
+                elif not result[field]:
+                    result[field] = value
+
+    def _build_result(self, text, doc, timer=None):
+        """Build the structured result for one resume from its text and processed Doc."""
+        stage = timer.stage if timer is not None else _untimed
         # Initialize result dictionary
         result = {
             "name": "",
@@ -164,90 +347,85 @@ class ResumeParser:
             "score": 0
         }
             
-        # Extract entities from the custom NER model
-        for ent in doc.ents:
-            if ent.label_ == "PERSON" and not result["name"]:
-                result["name"] = ent.text
-            elif ent.label_ == "SKILL" and ent.text not in result["skills"]:
-                result["skills"].append(ent.text)
-            elif ent.label_ == "EDUCATION":
-                result["education"].append(ent.text)
-            elif ent.label_ == "COMPANY" and ent.text not in result["companies"]:
-                result["companies"].append(ent.text)
-            elif ent.label_ == "JOB_TITLE" and ent.text not in result["job_titles"]:
-                result["job_titles"].append(ent.text)
-            elif ent.label_ == "PROJECT" and ent.text not in result["projects"]:
-                result["projects"].append(ent.text)
-            elif ent.label_ == "CERTIFICATION" and ent.text not in result["certifications"]:
-                result["certifications"].append(ent.text)
-        
+        with stage('entities'):
+            # Map the entities of the primary model onto the result fields
+            for ent in doc.ents:
+                self._add_entity(result, ent)
 
-        # Extract email using regex
-        emails = re.findall(self.email_pattern, text)
-        if emails:
-            result["email"] = emails[0]
-        
-        # Extract phone using regex
-        phones = re.findall(self.phone_pattern, text)
-        if phones:
-            result["phone"] = phones[0][1] if isinstance(phones[0], tuple) else phones[0]
-        
-        # Extract URLs using regex
-        urls = re.findall(self.url_pattern, text)
-        if urls:
-            result["urls"] = [url[0] + url[1] + url[2] for url in urls if url[0] or url[1]]
-        
-        section_headers = {
-        "EXPERIENCE": ["EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT"],
-        "PROJECTS": ["PROJECTS", "KEY PROJECTS", "PROJECT EXPERIENCE"],
-        "EDUCATION": ["EDUCATION", "ACADEMIC BACKGROUND", "QUALIFICATIONS", "DEGREE"],
-        "CERTIFICATIONS": ["CERTIFICATIONS", "LICENSES", "CREDENTIALS", "ACHIEVEMENTS"],
-        "SKILLS": ["SKILLS", "TECHNICAL SKILLS", "PROFESSIONAL SKILLS"]
-        }
+        with stage('person'):
+            # The custom model's names are unreliable, so fall back to en_core_web_sm PERSON
+            statistical_doc = None
+            if self.routing == "hybrid" and not result["name"]:
+                nlp = self.nlp_statistical
+                statistical_doc = nlp(text, disable=self._skipped_components(nlp))
+                for ent in statistical_doc.ents:
+                    if "name" in self.label_map.get(ent.label_, ()):
+                        result["name"] = ent.text
+                        break
 
-        all_sections = self._extract_sections(text, section_headers)
-        
-        # Extract experience sections
-        experience_sections = [entry.split(',') for entry in all_sections.get("EXPERIENCE", '').split('\n') if entry.strip()]
-        if experience_sections:
-            result["experience"] = experience_sections
-            result["total_experience"] = self.calculate_total_experience(result["experience"])
-        
-        # Extract project sections if not already found by NER
-        if not result["projects"]:
-            project_sections = [entry.split(',') for entry in all_sections.get("PROJECTS", '').split('\n') if entry.strip()]
-            if project_sections:
-                result["projects"] = project_sections
-
-        # Extract education sections if not already found by NER
-        if not result["education"]:
-            education_sections = [entry.split(',') for entry in all_sections.get("EDUCATION", '').split('\n') if entry.strip()]
-            if education_sections:
-                result["education"] = education_sections
-        
-        # Extract certifications sections if not already found by NER
-        if not result["certifications"]:
-            certification_sections = [entry.split(',') for entry in all_sections.get("CERTIFICATIONS", '').split('\n') if entry.strip()]
-            if certification_sections:
-                result["certifications"] = certification_sections
-
-        # If no skills were found by NER, try to extract them using keywords
-        if not result["skills"]:
-            result["skills"] = self._extract_skills(text, all_sections)
-        
-        result["score"] = self.calculate_resume_score(result)
+        with stage('regex'):
+            # Extract email using regex
+            email = self.email_pattern.search(text)
+            if email:
+                result["email"] = email.group(0)
+
+            # Extract phone using regex
+            phone = self.phone_pattern.search(text)
+            if phone:
+                result["phone"] = phone.group(2)
+
+            # Extract URLs using regex
+            urls = self.url_pattern.findall(text)
+            if urls:
+                result["urls"] = [url[0] + url[1] + url[2] for url in urls if url[0] or url[1]]
+
+        with stage('sections'):
+            sections, section_blocks = self._split_sections(text)
+            all_sections = self._format_sections(sections)
+
+            # Extract experience sections
+            experience_sections = [entry.split(',') for entry in all_sections.get("EXPERIENCE", '').split('\n') if entry.strip()]
+            if experience_sections:
+                result["experience"] = experience_sections
+                result["total_experience"] = self.calculate_total_experience(result["experience"])
+
+            # Extract project sections if not already found by NER
+            if not result["projects"]:
+                project_sections = [entry.split(',') for entry in all_sections.get("PROJECTS", '').split('\n') if entry.strip()]
+                if project_sections:
+                    result["projects"] = project_sections
+
+            # Extract education sections if not already found by NER
+            if not result["education"]:
+                education_sections = [entry.split(',') for entry in all_sections.get("EDUCATION", '').split('\n') if entry.strip()]
+                if education_sections:
+                    result["education"] = education_sections
+
+            # Extract certifications sections if not already found by NER
+            if not result["certifications"]:
+                certification_sections = [entry.split(',') for entry in all_sections.get("CERTIFICATIONS", '').split('\n') if entry.strip()]
+                if certification_sections:
+                    result["certifications"] = certification_sections
+
+        with stage('skills'):
+            # If no skills were found by NER, try to extract them using keywords
+            if not result["skills"]:
+                result["skills"] = self._extract_skills(statistical_doc or doc, all_sections, section_blocks)
+
+        with stage('score'):
+            result["score"] = self.calculate_resume_score(result)
         return result
     
-    def calculate_total_experience(self, experience_sections):
+    @staticmethod
+    def calculate_total_experience(experience_sections):
         """Calculate total experience in years from experience sections."""
         total_months = 0
-        date_pattern = r'(\b\w{3,9}\s\d{4})\s*-\s*(\b\w{3,9}\s\d{4}|Present)'  # Matches date ranges like "Jan 2020 - Dec 2022"
 
         for section in experience_sections:
             # Ensure section is a string before applying regex
             if isinstance(section, list):
                 section = ' '.join(section)  # Join list into a single string
-            matches = re.findall(date_pattern, section)
+            matches = DATE_RANGE_PATTERN.findall(section)
             for start_date, end_date in matches:
                 try:
                     # Parse start and end dates
@@ -261,9 +439,14 @@ class ResumeParser:
 
         return round(total_months / 12, 2)  # Convert months to years
     
-    def calculate_resume_score(self, result):
+    @staticmethod
+    def calculate_resume_score(result):
+        """
+        Calculate an overall ATS-like score for the resume.
 
-        """Calculate an overall ATS-like score for the resume."""
+        This is plain arithmetic over the parsed fields, so it can be called on the
+        class (ResumeParser.calculate_resume_score(record)) without loading any model.
+        """
         score = 0
         max_score = 100  # Define the maximum possible score
 
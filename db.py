@@ -0,0 +1,438 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from job_sync import add_match_sources, create_job_sync_tables
+from parse_cache import create_parse_cache_table
+from resume_search import create_fts_index
+from text_store import move_raw_text, register_functions, store_text
+
+DB_PATH = 'resumes.db'
+
+# Applied to every connection. WAL lets readers proceed while an upload is writing;
+# NORMAL sync is durable across application crashes in WAL mode.
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', 5000),
+    ('cache_size', -20000),       # negative = KiB, i.e. ~20 MB page cache
+    ('mmap_size', 268435456),     # 256 MB memory-mapped reads
+    ('temp_store', 'MEMORY'),
+)
+
+_local = threading.local()
+
+
+def connect(db_path=DB_PATH):
+    """Open a new tuned connection with rows accessible by column name."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    register_functions(conn)
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def get_connection(db_path=DB_PATH):
+    """
+    Return this thread's pooled connection to `db_path`, opening it on first use.
+
+    Connections are reused for the lifetime of the thread, so callers must not close
+    them; use `with conn:` to commit or roll back a transaction.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = connect(db_path)
+    return conn
+
+
+def close_connection(db_path=DB_PATH):
+    """Close this thread's pooled connection to `db_path`, if any."""
+    connections = getattr(_local, 'connections', {})
+    conn = connections.pop(db_path, None)
+    if conn is not None:
+        conn.close()
+
+
+def create_indexes(cursor):
+    """Index the columns filtered or sorted on by view_resume, view_job and list_resumes."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_matches_resume ON job_matches (resume_id, match_score DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_matches_job ON job_matches (job_id, match_score DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_uploaded_at ON resumes (uploaded_at)')
+
+
+# List fields of a parsed resume stored one row per item in resume_entities
+ENTITY_FIELDS = ('education', 'experience', 'job_titles', 'companies', 'projects', 'certifications')
+
+
+def create_normalized_tables(cursor):
+    """
+    Move the JSON list columns of resumes into normalized tables and backfill them.
+
+    skills is an interned dictionary (names compare case-insensitively) and
+    resume_skills joins it to resumes in both directions: its primary key covers
+    "skills of a resume" and idx_resume_skills_skill covers "resumes with a skill".
+    The other list fields go to resume_entities, one row per item; an item that is
+    itself a list (an experience entry) is stored one row per part.
+
+    resumes.skills keeps its JSON text because the full-text index reads it; the
+    other JSON columns are cleared.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE COLLATE NOCASE
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resume_skills (
+        resume_id INTEGER NOT NULL,
+        skill_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (resume_id, skill_id),
+        FOREIGN KEY (resume_id) REFERENCES resumes (id),
+        FOREIGN KEY (skill_id) REFERENCES skills (id)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (skill_id, resume_id)')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resume_entities (
+        resume_id INTEGER NOT NULL,
+        field TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        part INTEGER NOT NULL,
+        value TEXT NOT NULL,
+        is_list INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (resume_id, field, position, part),
+        FOREIGN KEY (resume_id) REFERENCES resumes (id)
+    ) WITHOUT ROWID
+    ''')
+
+    # Backfill the rows stored before this migration
+    rows = cursor.execute(f'SELECT id, skills, {", ".join(ENTITY_FIELDS)} FROM resumes').fetchall()
+    for row in rows:
+        fields = {}
+        for name, value in zip(('skills',) + ENTITY_FIELDS, row[1:]):
+            value = json.loads(value) if value else []
+            # Some early rows stored a single string instead of a list
+            fields[name] = [value] if isinstance(value, str) else value
+        # resume_skills.name only exists from migration 7, which backfills it
+        insert_resume_fields(cursor, row[0], fields, skill_names=False)
+    cursor.execute(f'UPDATE resumes SET {", ".join(f"{field} = NULL" for field in ENTITY_FIELDS)}')
+    print(f"Normalized the list fields of {len(rows)} resumes")
+
+
+def keep_resume_skill_names(cursor):
+    """
+    Store each resume's own spelling of its skills and drop list rows of deleted resumes.
+
+    Migration 4 created resume_skills without a name column, so every existing link
+    read back the spelling of whichever resume interned the skill first. The column
+    is added here and backfilled from each resume's skills JSON; load_resume returns
+    it, and the shared skill id is only used for filtering. A trigger now removes the
+    skill and entity rows of a deleted resume, and rows already orphaned are removed
+    here.
+    """
+    cursor.execute('ALTER TABLE resume_skills ADD COLUMN name TEXT')
+
+    rows = cursor.execute('''
+    SELECT id, skills FROM resumes
+    WHERE id IN (SELECT resume_id FROM resume_skills WHERE name IS NULL)
+    ''').fetchall()
+    names = []
+    for resume_id, skills in rows:
+        skills = json.loads(skills) if skills else []
+        skills = [skills] if isinstance(skills, str) else skills
+        # The first spelling of a skill listed twice is the one that was linked
+        first = {}
+        for skill in skills:
+            if skill:
+                first.setdefault(skill.lower(), skill)
+        names.extend((name, resume_id, name) for name in first.values())
+    cursor.executemany('''
+    UPDATE resume_skills SET name = ?
+    WHERE resume_id = ? AND skill_id = (SELECT id FROM skills WHERE name = ?)
+    ''', names)
+    cursor.execute('''
+    UPDATE resume_skills SET name = (SELECT s.name FROM skills s WHERE s.id = resume_skills.skill_id)
+    WHERE name IS NULL
+    ''')
+
+    cursor.execute('DELETE FROM resume_skills WHERE resume_id NOT IN (SELECT id FROM resumes)')
+    cursor.execute('DELETE FROM resume_entities WHERE resume_id NOT IN (SELECT id FROM resumes)')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resumes_fields_delete AFTER DELETE ON resumes BEGIN
+        DELETE FROM resume_skills WHERE resume_id = old.id;
+        DELETE FROM resume_entities WHERE resume_id = old.id;
+    END
+    ''')
+
+
+def create_ranked_matches_table(cursor):
+    """
+    Keep blended (TF-IDF + skill overlap) job rankings apart from job_matches.
+
+    job_matches holds skill-overlap scores only, from upload-time matching and
+    catalog syncs, so view_job compares like with like. Rankings from
+    job_vectors.rerank_resumes, or uploads scored with a text weight, go to
+    ranked_matches together with the weight they were blended with.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ranked_matches (
+        resume_id INTEGER NOT NULL,
+        job_id INTEGER NOT NULL,
+        job_title TEXT,
+        match_score REAL NOT NULL,
+        text_score REAL,
+        skill_score REAL,
+        text_weight REAL NOT NULL,
+        ranked_at TIMESTAMP,
+        PRIMARY KEY (resume_id, job_id),
+        FOREIGN KEY (resume_id) REFERENCES resumes (id)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ranked_matches_resume ON ranked_matches (resume_id, match_score DESC)')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resumes_ranked_matches_delete AFTER DELETE ON resumes BEGIN
+        DELETE FROM ranked_matches WHERE resume_id = old.id;
+    END
+    ''')
+
+
+# Versioned schema migrations, tracked with PRAGMA user_version
+MIGRATIONS = [
+    (1, create_fts_index),
+    (2, create_indexes),
+    (3, create_parse_cache_table),
+    (4, create_normalized_tables),
+    (5, create_job_sync_tables),
+    (6, move_raw_text),
+    (7, keep_resume_skill_names),
+    (8, add_match_sources),
+    (9, create_ranked_matches_table),
+]
+
+
+def init_db(db_path=DB_PATH):
+    """Create the base schema and apply any pending migrations."""
+    conn = connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resumes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        email TEXT,
+        phone TEXT,
+        skills TEXT,
+        education TEXT,
+        experience TEXT,
+        job_titles TEXT,
+        companies TEXT,
+        projects TEXT,
+        certifications TEXT,
+        uploaded_at TIMESTAMP,
+        filename TEXT,
+        raw_text TEXT
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        resume_id INTEGER,
+        job_id INTEGER,
+        job_title TEXT,
+        match_score REAL,
+        FOREIGN KEY (resume_id) REFERENCES resumes (id)
+    )
+    ''')
+
+    # Apply schema migrations that this database has not seen yet
+    current_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    for version, migrate in MIGRATIONS:
+        if version > current_version:
+            migrate(cursor)
+            cursor.execute(f'PRAGMA user_version = {version}')
+            print(f"Applied database migration {version}: {migrate.__name__}")
+
+    conn.commit()
+    conn.close()
+
+
+def insert_resume(cursor, parsed_data, filename, text, uploaded_at=None):
+    """Insert a parsed resume with its list fields and text and return its id (the caller owns the transaction)."""
+    cursor.execute('''
+    INSERT INTO resumes (name, email, phone, skills, uploaded_at, filename)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        parsed_data["name"],
+        parsed_data["email"],
+        parsed_data["phone"],
+        json.dumps(parsed_data["skills"]),
+        uploaded_at or datetime.now(),
+        filename
+    ))
+    resume_id = cursor.lastrowid
+    insert_resume_fields(cursor, resume_id, parsed_data)
+    store_text(cursor, resume_id, text)
+    return resume_id
+
+
+def insert_resume_fields(cursor, resume_id, parsed_data, skill_names=True):
+    """
+    Store the skills and other list fields of one resume in the normalized tables.
+
+    Skills are interned and linked with one executemany each; a skill listed twice
+    (in any case) is linked once, at its first position and with its first spelling.
+    `skill_names` is False only for the migration 4 backfill, which runs before
+    resume_skills has its name column.
+    """
+    skills = [skill for skill in parsed_data.get("skills") or [] if skill]
+    cursor.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(skill,) for skill in skills])
+    if skill_names:
+        cursor.executemany('''
+        INSERT OR IGNORE INTO resume_skills (resume_id, skill_id, position, name)
+        SELECT ?, id, ?, ? FROM skills WHERE name = ?
+        ''', [(resume_id, position, skill, skill) for position, skill in enumerate(skills)])
+    else:
+        cursor.executemany('''
+        INSERT OR IGNORE INTO resume_skills (resume_id, skill_id, position)
+        SELECT ?, id, ? FROM skills WHERE name = ?
+        ''', [(resume_id, position, skill) for position, skill in enumerate(skills)])
+
+    entities = []
+    for field in ENTITY_FIELDS:
+        for position, item in enumerate(parsed_data.get(field) or []):
+            if isinstance(item, list):
+                entities.extend((resume_id, field, position, part, str(value), 1) for part, value in enumerate(item))
+            else:
+                entities.append((resume_id, field, position, 0, str(item), 0))
+    cursor.executemany('''
+    INSERT INTO resume_entities (resume_id, field, position, part, value, is_list)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', entities)
+
+
+# Columns of resumes still holding data; the list fields and the text live in their own tables
+RESUME_COLUMNS = ('id', 'name', 'email', 'phone', 'uploaded_at', 'filename')
+
+
+def load_resume(conn, resume_id):
+    """
+    Load a resume row with its list fields rebuilt from the normalized tables.
+
+    The extracted text is not loaded; use text_store.load_text where it is needed.
+
+    Returns:
+        dict: The resume, or None if there is no resume with this id
+    """
+    row = conn.execute(f'SELECT {", ".join(RESUME_COLUMNS)} FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+    if row is None:
+        return None
+
+    resume = dict(row)
+    resume['skills'] = [skill for (skill,) in conn.execute('''
+    SELECT name FROM resume_skills
+    WHERE resume_id = ?
+    ORDER BY position
+    ''', (resume_id,))]
+
+    for field in ENTITY_FIELDS:
+        resume[field] = []
+    entities = conn.execute('''
+    SELECT field, part, value, is_list FROM resume_entities
+    WHERE resume_id = ?
+    ORDER BY field, position, part
+    ''', (resume_id,))
+    for field, part, value, is_list in entities:
+        items = resume[field]
+        if not is_list:
+            items.append(value)
+        elif part == 0:
+            items.append([value])
+        else:
+            items[-1].append(value)
+    return resume
+
+
+def find_resumes_with_skills(conn, skills, limit=100):
+    """
+    Return the ids of the resumes listing every one of `skills` (any case), newest first.
+
+    Answered from the skill dictionary and idx_resume_skills_skill alone; the
+    resumes table is never read. A negative `limit` returns every match.
+    """
+    skills = list({skill.lower(): skill for skill in skills}.values())
+    if not skills:
+        return []
+    placeholders = ', '.join('?' for _ in skills)
+    rows = conn.execute(f'''
+    SELECT rs.resume_id FROM skills s
+    JOIN resume_skills rs ON rs.skill_id = s.id
+    WHERE s.name IN ({placeholders})
+    GROUP BY rs.resume_id
+    HAVING COUNT(*) = ?
+    ORDER BY rs.resume_id DESC
+    LIMIT ?
+    ''', (*skills, len(skills), limit))
+    return [row[0] for row in rows]
+
+
+# Job matches shown with a resume (the number upload-time matching keeps)
+RESUME_MATCH_LIMIT = 10
+
+
+def load_job_matches(conn, resume_id, limit=RESUME_MATCH_LIMIT):
+    """
+    Return the best `limit` job matches of a resume.
+
+    The resume's blended ranking from ranked_matches is used when it has one,
+    otherwise its skill-overlap matches from job_matches; both are read in score
+    order from their (resume_id, match_score) index.
+    """
+    for table in ('ranked_matches', 'job_matches'):
+        rows = conn.execute(f'''
+        SELECT job_id, job_title, match_score FROM {table}
+        WHERE resume_id = ?
+        ORDER BY match_score DESC
+        LIMIT ?
+        ''', (resume_id, limit)).fetchall()
+        if rows:
+            return rows
+    return []
+
+
+def store_ranked_matches(cursor, rankings, text_weight):
+    """
+    Replace the blended rankings of some resumes (the caller owns the transaction).
+
+    Args:
+        cursor: Database cursor
+        rankings: (resume_id, matches) pairs, matches as returned by JobVectorIndex.match_many
+        text_weight: The text weight the scores were blended with
+    """
+    now = datetime.now()
+    cursor.executemany('DELETE FROM ranked_matches WHERE resume_id = ?', [(resume_id,) for resume_id, _ in rankings])
+    cursor.executemany('''
+    INSERT INTO ranked_matches (resume_id, job_id, job_title, match_score, text_score, skill_score, text_weight, ranked_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(resume_id, match["job_id"], match["job_title"], match["match_score"], match["text_score"],
+           match["skill_score"], text_weight, now) for resume_id, matches in rankings for match in matches])
+
+
+def insert_job_matches(cursor, resume_id, job_matches):
+    """Store the upload-time job matches of one resume in a single executemany."""
+    cursor.executemany('''
+    INSERT INTO job_matches (resume_id, job_id, job_title, match_score)
+    VALUES (?, ?, ?, ?)
+    ''', [(
+        resume_id,
+        match["job_id"],
+        match["job_title"],
+        match["match_score"]
+    ) for match in job_matches])
@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the ingest queue is at capacity."""
+
+
+class StageTimer:
+    """Records how long each named stage of a pipeline run takes, in milliseconds."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+class IngestQueue:
+    """
+    Bounded in-process job queue served by a pool of worker threads.
+
+    Jobs are handed to `handler(payload, timer)`, whose return value is stored as the
+    job's result. Finished job records are kept for polling until more than
+    `max_records` jobs have been seen, oldest first.
+    """
+
+    def __init__(self, handler, num_workers=2, max_queue_size=32, max_records=1000):
+        self.handler = handler
+        self.num_workers = num_workers
+        self.max_records = max_records
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def start(self):
+        """Start the worker threads (idempotent)."""
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = threading.Thread(target=self._work, name=f"ingest-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def submit(self, payload, **info):
+        """
+        Queue a job without blocking.
+
+        Args:
+            payload: Object passed to the handler
+            **info: Extra fields stored on the job record (e.g. filename)
+
+        Returns:
+            str: The job id
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        self.start()
+        job_id = uuid.uuid4().hex
+        record = {
+            "id": job_id,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "queue_wait_ms": None,
+            "stages": {},
+            "result": None,
+            "error": None,
+        }
+        record.update(info)
+
+        with self._lock:
+            try:
+                self._queue.put_nowait((job_id, payload))
+            except queue.Full:
+                raise QueueFullError(f"Ingest queue is full ({self._queue.maxsize} jobs waiting)")
+            self._jobs[job_id] = record
+            self._evict_finished()
+        return job_id
+
+    def get(self, job_id):
+        """Return a copy of the job record, or None if it is unknown or was evicted."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record, stages=dict(record["stages"])) if record else None
+
+    def depth(self):
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def _evict_finished(self):
+        # Oldest records go first, but never drop a job that is still pending
+        excess = len(self._jobs) - self.max_records
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id]["status"] in ("done", "failed"):
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _work(self):
+        while True:
+            job_id, payload = self._queue.get()
+            timer = StageTimer()
+            with self._lock:
+                record = self._jobs[job_id]
+                record["status"] = "running"
+                record["started_at"] = time.time()
+                record["queue_wait_ms"] = round((record["started_at"] - record["submitted_at"]) * 1000, 2)
+                # Shared with the timer so pollers see stages as they complete
+                record["stages"] = timer.stages
+
+            try:
+                result = self.handler(payload, timer)
+                status, error = "done", None
+            except Exception as e:
+                traceback.print_exc()
+                result, status, error = None, "failed", str(e)
+
+            with self._lock:
+                record["status"] = status
+                record["result"] = result
+                record["error"] = error
+                record["finished_at"] = time.time()
+            self._queue.task_done()
@@ -0,0 +1,177 @@
+import ast
+import csv
+import os
+import pickle
+import threading
+
+from job_index import JobIndex
+
+JOBS_FILE_PATH = 'data/jobs/all_job_post.csv'
+
+# Bump when the pickled snapshot layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Job fields shown in catalog listings; descriptions are only loaded per job
+JOB_SUMMARY_FIELDS = ("id", "category", "title", "skills")
+
+
+def load_jobs_from_csv(file_path=JOBS_FILE_PATH):
+    jobs = []
+    with open(file_path, 'r') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            jobs.append({
+                "id": int(row["job_id"]),
+                "category": row["category"],
+                "title": row["job_title"],
+                "description": row["job_description"],
+                "skills": [skill.strip().lower() for skill in ast.literal_eval(row["job_skill_set"])]
+            })
+    return jobs
+
+
+class JobCatalog:
+    """
+    Process-wide cache of the job catalog CSV.
+
+    Jobs are kept in a dict keyed by job id together with a JobIndex for matching.
+    The CSV is only re-read when its mtime or size changes, and every load is
+    written to a pickle snapshot so a cold start can skip CSV and literal parsing.
+    The JobVectorIndex is built on first use and persisted the same way.
+    """
+
+    def __init__(self, file_path=JOBS_FILE_PATH, snapshot_path=None):
+        self.file_path = file_path
+        self.snapshot_path = snapshot_path or os.path.splitext(file_path)[0] + '.pkl'
+        self.vector_snapshot_path = os.path.splitext(self.snapshot_path)[0] + '.vectors.pkl'
+        self._lock = threading.Lock()
+        self._signature = None
+        self._jobs = []
+        self._jobs_by_id = {}
+        self._positions = {}
+        self._index = None
+        self._vector_index = None
+        self._counters = {"hits": 0, "misses": 0, "reloads": 0, "snapshot_loads": 0, "csv_loads": 0}
+
+    def _file_signature(self):
+        stat = os.stat(self.file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _ensure_fresh(self):
+        signature = self._file_signature()
+        if signature == self._signature:
+            self._counters["hits"] += 1
+            return
+
+        with self._lock:
+            if signature == self._signature:
+                self._counters["hits"] += 1
+                return
+            self._counters["misses"] += 1
+            if self._signature is not None:
+                self._counters["reloads"] += 1
+            self._load(signature)
+
+    def _load(self, signature):
+        snapshot = self._read_snapshot(signature)
+        if snapshot is not None:
+            jobs, index = snapshot
+            self._counters["snapshot_loads"] += 1
+        else:
+            jobs = load_jobs_from_csv(self.file_path)
+            index = JobIndex(jobs)
+            self._counters["csv_loads"] += 1
+            self._write_snapshot(signature, jobs, index)
+
+        self._jobs = jobs
+        self._jobs_by_id = {job["id"]: job for job in jobs}
+        self._positions = {job["id"]: position for position, job in enumerate(jobs)}
+        self._index = index
+        self._vector_index = None
+        self._signature = signature
+        print(f"Loaded {len(jobs)} jobs from {'snapshot' if snapshot is not None else self.file_path}")
+
+    def _read_snapshot(self, signature):
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable job catalog snapshot {self.snapshot_path}: {e}")
+            return None
+        if snapshot.get("format") != SNAPSHOT_FORMAT_VERSION or snapshot.get("signature") != signature:
+            return None
+        return snapshot["jobs"], snapshot["index"]
+
+    def _write_snapshot(self, signature, jobs, index):
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    "format": SNAPSHOT_FORMAT_VERSION,
+                    "signature": signature,
+                    "jobs": jobs,
+                    "index": index,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Could not write job catalog snapshot {self.snapshot_path}: {e}")
+
+    def all(self):
+        """Return every job in catalog order."""
+        self._ensure_fresh()
+        return self._jobs
+
+    def get(self, job_id):
+        """Return the job with the given id, or None."""
+        self._ensure_fresh()
+        return self._jobs_by_id.get(job_id)
+
+    def page(self, after_id=None, limit=20):
+        """
+        Return up to `limit` job summaries (JOB_SUMMARY_FIELDS only) in catalog order.
+
+        Args:
+            after_id: Start after the job with this id (default: from the first job)
+            limit: Maximum number of jobs
+
+        Raises:
+            ValueError: If `after_id` is not in the catalog
+        """
+        self._ensure_fresh()
+        start = 0
+        if after_id is not None:
+            if after_id not in self._positions:
+                raise ValueError(f"Unknown job id: {after_id}")
+            start = self._positions[after_id] + 1
+        return [{field: job[field] for field in JOB_SUMMARY_FIELDS} for job in self._jobs[start:start + limit]]
+
+    def index(self):
+        """Return the JobIndex for the current catalog."""
+        self._ensure_fresh()
+        return self._index
+
+    def vector_index(self):
+        """Return the JobVectorIndex for the current catalog, loading or fitting it on first use."""
+        # Imported here so loading the catalog does not pull in scikit-learn and scipy
+        from job_vectors import JobVectorIndex
+
+        self._ensure_fresh()
+        with self._lock:
+            if self._vector_index is None:
+                vector_index = JobVectorIndex.load(self.vector_snapshot_path, self._signature)
+                if vector_index is None:
+                    vector_index = JobVectorIndex(self._jobs)
+                    try:
+                        vector_index.save(self.vector_snapshot_path, self._signature)
+                    except OSError as e:
+                        print(f"Could not write job vector index {self.vector_snapshot_path}: {e}")
+                self._vector_index = vector_index
+            return self._vector_index
+
+    def stats(self):
+        """Return cache hit/miss/reload counters and the current catalog size."""
+        stats = dict(self._counters)
+        stats["jobs"] = len(self._jobs)
+        return stats
@@ -0,0 +1,64 @@
+import heapq
+from collections import Counter
+
+
+class JobIndex:
+    """
+    Inverted index from skill to the jobs that require it.
+
+    Scoring is the same as the original linear scan in match_jobs: a job's score is
+    the share of its skill list covered by the resume, and ties keep catalog order.
+    Only jobs sharing at least one skill with the resume are ever touched.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        # skill -> [(job position, how often the skill appears in that job's list)]
+        self._postings = {}
+        self._skill_counts = []
+
+        for position, job in enumerate(self.jobs):
+            self._skill_counts.append(len(job["skills"]))
+            for skill, count in Counter(job["skills"]).items():
+                self._postings.setdefault(skill, []).append((position, count))
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def match(self, skills, top_k=10):
+        """
+        Return the best matching jobs for a set of resume skills.
+
+        Args:
+            skills: Skills extracted from the resume
+            top_k: Maximum number of matches to return
+
+        Returns:
+            list: Match dicts sorted by descending match_score
+        """
+        resume_skills = {skill.lower() for skill in skills}
+
+        # Count matched skills per candidate job
+        overlap = {}
+        for skill in resume_skills:
+            for position, count in self._postings.get(skill, ()):
+                overlap[position] = overlap.get(position, 0) + count
+
+        # Lowest (-score, position) first, i.e. best score and earliest job on ties
+        best = heapq.nsmallest(
+            top_k,
+            ((-matched / self._skill_counts[position], position) for position, matched in overlap.items())
+        )
+
+        matches = []
+        for negative_score, position in best:
+            job = self.jobs[position]
+            matches.append({
+                "job_id": job["id"],
+                "job_title": job["title"],
+                "match_score": -negative_score,
+                "category": job["category"],
+                "matched_skills": [skill for skill in job["skills"] if skill in resume_skills],
+                "total_skills": len(job["skills"])
+            })
+        return matches
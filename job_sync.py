@@ -0,0 +1,232 @@
+"""
+Incremental reverse matching: keep job_matches in step with the job catalog.
+
+Upload-time matching only ranks the catalog as it was when a resume arrived, so
+jobs added later never see earlier candidates. sync_job_matches compares every job
+against the fingerprint it had at the last sync and scores only the added or
+changed jobs against all stored resumes, using resume_skills as a skill -> resume
+inverted index. Each job keeps only its best DEFAULT_TOP_K resumes, so job_matches
+grows with the catalog by a bounded amount. Rows are tagged with the source that
+wrote them, and only rows the sync wrote are trimmed from a job, so each resume
+keeps the matches upload-time matching chose for it. Removed jobs lose their
+matches.
+Jobs are scored in batches outside any transaction and each batch is then written
+in one short transaction together with its new fingerprints, so uploads are not
+locked out for the scoring time, an interrupted sync resumes where it stopped, and
+the catalog version is recorded once every job is in step.
+
+Run from the repository root after editing data/jobs/all_job_post.csv:
+    python job_sync.py
+"""
+import argparse
+import hashlib
+import json
+import time
+from collections import Counter
+
+from job_catalog import JOBS_FILE_PATH, load_jobs_from_csv
+
+# Resumes kept per job; every other resume sharing a skill is dropped
+DEFAULT_TOP_K = 50
+
+
+def create_job_sync_tables(cursor):
+    """
+    Track the catalog each job's matches were computed from, and make matches upsertable.
+
+    Duplicate (job_id, resume_id) pairs are collapsed to their best score before the
+    unique index is created.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_sync (
+        job_id INTEGER PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        synced_at TIMESTAMP
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS catalog_versions (
+        version TEXT PRIMARY KEY,
+        jobs INTEGER,
+        changed INTEGER,
+        removed INTEGER,
+        synced_at TIMESTAMP
+    )
+    ''')
+    cursor.execute('''
+    DELETE FROM job_matches WHERE id NOT IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY job_id, resume_id ORDER BY match_score DESC, id
+            ) AS rank
+            FROM job_matches
+        ) WHERE rank = 1
+    )
+    ''')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_job_matches_pair ON job_matches (job_id, resume_id)')
+
+
+def add_match_sources(cursor):
+    """
+    Record which step wrote each job_matches row: 'upload' (upload-time matching) or 'sync'.
+
+    Rows written before this migration cannot be told apart and count as uploads,
+    so a sync never trims them.
+    """
+    cursor.execute("ALTER TABLE job_matches ADD COLUMN source TEXT NOT NULL DEFAULT 'upload'")
+
+
+def job_fingerprint(job):
+    """Hash the job fields that matching reads: its title and skill list."""
+    return hashlib.sha256(json.dumps([job["title"], job["skills"]]).encode('utf-8')).hexdigest()[:16]
+
+
+def catalog_version(fingerprints):
+    """Hash a {job_id: fingerprint} mapping into one version string."""
+    return hashlib.sha256(json.dumps(sorted(fingerprints.items())).encode('utf-8')).hexdigest()[:16]
+
+
+def current_catalog_version(conn):
+    """Return the catalog version of the last completed sync, or None."""
+    row = conn.execute('SELECT version FROM catalog_versions ORDER BY synced_at DESC LIMIT 1').fetchone()
+    return row[0] if row else None
+
+
+class ResumeSkillIndex:
+    """
+    Skill -> resume ids postings read from resume_skills, cached for one sync.
+
+    Skill names compare case-insensitively, like the skills dictionary.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._postings = {}
+
+    def postings(self, skill):
+        skill = skill.lower()
+        resume_ids = self._postings.get(skill)
+        if resume_ids is None:
+            resume_ids = self._postings[skill] = [row[0] for row in self.conn.execute('''
+            SELECT rs.resume_id FROM skills s
+            JOIN resume_skills rs ON rs.skill_id = s.id
+            WHERE s.name = ?
+            ''', (skill,))]
+        return resume_ids
+
+    def score(self, job, top_k=None):
+        """
+        Score every stored resume sharing a skill with `job`.
+
+        Scores match JobIndex.match: the share of the job's skill list covered by
+        the resume.
+
+        Returns:
+            list: (resume_id, match_score) pairs, best first, at most `top_k` if given
+        """
+        if not job["skills"]:
+            return []
+        overlap = Counter()
+        for skill, count in Counter(job["skills"]).items():
+            for resume_id in self.postings(skill):
+                overlap[resume_id] += count
+
+        total = len(job["skills"])
+        scores = sorted(((resume_id, matched / total) for resume_id, matched in overlap.items()),
+                        key=lambda pair: (-pair[1], pair[0]))
+        return scores[:top_k] if top_k else scores
+
+
+def _write_job_matches(cursor, job, scores):
+    """
+    Upsert one job's scores and drop the rows an earlier sync wrote that no longer qualify.
+
+    Rows from upload-time matching keep their source (and are rescored when they are
+    among `scores`) and are never dropped here.
+    """
+    cursor.executemany('''
+    INSERT INTO job_matches (resume_id, job_id, job_title, match_score, source)
+    VALUES (?, ?, ?, ?, 'sync')
+    ON CONFLICT (job_id, resume_id) DO UPDATE SET
+        job_title = excluded.job_title,
+        match_score = excluded.match_score
+    ''', [(resume_id, job["id"], job["title"], score) for resume_id, score in scores])
+
+    kept = {resume_id for resume_id, _ in scores}
+    stale = [(job["id"], resume_id) for (resume_id,) in cursor.execute(
+        "SELECT resume_id FROM job_matches WHERE job_id = ? AND source = 'sync'", (job["id"],)).fetchall()
+        if resume_id not in kept]
+    cursor.executemany('DELETE FROM job_matches WHERE job_id = ? AND resume_id = ?', stale)
+
+
+def sync_job_matches(conn, jobs, top_k=DEFAULT_TOP_K, batch_size=200):
+    """
+    Bring job_matches in step with `jobs`, recomputing only jobs that changed.
+
+    Args:
+        conn: Database connection (transactions are committed here)
+        jobs: The current catalog, as returned by load_jobs_from_csv
+        top_k: Keep only the best `top_k` resumes per job (None keeps every resume with a shared skill)
+        batch_size: Jobs scored together and written per transaction
+
+    Returns:
+        dict: The catalog version and counts of changed, removed and unchanged jobs
+    """
+    fingerprints = {job["id"]: job_fingerprint(job) for job in jobs}
+    version = catalog_version(fingerprints)
+    stats = {"version": version, "jobs": len(jobs), "changed": 0, "removed": 0, "unchanged": len(jobs),
+             "matches": 0, "seconds": 0.0}
+    if version == current_catalog_version(conn):
+        return stats
+
+    start = time.perf_counter()
+    synced = dict(conn.execute('SELECT job_id, fingerprint FROM job_sync').fetchall())
+    changed = [job for job in jobs if synced.get(job["id"]) != fingerprints[job["id"]]]
+    removed = [(job_id,) for job_id in synced if job_id not in fingerprints]
+
+    with conn:
+        conn.executemany('DELETE FROM job_matches WHERE job_id = ?', removed)
+        conn.executemany('DELETE FROM job_sync WHERE job_id = ?', removed)
+
+    index = ResumeSkillIndex(conn)
+    for i in range(0, len(changed), batch_size):
+        batch = changed[i:i + batch_size]
+        # Score before taking the write lock; the transaction only writes
+        batch_scores = [index.score(job, top_k) for job in batch]
+        with conn:
+            cursor = conn.cursor()
+            for job, scores in zip(batch, batch_scores):
+                _write_job_matches(cursor, job, scores)
+                stats["matches"] += len(scores)
+            cursor.executemany('INSERT OR REPLACE INTO job_sync (job_id, fingerprint, synced_at) VALUES (?, ?, ?)',
+                               [(job["id"], fingerprints[job["id"]], time.time()) for job in batch])
+
+    stats.update(changed=len(changed), removed=len(removed), unchanged=len(jobs) - len(changed),
+                 seconds=round(time.perf_counter() - start, 3))
+    with conn:
+        conn.execute('INSERT OR REPLACE INTO catalog_versions (version, jobs, changed, removed, synced_at) '
+                     'VALUES (?, ?, ?, ?, ?)', (version, len(jobs), len(changed), len(removed), time.time()))
+    return stats
+
+
+def main():
+    from db import DB_PATH, connect, init_db
+
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--jobs", default=JOBS_FILE_PATH, help="Job catalog CSV")
+    arg_parser.add_argument("--db", default=DB_PATH)
+    arg_parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K,
+                            help="Keep only the best N resumes per job (0 keeps every resume with a shared skill)")
+    arg_parser.add_argument("--batch-size", type=int, default=200, help="Jobs per transaction")
+    args = arg_parser.parse_args()
+
+    init_db(args.db)
+    conn = connect(args.db)
+    stats = sync_job_matches(conn, load_jobs_from_csv(args.jobs), top_k=args.top_k or None, batch_size=args.batch_size)
+    conn.close()
+    print(f"Catalog version {stats['version']}: {stats['changed']} jobs rescored, {stats['removed']} removed, "
+          f"{stats['unchanged']} unchanged, {stats['matches']} matches written in {stats['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Vectorized relevance scoring of resumes against the job catalog.
+
+JobVectorIndex scores many resumes against every job with sparse matrix products:
+    text score   cosine similarity of TF-IDF vectors (job title, description and
+                 skills vs. resume text and skills)
+    skill score  the JobIndex.match overlap score (share of the job's skill list
+                 covered by the resume)
+The two are blended as text_weight * text + (1 - text_weight) * skill, so a
+text_weight of 0 reproduces today's skill-overlap ranking. Resumes are scored in
+chunks and the top k jobs are picked per row.
+
+Batch re-ranking of every stored resume:
+    python job_vectors.py --text-weight 0.3 --top-k 10
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from db import DB_PATH, connect, init_db, store_ranked_matches
+
+# Bump when the pickled index layout changes
+VECTOR_FORMAT_VERSION = 1
+
+DEFAULT_TEXT_WEIGHT = 0.3
+
+
+def job_document(job):
+    return ' '.join([job["title"], job["description"], ' '.join(job["skills"])])
+
+
+def resume_document(text, skills):
+    return ' '.join([text or '', ' '.join(skills)])
+
+
+class JobVectorIndex:
+    """
+    TF-IDF and skill-count matrices over a job catalog.
+
+    Args:
+        jobs: Jobs as returned by load_jobs_from_csv, in catalog order
+        max_features: Vocabulary size of the TF-IDF vectorizer
+    """
+
+    def __init__(self, jobs, max_features=50000):
+        self.jobs = list(jobs)
+        self.vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True, max_features=max_features,
+                                          dtype=np.float32)
+        # jobs x terms, rows L2-normalized, stored transposed for the products below
+        self._text_matrix = self.vectorizer.fit_transform(job_document(job) for job in self.jobs).T.tocsr()
+
+        # skills x jobs, how often each skill appears in each job's list
+        self._skill_ids = {}
+        rows, cols = [], []
+        for position, job in enumerate(self.jobs):
+            for skill in job["skills"]:
+                rows.append(self._skill_ids.setdefault(skill, len(self._skill_ids)))
+                cols.append(position)
+        self._skill_matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float64), (rows, cols)),
+                                               shape=(len(self._skill_ids), len(self.jobs)))
+        self._skill_counts = np.array([len(job["skills"]) or 1 for job in self.jobs], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def save(self, path, signature=None):
+        """Pickle the index to `path`, atomically."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"format": VECTOR_FORMAT_VERSION, "signature": signature, "index": self}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path, signature=None):
+        """Return the index pickled at `path`, or None if it is missing, unreadable or stale."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable job vector index {path}: {e}")
+            return None
+        if snapshot.get("format") != VECTOR_FORMAT_VERSION or snapshot.get("signature") != signature:
+            return None
+        return snapshot["index"]
+
+    def _skill_rows(self, skills_lists):
+        """resumes x skills binary matrix; skills no job asks for are dropped."""
+        rows, cols = [], []
+        for row, skills in enumerate(skills_lists):
+            ids = {self._skill_ids.get(skill.lower()) for skill in skills} - {None}
+            rows.extend([row] * len(ids))
+            cols.extend(ids)
+        return sparse.csr_matrix((np.ones(len(rows), dtype=np.float64), (rows, cols)),
+                                 shape=(len(skills_lists), len(self._skill_ids)))
+
+    def scores(self, texts, skills_lists, text_weight=DEFAULT_TEXT_WEIGHT):
+        """
+        Score a chunk of resumes against every job.
+
+        Returns:
+            tuple: (blended, text, skill) dense resumes x jobs arrays
+        """
+        skill = (self._skill_rows(skills_lists) @ self._skill_matrix).toarray() / self._skill_counts
+        if text_weight:
+            resume_matrix = self.vectorizer.transform(
+                resume_document(text, skills) for text, skills in zip(texts, skills_lists))
+            text = (resume_matrix @ self._text_matrix).toarray().astype(np.float64)
+        else:
+            text = np.zeros_like(skill)
+        return text_weight * text + (1 - text_weight) * skill, text, skill
+
+    def match_many(self, texts, skills_lists, top_k=10, text_weight=DEFAULT_TEXT_WEIGHT, chunk_size=512):
+        """
+        Return the best matching jobs for each of many resumes.
+
+        Args:
+            texts: Resume texts
+            skills_lists: Extracted skills of each resume
+            top_k: Maximum number of matches per resume
+            text_weight: Share of the TF-IDF score in the blended match_score
+            chunk_size: Resumes scored per matrix product
+
+        Returns:
+            list: One list of match dicts per resume, sorted by descending match_score
+                  (ties keep catalog order, like JobIndex.match)
+        """
+        results = []
+        for start in range(0, len(skills_lists), chunk_size):
+            chunk_skills = skills_lists[start:start + chunk_size]
+            blended, text, skill = self.scores(texts[start:start + chunk_size], chunk_skills, text_weight)
+            k = min(top_k, blended.shape[1])
+            if k == 0:
+                results.extend([] for _ in chunk_skills)
+                continue
+            # The k-th best score of each row; every job scoring at least that much is a
+            # candidate, so ties at the cut are broken by catalog order, not by argpartition
+            cutoffs = np.maximum(-np.partition(-blended, k - 1, axis=1)[:, k - 1], np.finfo(np.float64).tiny)
+            for row, skills in enumerate(chunk_skills):
+                candidates = np.flatnonzero(blended[row] >= cutoffs[row])
+                positions = candidates[np.lexsort((candidates, -blended[row, candidates]))][:k]
+                resume_skills = {s.lower() for s in skills}
+                results.append([self._match(position, resume_skills, blended[row, position],
+                                            text[row, position], skill[row, position]) for position in positions])
+        return results
+
+    def match(self, text, skills, top_k=10, text_weight=DEFAULT_TEXT_WEIGHT):
+        """Return the best matching jobs for one resume (see match_many)."""
+        return self.match_many([text], [skills], top_k=top_k, text_weight=text_weight)[0]
+
+    def _match(self, position, resume_skills, score, text_score, skill_score):
+        job = self.jobs[position]
+        return {
+            "job_id": job["id"],
+            "job_title": job["title"],
+            "match_score": float(score),
+            "text_score": round(float(text_score), 4),
+            "skill_score": float(skill_score),
+            "category": job["category"],
+            "matched_skills": [skill for skill in job["skills"] if skill in resume_skills],
+            "total_skills": len(job["skills"])
+        }
+
+
+def rerank_resumes(conn, vector_index, top_k=10, text_weight=DEFAULT_TEXT_WEIGHT, batch_size=2000):
+    """
+    Re-rank every stored resume against the catalog and replace its blended ranking.
+
+    Each batch of resumes is scored with one matrix product per chunk and its
+    rankings in ranked_matches are replaced in one transaction. job_matches, with
+    the skill-overlap scores of uploads and catalog syncs, is left alone.
+
+    Returns:
+        dict: Number of resumes and matches written and the elapsed seconds
+    """
+    start = time.perf_counter()
+    stats = {"resumes": 0, "matches": 0}
+    last_id = 0
+    while True:
+        rows = conn.execute('SELECT id, skills, raw_text FROM resume_documents WHERE id > ? ORDER BY id LIMIT ?',
+                            (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        skills_lists = [json.loads(row[1]) if row[1] else [] for row in rows]
+        matches = vector_index.match_many([row[2] for row in rows], skills_lists, top_k=top_k,
+                                          text_weight=text_weight)
+        with conn:
+            store_ranked_matches(conn.cursor(), [(row[0], resume_matches) for row, resume_matches in zip(rows, matches)],
+                                 text_weight)
+        stats["resumes"] += len(rows)
+        stats["matches"] += sum(len(resume_matches) for resume_matches in matches)
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def main():
+    from job_catalog import JOBS_FILE_PATH, JobCatalog
+
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--jobs", default=JOBS_FILE_PATH, help="Job catalog CSV")
+    arg_parser.add_argument("--db", default=DB_PATH)
+    arg_parser.add_argument("--top-k", type=int, default=10, help="Matches kept per resume")
+    arg_parser.add_argument("--text-weight", type=float, default=DEFAULT_TEXT_WEIGHT,
+                            help="Share of the TF-IDF score in match_score (0 = skill overlap only)")
+    args = arg_parser.parse_args()
+
+    init_db(args.db)
+    conn = connect(args.db)
+    stats = rerank_resumes(conn, JobCatalog(args.jobs).vector_index(), top_k=args.top_k,
+                           text_weight=args.text_weight)
+    conn.close()
+    print(f"Re-ranked {stats['resumes']} resumes, {stats['matches']} matches written in {stats['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
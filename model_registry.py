@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import spacy
+
+
+def _current_rss():
+    """Return the resident set size of this process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+        # ru_maxrss is the peak RSS: kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return 0
+
+
+def _fingerprint(name):
+    """
+    Fingerprint a model directory by the size and mtime of its files, or an installed
+    model package by its version.
+    """
+    if os.path.isdir(name):
+        files = []
+        for root, _, names in os.walk(name):
+            for file_name in names:
+                path = os.path.join(root, file_name)
+                stat = os.stat(path)
+                files.append((os.path.relpath(path, name), stat.st_size, stat.st_mtime_ns))
+        source = sorted(files)
+    else:
+        source = [name, spacy.util.get_package_version(name)]
+    fingerprint = {"model": source, "spacy": spacy.__version__}
+    return hashlib.sha256(json.dumps(fingerprint).encode('utf-8')).hexdigest()[:16]
+
+
+class ModelRegistry:
+    """Process-wide cache of spaCy pipelines, each loaded lazily and at most once."""
+
+    def __init__(self):
+        self._models = {}
+        self._stats = {}
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """
+        Return the pipeline registered under `name`, loading it on first use.
+
+        Args:
+            name: A spaCy package name (e.g. "en_core_web_sm") or a model directory
+
+        Returns:
+            spacy.language.Language: The shared pipeline instance
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                rss_before = _current_rss()
+                start = time.perf_counter()
+                model = spacy.load(name)
+                load_seconds = time.perf_counter() - start
+                rss_delta = max(_current_rss() - rss_before, 0)
+
+                self._models[name] = model
+                self._fingerprints.setdefault(name, _fingerprint(name))
+                self._stats[name] = {
+                    "pipeline": list(model.pipe_names),
+                    "load_seconds": round(load_seconds, 3),
+                    "rss_delta_mb": round(rss_delta / (1024 * 1024), 1),
+                    "loaded_at": time.time(),
+                    "pid": os.getpid(),
+                }
+                print(f"Loaded spaCy model '{name}' in {load_seconds:.2f}s (+{rss_delta / (1024 * 1024):.1f} MB RSS)")
+
+        return self._models[name]
+
+    def fingerprint(self, name):
+        """
+        Return a short hash identifying the pipeline registered under `name`.
+
+        It is computed once, when the model is loaded or first asked for, and kept
+        until clear(), so callers such as the parse cache can use it on every request.
+        """
+        fingerprint = self._fingerprints.get(name)
+        if fingerprint is None:
+            fingerprint = self._fingerprints.setdefault(name, _fingerprint(name))
+        return fingerprint
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def stats(self):
+        """Return load time and memory usage for every model loaded so far."""
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def clear(self):
+        """Drop all cached pipelines (mainly useful after a model is retrained)."""
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+            self._fingerprints.clear()
+
+
+# Shared by the Flask app, background workers and command-line tools
+registry = ModelRegistry()
+
+
+def get_model(name):
+    """Return a shared pipeline from the process-wide registry."""
+    return registry.get(name)
@@ -0,0 +1,358 @@
+"""
+Compile NER training data once into binary spaCy DocBin files.
+
+Examples are read from the JSONL shards written by process_json_data.py (or a
+Dataturks JSON export), whitespace is trimmed from entity spans, overlapping and
+misaligned entities are dropped, and the result is serialized to train/ and dev/
+directories of DocBin shards. The compiled corpus is keyed by a hash of the source
+data and the compile settings, so it is rebuilt only when either changes.
+
+The shards can be read in parallel: load_docs() takes a number of loader threads,
+and the "resume_ner.ShardedCorpus.v1" reader does the same for `spacy train`.
+
+Usage:
+    python ner_corpus.py data/processed --output data/corpus --dev-fraction 0.2
+"""
+import argparse
+import hashlib
+import json
+import glob
+import logging
+import os
+import random
+import re
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import spacy
+from spacy.tokens import DocBin
+from spacy.training import Example
+
+from process_json_data import MANIFEST_FILE, iter_training_examples
+
+CORPUS_DIR = "data/corpus"
+SOURCE_PATH = "data/processed"
+TRAIN_DIR = "train"
+DEV_DIR = "dev"
+META_FILE = "corpus.json"
+SHARD_SIZE = 500
+
+# Unpaired UTF-16 surrogates left by some PDF extractions; spaCy cannot hash them
+LONE_SURROGATE_PATTERN = re.compile('[\ud800-\udfff]')
+
+
+def remove_overlapping_entities(training_data):
+    """Remove overlapping entities from the training data."""
+    cleaned_data = []
+    for text, annotations in training_data:
+        entities = annotations["entities"]
+        non_overlapping_entities = []
+        entities = sorted(entities, key=lambda x: x[0])  # Sort by start position
+        prev_end = -1
+        for start, end, label in entities:
+            if start >= prev_end:  # No overlap
+                non_overlapping_entities.append((start, end, label))
+                prev_end = end
+        cleaned_data.append((text, {"entities": non_overlapping_entities}))
+    return cleaned_data
+
+
+def trim_entity_spans(data: list) -> list:
+    """Removes leading and trailing white spaces from entity spans."""
+    invalid_span_tokens = re.compile(r'\s')  # Matches whitespace characters
+
+    cleaned_data = []
+    for text, annotations in data:
+        entities = annotations['entities']
+        valid_entities = []
+        for start, end, label in entities:
+            valid_start = start
+            valid_end = end
+
+            # Adjust the start position to skip leading whitespace
+            while valid_start < len(text) and invalid_span_tokens.match(text[valid_start]):
+                valid_start += 1
+
+            # Adjust the end position to skip trailing whitespace
+            while valid_end > valid_start and invalid_span_tokens.match(text[valid_end - 1]):
+                valid_end -= 1
+
+            # Only add the entity if the span is valid
+            if valid_start < valid_end:
+                valid_entities.append((valid_start, valid_end, label))
+
+        cleaned_data.append((text, {'entities': valid_entities}))
+
+    return cleaned_data
+
+
+def convert_dataturks_to_spacy(dataturks_JSON_FilePath):
+    """Read a Dataturks line-delimited JSON export as (text, {"entities": [...]}) examples."""
+    try:
+        training_data = []
+        with open(dataturks_JSON_FilePath, 'r', encoding="utf8") as f:
+            lines = f.readlines()
+
+        for line in lines:
+            data = json.loads(line)
+            text = data['content']
+            entities = []
+            if data['annotation'] is not None:
+                for annotation in data['annotation']:
+                    point = annotation['points'][0]
+                    labels = annotation['label']
+                    if not isinstance(labels, list):
+                        labels = [labels]
+
+                    for label in labels:
+                        entities.append((
+                            point['start'],
+                            point['end'] + 1,
+                            label
+                        ))
+
+            training_data.append((text, {"entities": entities}))
+        return training_data
+    except Exception:
+        logging.exception("Unable to process " + dataturks_JSON_FilePath)
+        return None
+
+
+def iter_source_examples(source_path):
+    """Yield (text, annotations) from a processed shard directory or a Dataturks export."""
+    if os.path.isdir(source_path):
+        yield from iter_training_examples(source_path)
+    else:
+        yield from convert_dataturks_to_spacy(source_path) or []
+
+
+def source_hash(source_path, **settings):
+    """
+    Hash the source data together with the settings the corpus is compiled with.
+
+    A shard directory is identified by its manifest, which already holds the hash
+    of every source file, so the shards themselves are not read.
+    """
+    digest = hashlib.sha256()
+    path = os.path.join(source_path, MANIFEST_FILE) if os.path.isdir(source_path) else source_path
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    digest.update(json.dumps(dict(settings, spacy=spacy.__version__), sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def is_dev_example(text, dev_fraction):
+    """Assign an example to the dev split by a hash of its text, so the split is stable as the corpus grows."""
+    bucket = int(hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return bucket < dev_fraction
+
+
+def make_doc(nlp, text, entities, stats):
+    """Build a gold Doc, dropping entities that do not align with token boundaries."""
+    # Replaced one for one, so entity offsets stay valid
+    doc = nlp.make_doc(LONE_SURROGATE_PATTERN.sub('\ufffd', text))
+    spans = []
+    for start, end, label in entities:
+        span = doc.char_span(start, end, label=label)
+        if span is None:
+            stats["misaligned_entities"] += 1
+        else:
+            spans.append(span)
+    doc.set_ents(spans, default="outside")
+    return doc
+
+
+class _DocBinShardWriter:
+    """Write Docs to numbered DocBin files of `shard_size` Docs each."""
+
+    def __init__(self, split_dir, shard_size):
+        self.split_dir = split_dir
+        self.shard_size = shard_size
+        self.doc_bin = DocBin(store_user_data=False)
+        self.shards = 0
+        self.count = 0
+        # Shards of a previous compile would otherwise be read alongside the new ones
+        shutil.rmtree(split_dir, ignore_errors=True)
+        os.makedirs(split_dir)
+
+    def add(self, doc):
+        self.doc_bin.add(doc)
+        self.count += 1
+        if len(self.doc_bin) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.doc_bin):
+            split = os.path.basename(self.split_dir)
+            self.doc_bin.to_disk(os.path.join(self.split_dir, f"{split}-{self.shards:05d}.spacy"))
+            self.shards += 1
+            self.doc_bin = DocBin(store_user_data=False)
+
+
+def compile_corpus(source_path=SOURCE_PATH, output_dir=CORPUS_DIR, dev_fraction=0.2, lang="en",
+                   shard_size=SHARD_SIZE, force=False):
+    """
+    Validate, clean and serialize the training data to train/dev DocBin shards.
+
+    Args:
+        source_path: Processed shard directory or Dataturks JSON export
+        output_dir: Directory for the train/ and dev/ shards and corpus.json
+        dev_fraction: Share of examples held out for evaluation
+        lang: Language of the blank pipeline used for tokenization
+        shard_size: Number of Docs per DocBin shard
+        force: Recompile even if the cached corpus matches the source
+
+    Returns:
+        dict: Corpus metadata ("train_path", "dev_path", "labels", counts, "source_hash")
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"Training data not found at {source_path}. Run process_json_data.py first.")
+
+    current_hash = source_hash(source_path, dev_fraction=dev_fraction, lang=lang, shard_size=shard_size)
+    meta_path = os.path.join(output_dir, META_FILE)
+    if not force and os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("source_hash") == current_hash:
+            print(f"Using cached corpus in {output_dir} ({meta['train']} train / {meta['dev']} dev docs)")
+            return meta
+        os.remove(meta_path)
+
+    os.makedirs(output_dir, exist_ok=True)
+    nlp = spacy.blank(lang)
+    train_docs = _DocBinShardWriter(os.path.join(output_dir, TRAIN_DIR), shard_size)
+    dev_docs = _DocBinShardWriter(os.path.join(output_dir, DEV_DIR), shard_size)
+    labels = set()
+    stats = {"examples": 0, "skipped_examples": 0, "overlapping_entities": 0, "misaligned_entities": 0}
+
+    for text, annotations in iter_source_examples(source_path):
+        stats["examples"] += 1
+        example = trim_entity_spans([(text, annotations)])
+        [(text, cleaned)] = remove_overlapping_entities(example)
+        stats["overlapping_entities"] += len(example[0][1]["entities"]) - len(cleaned["entities"])
+
+        doc = make_doc(nlp, text, cleaned["entities"], stats)
+        if not doc.ents:
+            stats["skipped_examples"] += 1
+            continue
+        labels.update(ent.label_ for ent in doc.ents)
+        (dev_docs if is_dev_example(text, dev_fraction) else train_docs).add(doc)
+
+    train_docs.flush()
+    dev_docs.flush()
+    meta = {
+        "source_path": source_path,
+        "source_hash": current_hash,
+        "train_path": train_docs.split_dir,
+        "dev_path": dev_docs.split_dir,
+        "train": train_docs.count,
+        "dev": dev_docs.count,
+        "train_shards": train_docs.shards,
+        "dev_shards": dev_docs.shards,
+        "labels": sorted(labels),
+        **stats,
+    }
+    # Written last, so an interrupted compile is never mistaken for a valid cache
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    print(f"Compiled {meta['train']} train / {meta['dev']} dev docs into {output_dir} "
+          f"({stats['skipped_examples']} examples without entities skipped, "
+          f"{stats['overlapping_entities']} overlapping and {stats['misaligned_entities']} misaligned entities dropped)")
+    return meta
+
+
+def list_shards(path):
+    """Return the DocBin files of a compiled split directory (or the single file `path`)."""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.spacy")))
+    return [path]
+
+
+def _read_shard(shard_path):
+    # Reading and decompressing happen in the loader threads; zlib releases the GIL
+    with open(shard_path, 'rb') as f:
+        return DocBin().from_bytes(f.read())
+
+
+def iter_docs(path, nlp, workers=1, shuffle=False):
+    """
+    Lazily yield the gold Docs of a compiled split, read by `workers` loader threads.
+
+    Shards are loaded up to 2 * workers ahead of the consumer, so memory holds a few
+    shards rather than the whole split. With shuffle=True the shard order and the
+    Docs within each shard are shuffled.
+    """
+    shard_paths = list_shards(path)
+    if shuffle:
+        random.shuffle(shard_paths)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque()
+        shard_iter = iter(shard_paths)
+        for shard_path in shard_iter:
+            pending.append(pool.submit(_read_shard, shard_path))
+            if len(pending) >= 2 * max(1, workers):
+                break
+        while pending:
+            doc_bin = pending.popleft().result()
+            next_path = next(shard_iter, None)
+            if next_path is not None:
+                pending.append(pool.submit(_read_shard, next_path))
+            docs = list(doc_bin.get_docs(nlp.vocab))
+            if shuffle:
+                random.shuffle(docs)
+            yield from docs
+
+
+def load_docs(path, nlp, workers=1):
+    """Load the gold Docs of a compiled split (directory of shards or a single DocBin file)."""
+    return list(iter_docs(path, nlp, workers))
+
+
+def load_examples(path, nlp, workers=1):
+    """Load a compiled split as training Examples (built once, reused every epoch)."""
+    return [Example(nlp.make_doc(doc.text), doc) for doc in iter_docs(path, nlp, workers)]
+
+
+class ShardedCorpus:
+    """
+    Corpus reader for `spacy train` over a directory of DocBin shards.
+
+    Like spacy.Corpus.v1, but the shards are read by a pool of loader threads ahead
+    of the training loop, and are reshuffled on every pass.
+    """
+
+    def __init__(self, path, workers=4, shuffle=False):
+        self.path = path
+        self.workers = workers
+        self.shuffle = shuffle
+
+    def __call__(self, nlp):
+        for doc in iter_docs(self.path, nlp, self.workers, self.shuffle):
+            yield Example(nlp.make_doc(doc.text), doc)
+
+
+@spacy.registry.readers("resume_ner.ShardedCorpus.v1")
+def create_sharded_corpus(path, workers=4, shuffle=False):
+    return ShardedCorpus(path, workers, shuffle)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("source", nargs="?", default=SOURCE_PATH,
+                            help="Processed shard directory or Dataturks JSON export")
+    arg_parser.add_argument("--output", default=CORPUS_DIR, help="Directory for the compiled corpus")
+    arg_parser.add_argument("--dev-fraction", type=float, default=0.2, help="Share of examples held out for evaluation")
+    arg_parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="Docs per DocBin shard")
+    arg_parser.add_argument("--force", action="store_true", help="Recompile even if the cache is up to date")
+    args = arg_parser.parse_args()
+
+    compile_corpus(args.source, args.output, dev_fraction=args.dev_fraction, shard_size=args.shard_size,
+                   force=args.force)
+
+
+if __name__ == "__main__":
+    main()
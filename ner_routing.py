@@ -0,0 +1,13 @@
+"""
+Entity routing modes of ResumeParser.
+
+Kept apart from custom_resume_parser so modules that only need the setting (the
+parse cache, the app's config) do not import spaCy.
+"""
+
+# How entities are extracted:
+#   custom      - the custom NER model only
+#   hybrid      - the custom NER model, plus en_core_web_sm PERSON when it finds no name
+#   statistical - en_core_web_sm only (the previous behaviour)
+ROUTING_MODES = ("custom", "hybrid", "statistical")
+DEFAULT_ROUTING = "hybrid"
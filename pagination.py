@@ -0,0 +1,121 @@
+"""
+Keyset (cursor) pagination for the resume list, the job catalog and a job's matching resumes.
+
+A page is fetched with `WHERE sort key < last key seen ORDER BY sort key LIMIT n`,
+so every page costs the same index range scan however deep it is, unlike
+LIMIT/OFFSET which reads and discards every earlier row. The last key of a page
+is handed to the client as an opaque cursor string.
+"""
+import base64
+import binascii
+import json
+
+from resume_search import MAX_PER_PAGE
+
+DEFAULT_PER_PAGE = 20
+
+
+def clamp_per_page(per_page):
+    """Keep per_page within 1..MAX_PER_PAGE."""
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def encode_cursor(key):
+    """Turn a sort key (a list of JSON values) into a URL-safe cursor string."""
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, length):
+    """
+    Turn a cursor string back into its sort key.
+
+    Returns:
+        list: The key, or None for an empty cursor (the first page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (UnicodeEncodeError, binascii.Error, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(key, list) or len(key) != length:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+
+def _page(rows, per_page, key):
+    """Split the per_page + 1 fetched rows into a page and the cursor of the next one."""
+    results = [dict(row) for row in rows[:per_page]]
+    next_cursor = encode_cursor(key(results[-1])) if len(rows) > per_page else None
+    return results, next_cursor
+
+
+def list_resumes_page(conn, cursor=None, per_page=DEFAULT_PER_PAGE):
+    """
+    Return one page of resumes, newest upload first (ties broken by id).
+
+    Only the columns the list shows are read, from idx_resumes_uploaded_at.
+
+    Returns:
+        tuple: (list of resume dicts, cursor of the next page or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key = decode_cursor(cursor, 2)
+    per_page = clamp_per_page(per_page)
+    where = 'WHERE (uploaded_at, id) < (?, ?)' if key else ''
+    rows = conn.execute(f'''
+    SELECT id, name, email, uploaded_at FROM resumes
+    {where}
+    ORDER BY uploaded_at DESC, id DESC
+    LIMIT ?
+    ''', (*(key or ()), per_page + 1)).fetchall()
+    return _page(rows, per_page, lambda resume: [resume["uploaded_at"], resume["id"]])
+
+
+def job_matches_page(conn, job_id, cursor=None, per_page=DEFAULT_PER_PAGE):
+    """
+    Return one page of the resumes matching a job, best match first.
+
+    Ties on match_score are broken by the match row id, which idx_job_matches_job
+    already stores in that order, so no sort step is needed.
+
+    Returns:
+        tuple: (list of dicts with id, name, email and match_score, cursor of the next page or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key = decode_cursor(cursor, 2)
+    per_page = clamp_per_page(per_page)
+    where = 'AND jm.match_score <= ? AND (jm.match_score < ? OR jm.id > ?)' if key else ''
+    params = (key[0], key[0], key[1]) if key else ()
+    rows = conn.execute(f'''
+    SELECT r.id, r.name, r.email, jm.match_score, jm.id AS match_id
+    FROM job_matches jm
+    JOIN resumes r ON r.id = jm.resume_id
+    WHERE jm.job_id = ? {where}
+    ORDER BY jm.match_score DESC, jm.id
+    LIMIT ?
+    ''', (job_id, *params, per_page + 1)).fetchall()
+    return _page(rows, per_page, lambda match: [match["match_score"], match["match_id"]])
+
+
+def list_jobs_page(job_catalog, cursor=None, per_page=DEFAULT_PER_PAGE):
+    """
+    Return one page of job summaries (no descriptions) in catalog order.
+
+    Returns:
+        tuple: (list of job dicts, cursor of the next page or None)
+
+    Raises:
+        ValueError: If the cursor is malformed or names a job no longer in the catalog
+    """
+    key = decode_cursor(cursor, 1)
+    per_page = clamp_per_page(per_page)
+    jobs = job_catalog.page(key[0] if key else None, per_page + 1)
+    return _page(jobs, per_page, lambda job: [job["id"]])
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+import time
+
+from ner_routing import DEFAULT_ROUTING
+from skill_index import SKILLS_FILE_PATH, get_skill_index
+
+
+def model_version(model_path, statistical_model="en_core_web_sm"):
+    """
+    Fingerprint the models a parse depends on.
+
+    The fingerprints are computed once per model by the process-wide model registry.
+    """
+    # spaCy is only needed once a lookup happens, not to import this module (or db)
+    from model_registry import registry
+
+    fingerprint = [registry.fingerprint(model_path), registry.fingerprint(statistical_model)]
+    return hashlib.sha256(json.dumps(fingerprint).encode('utf-8')).hexdigest()[:16]
+
+
+def create_parse_cache_table(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS parse_cache (
+        cache_key TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        resume_id INTEGER NOT NULL,
+        parse_ms REAL,
+        created_at TIMESTAMP,
+        FOREIGN KEY (resume_id) REFERENCES resumes (id)
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_parse_cache_resume ON parse_cache (resume_id)')
+
+
+class ParseCache:
+    """
+    Content-addressed cache from uploaded file bytes to an already parsed resume.
+
+    Keys combine the file hash with the model and gazetteer versions, the parser's
+    routing mode, the PDF page/character budget text was extracted with and the text
+    weight job matches were scored with, so retraining the model, editing skills.csv
+    or changing any of these settings makes old entries miss without any cleanup.
+    """
+
+    def __init__(self, model_path, skills_file_path=SKILLS_FILE_PATH, routing=DEFAULT_ROUTING, text_weight=0,
+                 max_pages=None, max_chars=None):
+        self.model_path = model_path
+        self.skills_file_path = skills_file_path
+        self.routing = routing
+        self.text_weight = text_weight
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "time_saved_ms": 0.0}
+
+    def cache_key(self, file_hash):
+        gazetteer_version = get_skill_index(self.skills_file_path).version
+        return (f"{file_hash}:{model_version(self.model_path)}:{gazetteer_version[:16]}:{self.routing}:"
+                f"{float(self.text_weight)}:{self.max_pages or 0}p{self.max_chars or 0}c")
+
+    def lookup(self, conn, file_hash):
+        """
+        Return the id of the resume already parsed from these bytes, or None.
+
+        Entries whose resume row has since been deleted count as misses.
+        """
+        row = conn.execute('''
+        SELECT pc.resume_id, pc.parse_ms
+        FROM parse_cache pc
+        JOIN resumes r ON r.id = pc.resume_id
+        WHERE pc.cache_key = ?
+        ''', (self.cache_key(file_hash),)).fetchone()
+
+        with self._lock:
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            self._counters["time_saved_ms"] += row[1] or 0.0
+        return row[0]
+
+    def store(self, conn, file_hash, resume_id, parse_ms):
+        """Remember that these bytes were parsed into `resume_id` (caller commits)."""
+        conn.execute('''
+        INSERT OR REPLACE INTO parse_cache (cache_key, content_hash, resume_id, parse_ms, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (self.cache_key(file_hash), file_hash, resume_id, parse_ms, time.time()))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["time_saved_ms"] = round(stats["time_saved_ms"], 2)
+        return stats
@@ -0,0 +1,26 @@
+"""
+Code run by the PDF page pool of text_extraction.
+
+Spawned workers import only this module (and PyMuPDF) to run extract_page_range,
+so nothing else of the application is loaded into them.
+"""
+import fitz
+
+
+def normalize_text(text):
+    # Normalize whitespace to ensure only one newline between paragraphs
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def open_pdf(pdf_path=None, data=None):
+    # Extract text using PyMuPDF (fitz)
+    return fitz.open(stream=data, filetype='pdf') if data is not None else fitz.open(pdf_path)
+
+
+def extract_page_range(pdf_path, data, start, stop):
+    """Return the normalized text of pages start..stop-1 (runs in a worker process)."""
+    doc = open_pdf(pdf_path, data)
+    try:
+        return [normalize_text(doc[number].get_text()) for number in range(start, stop)]
+    finally:
+        doc.close()
@@ -1,113 +1,234 @@
-import os
-import json
+"""
+Normalize the annotated resume JSON files into compact JSONL shards for training.
+
+Files are normalized across a process pool ("SKILL: Engineering" labels become
+"SKILL") and streamed into shards of `shard_size` records, so memory stays flat
+however large the corpus is. A manifest in the output directory records the size,
+mtime and hash of every source file; files that have not changed since the last
+run are skipped. Trainers read the shards lazily with iter_training_examples().
+
+Usage:
+    python process_json_data.py data/json data/processed --workers 4
+"""
+import argparse
 import glob
-import shutil
-from pathlib import Path
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MANIFEST_FILE = "manifest.json"
+SHARD_PATTERN = "shard-{:05d}.jsonl"
+
+
+def normalize_annotations(annotations):
+    """Turn [start, end, "TYPE: value"] annotations into [start, end, "TYPE"]."""
+    standardized_annotations = []
+    for annotation in annotations:
+        if len(annotation) >= 3:
+            start, end, label = annotation[0], annotation[1], annotation[2]
+
+            # Extract entity type from label
+            if ":" in label:
+                entity_type = label.split(":")[0].strip()
+            else:
+                entity_type = label
+
+            standardized_annotations.append([start, end, entity_type])
+    return standardized_annotations
+
+
+def _normalize_file(task):
+    """Hash and normalize one JSON file (runs in a worker process)."""
+    file_path, previous_hash = task
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        file_hash = hashlib.sha256(raw).hexdigest()
+        if file_hash == previous_hash:
+            return {"path": file_path, "sha256": file_hash, "unchanged": True}
+
+        data = json.loads(raw)
+        record = {
+            "source": os.path.basename(file_path),
+            "text": data.get("text", ""),
+            "annotations": normalize_annotations(data.get("annotations", [])),
+        }
+        return {"path": file_path, "sha256": file_hash, "record": record}
+    except Exception as e:
+        return {"path": file_path, "error": f"{type(e).__name__}: {e}"}
+
+
+def load_manifest(output_dir):
+    """Return the manifest of a previous run: source name -> {size, mtime_ns, sha256, shard}."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(output_dir, manifest):
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+class _ShardWriter:
+    """Append records to numbered JSONL shards, starting a new one every `shard_size` records."""
+
+    def __init__(self, output_dir, shard_size):
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        existing = glob.glob(os.path.join(output_dir, "shard-*.jsonl"))
+        self.next_number = max((int(os.path.basename(path)[6:11]) for path in existing), default=-1) + 1
+        self.file = None
+        self.tmp_path = None
+        self.shard_name = None
+        self.count = 0
+        self.shards_written = []
+
+    def write(self, record):
+        """Write one record and return the name of the shard it went to."""
+        if self.file is None or self.count >= self.shard_size:
+            self._open_next()
+        self.file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.count += 1
+        return self.shard_name
+
+    def _open_next(self):
+        self.close()
+        self.shard_name = SHARD_PATTERN.format(self.next_number)
+        self.next_number += 1
+        self.tmp_path = os.path.join(self.output_dir, f"{self.shard_name}.tmp")
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        self.count = 0
 
-def process_json_files(input_dir, output_dir, batch_size=1000):
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            os.replace(self.tmp_path, os.path.join(self.output_dir, self.shard_name))
+            self.shards_written.append(self.shard_name)
+            self.file = None
+
+
+def process_json_files(input_dir, output_dir, shard_size=1000, workers=None):
     """
-    Process multiple JSON files and organize them into batches.
-    
+    Normalize new or changed JSON files into JSONL shards.
+
     Args:
         input_dir: Directory containing JSON files
-        output_dir: Directory to save processed files
-        batch_size: Number of files per batch
+        output_dir: Directory for the shards and their manifest
+        shard_size: Number of records per shard
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        dict: Counts of processed, unchanged, skipped, removed and failed files
     """
-    # Create output directory
     os.makedirs(output_dir, exist_ok=True)
-    
-    # Get all JSON files
-    json_files = glob.glob(os.path.join(input_dir, "*.json"))
+    json_files = sorted(glob.glob(os.path.join(input_dir, "*.json")))
     print(f"Found {len(json_files)} JSON files")
-    
-    if not json_files:
-        print(f"No JSON files found in {input_dir}")
-        return
-    
-    # Process files in batches
-    for i, file_path in enumerate(json_files):
-        # Determine batch directory
-        batch_num = i // batch_size
-        batch_dir = os.path.join(output_dir, f"batch_{batch_num}")
-        os.makedirs(batch_dir, exist_ok=True)
-        
-        # Process file
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Standardize annotations
-            if "annotations" in data:
-                standardized_annotations = []
-                for annotation in data["annotations"]:
-                    if len(annotation) >= 3:
-                        start, end, label = annotation[0], annotation[1], annotation[2]
-                        
-                        # Extract entity type from label
-                        if ":" in label:
-                            entity_type = label.split(":")[0].strip()
-                        else:
-                            entity_type = label
-                        
-                        standardized_annotations.append([start, end, entity_type])
-                
-                data["annotations"] = standardized_annotations
-            
-            # Save processed file
-            output_file = os.path.join(batch_dir, os.path.basename(file_path))
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
-            if (i + 1) % 100 == 0:
-                print(f"Processed {i + 1} files")
-        
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
-    
-    print(f"Processed {len(json_files)} files into {(len(json_files) // batch_size) + 1} batches")
-
-def merge_batches(batch_dir, output_file):
+
+    manifest = load_manifest(output_dir)
+    counts = {"processed": 0, "unchanged": 0, "skipped": 0, "removed": 0, "failed": 0}
+
+    # Sources that disappeared since the last run
+    current = {os.path.basename(path) for path in json_files}
+    for source in [source for source in manifest if source not in current]:
+        del manifest[source]
+        counts["removed"] += 1
+
+    # Files whose size and mtime match the manifest are not read at all
+    tasks = []
+    stats = {}
+    for file_path in json_files:
+        stat = os.stat(file_path)
+        stats[file_path] = (stat.st_size, stat.st_mtime_ns)
+        entry = manifest.get(os.path.basename(file_path))
+        if entry and (entry["size"], entry["mtime_ns"]) == stats[file_path]:
+            counts["skipped"] += 1
+        else:
+            tasks.append((file_path, entry["sha256"] if entry else None))
+    print(f"{len(tasks)} new or modified files to process ({counts['skipped']} unchanged since the last run)")
+
+    writer = _ShardWriter(output_dir, shard_size)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            for i, result in enumerate(pool.map(_normalize_file, tasks, chunksize=32)):
+                source = os.path.basename(result["path"])
+                if "error" in result:
+                    print(f"Error processing {result['path']}: {result['error']}")
+                    counts["failed"] += 1
+                    continue
+
+                size, mtime_ns = stats[result["path"]]
+                if result.get("unchanged"):
+                    # Touched but identical: only the mtime in the manifest changes
+                    manifest[source].update(size=size, mtime_ns=mtime_ns)
+                    counts["unchanged"] += 1
+                else:
+                    shard = writer.write(result["record"])
+                    manifest[source] = {"size": size, "mtime_ns": mtime_ns, "sha256": result["sha256"], "shard": shard}
+                    counts["processed"] += 1
+
+                if (i + 1) % 1000 == 0:
+                    print(f"Processed {i + 1} files")
+    finally:
+        writer.close()
+
+    _write_manifest(output_dir, manifest)
+
+    # Drop shards whose records have all been superseded
+    live_shards = {entry["shard"] for entry in manifest.values()}
+    for shard_path in glob.glob(os.path.join(output_dir, "shard-*.jsonl")):
+        if os.path.basename(shard_path) not in live_shards:
+            os.remove(shard_path)
+
+    print(f"Processed {counts['processed']} files into {len(writer.shards_written)} new shards "
+          f"({counts['unchanged']} unchanged, {counts['skipped']} skipped, "
+          f"{counts['removed']} removed, {counts['failed']} failed)")
+    return counts
+
+
+def iter_training_records(processed_dir):
     """
-    Merge processed batches into a single training file.
-    
-    Args:
-        batch_dir: Directory containing batch directories
-        output_file: Path to save the merged file
+    Lazily yield the current record of every source file from the shards.
+
+    A source reprocessed in a later run also has an outdated record in an older
+    shard; only the one in the shard the manifest points to is yielded.
+
+    Yields:
+        dict: {"source", "text", "annotations"} with normalized labels
     """
-    all_data = []
-    
-    # Get all batch directories
-    batch_dirs = [d for d in os.listdir(batch_dir) if os.path.isdir(os.path.join(batch_dir, d)) and d.startswith("batch_")]
-    
-    for batch in batch_dirs:
-        batch_path = os.path.join(batch_dir, batch)
-        json_files = glob.glob(os.path.join(batch_path, "*.json"))
-        
-        for file_path in json_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                all_data.append(data)
-            except Exception as e:
-                print(f"Error reading {file_path}: {str(e)}")
-    
-    # Save merged data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, indent=2)
-    
-    print(f"Merged {len(all_data)} examples into {output_file}")
+    manifest = load_manifest(processed_dir)
+    for shard in sorted({entry["shard"] for entry in manifest.values()}):
+        with open(os.path.join(processed_dir, shard), 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                entry = manifest.get(record["source"])
+                if entry and entry["shard"] == shard:
+                    yield record
+
+
+def iter_training_examples(processed_dir):
+    """Lazily yield (text, {"entities": [(start, end, label), ...]}) training examples."""
+    for record in iter_training_records(processed_dir):
+        if record["text"]:
+            yield record["text"], {"entities": [tuple(annotation) for annotation in record["annotations"]]}
+
 
 def main():
-    # Parameters
-    raw_data_dir = "data/raw"
-    processed_data_dir = "data/processed"
-    merged_file = "data/all_training_data.json"
-    
-    # Process JSON files
-    process_json_files(raw_data_dir, processed_data_dir)
-    
-    # Merge batches
-    merge_batches(processed_data_dir, merged_file)
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("input_dir", nargs="?", default="data/json", help="Directory of annotated JSON files")
+    arg_parser.add_argument("output_dir", nargs="?", default="data/processed", help="Directory for the JSONL shards")
+    arg_parser.add_argument("--shard-size", type=int, default=1000, help="Records per shard")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = arg_parser.parse_args()
+
+    process_json_files(args.input_dir, args.output_dir, shard_size=args.shard_size, workers=args.workers)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
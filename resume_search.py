@@ -0,0 +1,209 @@
+import re
+
+from markupsafe import Markup, escape
+
+# Highlight markers returned by snippet(); swapped for <mark> tags after HTML escaping
+_HIGHLIGHT_START = '\x02'
+_HIGHLIGHT_END = '\x03'
+
+# Relative bm25 weights of the indexed columns: name, email, skills, raw_text
+BM25_WEIGHTS = (10.0, 5.0, 5.0, 1.0)
+
+MAX_PER_PAGE = 100
+
+
+def create_fts_index(cursor):
+    """
+    Create the FTS5 index over resumes, the triggers keeping it in sync and backfill it.
+
+    The index is an external-content table, so resume text is not stored twice.
+    """
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+        name, email, skills, raw_text,
+        content='resumes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_insert AFTER INSERT ON resumes BEGIN
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        VALUES (new.id, new.name, new.email, new.skills, new.raw_text);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_delete AFTER DELETE ON resumes BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        VALUES ('delete', old.id, old.name, old.email, old.skills, old.raw_text);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_update AFTER UPDATE ON resumes BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        VALUES ('delete', old.id, old.name, old.email, old.skills, old.raw_text);
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        VALUES (new.id, new.name, new.email, new.skills, new.raw_text);
+    END
+    ''')
+
+    # Index the rows that existed before the table was created
+    cursor.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('rebuild')")
+
+
+def drop_fts_index(cursor):
+    """Drop resumes_fts and its triggers (before the tables they read change shape)."""
+    for trigger in ('resumes_fts_insert', 'resumes_fts_delete', 'resumes_fts_update',
+                    'resume_texts_fts_insert', 'resume_texts_fts_delete', 'resume_texts_fts_update'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute('DROP TABLE IF EXISTS resumes_fts')
+
+
+def create_document_fts_index(cursor):
+    """
+    Create the FTS5 index over the resume_documents view, with its triggers, and backfill it.
+
+    resume_documents joins resumes with their compressed text in resume_texts (see
+    text_store), so the triggers keep the index in step with both tables: a resume
+    is indexed without text when its row is inserted, and again with its text once
+    resume_texts gets the row.
+    """
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+        name, email, skills, raw_text,
+        content='resume_documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    ''')
+
+    text_of = '(SELECT decompress_text(codec, body) FROM resume_texts WHERE resume_id = {}.id)'
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_insert AFTER INSERT ON resumes BEGIN
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        VALUES (new.id, new.name, new.email, new.skills, NULL);
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_delete AFTER DELETE ON resumes BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        VALUES ('delete', old.id, old.name, old.email, old.skills, {text_of.format('old')});
+        DELETE FROM resume_texts WHERE resume_id = old.id;
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_update AFTER UPDATE ON resumes BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        VALUES ('delete', old.id, old.name, old.email, old.skills, {text_of.format('old')});
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        VALUES (new.id, new.name, new.email, new.skills, {text_of.format('new')});
+    END
+    ''')
+
+    # Text rows only change the raw_text column of an already indexed resume
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resume_texts_fts_insert AFTER INSERT ON resume_texts BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        SELECT 'delete', id, name, email, skills, NULL FROM resumes WHERE id = new.resume_id;
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        SELECT id, name, email, skills, decompress_text(new.codec, new.body) FROM resumes WHERE id = new.resume_id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resume_texts_fts_update AFTER UPDATE ON resume_texts BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        SELECT 'delete', id, name, email, skills, decompress_text(old.codec, old.body)
+        FROM resumes WHERE id = old.resume_id;
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        SELECT id, name, email, skills, decompress_text(new.codec, new.body) FROM resumes WHERE id = new.resume_id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS resume_texts_fts_delete AFTER DELETE ON resume_texts BEGIN
+        INSERT INTO resumes_fts (resumes_fts, rowid, name, email, skills, raw_text)
+        SELECT 'delete', id, name, email, skills, decompress_text(old.codec, old.body)
+        FROM resumes WHERE id = old.resume_id;
+        INSERT INTO resumes_fts (rowid, name, email, skills, raw_text)
+        SELECT id, name, email, skills, NULL FROM resumes WHERE id = old.resume_id;
+    END
+    ''')
+
+    # Index the rows that existed before the table was created
+    cursor.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('rebuild')")
+
+
+def build_fts_query(query):
+    """
+    Turn free text from the search box into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted term (so FTS5 operators and punctuation in the input
+    cannot cause syntax errors) and all terms must match. A trailing '*' on a word
+    makes it a prefix query, e.g. "pyth* flask".
+
+    Returns:
+        str: The MATCH expression, or an empty string if the query has no words
+    """
+    terms = []
+    for word, star in re.findall(r'(\w+)(\*?)', query):
+        terms.append(f'"{word}"' + ('*' if star else ''))
+    return ' '.join(terms)
+
+
+def highlight(snippet):
+    """Escape a snippet for HTML and turn the highlight markers into <mark> tags."""
+    if not snippet:
+        return Markup('')
+    escaped = str(escape(snippet))
+    return Markup(escaped.replace(_HIGHLIGHT_START, '<mark>').replace(_HIGHLIGHT_END, '</mark>'))
+
+
+def clamp_page(page, per_page):
+    """Keep page >= 1 and per_page within 1..MAX_PER_PAGE."""
+    return max(page, 1), max(1, min(per_page, MAX_PER_PAGE))
+
+
+def search_fts(conn, query, page=1, per_page=20):
+    """
+    Run a ranked full-text search over resumes.
+
+    Args:
+        conn: sqlite3 connection to the resumes database
+        query: Free text search query
+        page: 1-based page number
+        per_page: Results per page (capped at MAX_PER_PAGE)
+
+    Returns:
+        tuple: (list of result dicts best match first, whether a next page exists)
+    """
+    match_expression = build_fts_query(query)
+    if not match_expression:
+        return [], False
+
+    page, per_page = clamp_page(page, per_page)
+    offset = (page - 1) * per_page
+
+    cursor = conn.cursor()
+    cursor.execute(f'''
+    SELECT r.id, r.name, r.email, r.uploaded_at,
+           bm25(resumes_fts, {', '.join(str(weight) for weight in BM25_WEIGHTS)}) AS score,
+           snippet(resumes_fts, 3, ?, ?, '...', 16) AS snippet
+    FROM resumes_fts
+    JOIN resumes r ON r.id = resumes_fts.rowid
+    WHERE resumes_fts MATCH ?
+    ORDER BY score
+    LIMIT ? OFFSET ?
+    ''', (_HIGHLIGHT_START, _HIGHLIGHT_END, match_expression, per_page + 1, offset))
+
+    rows = cursor.fetchall()
+    results = []
+    for row in rows[:per_page]:
+        results.append({
+            "id": row[0],
+            "name": row[1],
+            "email": row[2],
+            "uploaded_at": row[3],
+            "score": row[4],
+            "snippet": row[5],
+        })
+    return results, len(rows) > per_page
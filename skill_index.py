@@ -0,0 +1,193 @@
+import hashlib
+import os
+import pickle
+import threading
+
+SKILLS_FILE_PATH = "data/skills/skills.csv"
+
+# Bump when the pickled layout of SkillIndex changes
+INDEX_FORMAT_VERSION = 1
+
+
+def _is_word_char(char):
+    # Same definition of a word character as the \w class of the re module
+    return char.isalnum() or char == '_'
+
+
+def _is_boundary(text, position):
+    """Return True if a regex \\b would match at `position` in `text`."""
+    before = position > 0 and _is_word_char(text[position - 1])
+    after = position < len(text) and _is_word_char(text[position])
+    return before != after
+
+
+def load_gazetteer(skills_file_path=SKILLS_FILE_PATH):
+    """Read the comma separated skills file and return the normalized skill names."""
+    if not os.path.exists(skills_file_path):
+        raise FileNotFoundError(f"Skills file not found at {skills_file_path}. Please check the path.")
+
+    try:
+        with open(skills_file_path, 'r') as file:
+            skills_line = file.readline().strip()
+    except Exception as e:
+        raise ValueError(f"Error reading skills file: {e}")
+
+    # dict.fromkeys de-duplicates while keeping the file order
+    return list(dict.fromkeys(skill.strip().lower() for skill in skills_line.split(',') if skill.strip()))
+
+
+def file_hash(file_path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SkillIndex:
+    """
+    Aho-Corasick automaton over the skills gazetteer.
+
+    find_all() reports every gazetteer skill occurring in a text in a single pass
+    over its characters, with the same word-boundary semantics as
+    re.search(r'\\b' + re.escape(skill) + r'\\b', text).
+    """
+
+    def __init__(self, skills, version=None):
+        self.skills = list(dict.fromkeys(skills))
+        self.skill_set = frozenset(self.skills)
+        self.version = version
+
+        # State 0 is the root; goto[state] maps a character to the next state
+        self._goto = [{}]
+        self._fail = [0]
+        # Skill ids that end in each state (including those reached through fail links)
+        self._output = [()]
+
+        for skill_id, skill in enumerate(self.skills):
+            state = 0
+            for char in skill:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state] += (skill_id,)
+
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        # Breadth-first, so the fail target of every state is finished before its children
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def find_all(self, text):
+        """
+        Find the gazetteer skills present in `text`.
+
+        Args:
+            text: Lowercased text to search
+
+        Returns:
+            list: Matched skills in order of first occurrence
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        skills = self.skills
+
+        found = {}
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for skill_id in output[state]:
+                skill = skills[skill_id]
+                if skill in found:
+                    continue
+                end = position + 1
+                if _is_boundary(text, end - len(skill)) and _is_boundary(text, end):
+                    found[skill] = None
+
+        return list(found)
+
+    def __contains__(self, skill):
+        return skill in self.skill_set
+
+    def __len__(self):
+        return len(self.skills)
+
+
+def build_skill_index(skills_file_path=SKILLS_FILE_PATH, index_file_path=None):
+    """
+    Return the skill index for a gazetteer, loading it from disk when up to date.
+
+    The index is pickled next to the skills file (skills.csv -> skills_index.pkl)
+    unless `index_file_path` says otherwise. It is keyed by the hash of the skills
+    file, so editing the file rebuilds it on the next call.
+    """
+    version = file_hash(skills_file_path)
+    if index_file_path is None:
+        index_file_path = os.path.splitext(skills_file_path)[0] + "_index.pkl"
+
+    if os.path.exists(index_file_path):
+        try:
+            with open(index_file_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get("format") == INDEX_FORMAT_VERSION and cached.get("version") == version:
+                return cached["index"]
+        except Exception as e:
+            print(f"Ignoring unreadable skill index {index_file_path}: {e}")
+
+    index = SkillIndex(load_gazetteer(skills_file_path), version=version)
+
+    try:
+        tmp_path = f"{index_file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"format": INDEX_FORMAT_VERSION, "version": version, "index": index}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_file_path)
+    except OSError as e:
+        print(f"Could not persist skill index to {index_file_path}: {e}")
+
+    return index
+
+
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def get_skill_index(skills_file_path=SKILLS_FILE_PATH):
+    """Return the process-wide skill index, rebuilding it only if the skills file changed."""
+    if not os.path.exists(skills_file_path):
+        raise FileNotFoundError(f"Skills file not found at {skills_file_path}. Please check the path.")
+    stat = os.stat(skills_file_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _index_cache.get(skills_file_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with _index_lock:
+        cached = _index_cache.get(skills_file_path)
+        if cached is None or cached[0] != key:
+            cached = (key, build_skill_index(skills_file_path))
+            _index_cache[skills_file_path] = cached
+    return cached[1]
@@ -0,0 +1,246 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import docx2txt
+
+from pdf_page_worker import extract_page_range, normalize_text, open_pdf
+
+# Uploads larger than this are spilled to a temporary file instead of kept in memory
+DEFAULT_SPILL_THRESHOLD = 10 * 1024 * 1024
+
+# Page and character budget for PDFs; extraction stops once either is reached
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 200000
+
+# PDFs with at least this many pages are extracted across a process pool
+PARALLEL_PAGE_THRESHOLD = 32
+PDF_PAGE_WORKERS = min(4, os.cpu_count() or 1)
+
+_CHUNK_SIZE = 1 << 16
+
+
+def file_extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            # spawn, not fork: the Flask app and ingest workers are multi-threaded.
+            # Workers are sent pdf_page_worker.extract_page_range, so that module is all
+            # they import besides the main script (app.py only initializes in create_app())
+            _page_pool = ProcessPoolExecutor(
+                max_workers=PDF_PAGE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _page_pool
+
+
+def _assemble_pages(page_texts, max_chars):
+    """Join normalized page texts, cut to the character budget."""
+    text = '\n'.join(page_text for page_text in page_texts if page_text)
+    truncated = bool(max_chars) and len(text) > max_chars
+    if truncated:
+        text = text[:max_chars]
+    return text, truncated
+
+
+def extract_pdf(pdf_path=None, data=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                parallel_threshold=PARALLEL_PAGE_THRESHOLD):
+    """
+    Extract text page by page from a PDF given either its path or its bytes.
+
+    Extraction stops early once `max_pages` pages or `max_chars` characters have been
+    read (None or 0 disables a limit). Documents with at least `parallel_threshold` pages
+    to read are split into page ranges extracted in a process pool.
+
+    Returns:
+        dict: "text" (normalized text), "page_count", "pages_extracted" and "truncated"
+    """
+    doc = open_pdf(pdf_path, data)
+    try:
+        page_count = doc.page_count
+        pages_to_read = min(page_count, max_pages) if max_pages else page_count
+
+        if parallel_threshold and pages_to_read >= parallel_threshold:
+            doc.close()
+            page_texts = _extract_pages_parallel(pdf_path, data, pages_to_read, max_chars)
+        else:
+            page_texts = []
+            chars = 0
+            for number in range(pages_to_read):
+                page_text = normalize_text(doc[number].get_text())
+                page_texts.append(page_text)
+                chars += len(page_text) + 1
+                if max_chars and chars > max_chars:
+                    break
+    finally:
+        if not doc.is_closed:
+            doc.close()
+
+    text, truncated = _assemble_pages(page_texts, max_chars)
+    return {
+        "text": text,
+        "page_count": page_count,
+        "pages_extracted": len(page_texts),
+        "truncated": truncated or len(page_texts) < page_count,
+    }
+
+
+def _extract_pages_parallel(pdf_path, data, pages_to_read, max_chars):
+    pool = _get_page_pool()
+    chunk_size = max(1, -(-pages_to_read // (PDF_PAGE_WORKERS * 2)))
+    futures = [
+        pool.submit(extract_page_range, pdf_path, data, start, min(start + chunk_size, pages_to_read))
+        for start in range(0, pages_to_read, chunk_size)
+    ]
+
+    # Collect in page order and drop the remaining ranges once the budget is spent
+    page_texts = []
+    chars = 0
+    for i, future in enumerate(futures):
+        chunk = future.result()
+        page_texts.extend(chunk)
+        chars += sum(len(page_text) + 1 for page_text in chunk)
+        if max_chars and chars > max_chars:
+            for pending in futures[i + 1:]:
+                pending.cancel()
+            break
+    return page_texts
+
+
+def extract_text_from_pdf(pdf_path=None, data=None, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                          parallel_threshold=PARALLEL_PAGE_THRESHOLD):
+    """Extract text from a PDF given either its path or its bytes."""
+    try:
+        return extract_pdf(pdf_path, data, max_pages=max_pages, max_chars=max_chars,
+                           parallel_threshold=parallel_threshold)["text"]
+    except Exception as e:
+        print(f"PyMuPDF extraction failed: {e}")
+        return ""
+
+
+def extract_text_from_docx(docx_path=None, data=None):
+    """Extract text from a DOCX given either its path or its bytes."""
+    # A DOCX is a zip archive, which docx2txt can read from any file-like object
+    text = docx2txt.process(io.BytesIO(data) if data is not None else docx_path)
+    # Clean up and normalize whitespace
+    return normalize_text(text)
+
+
+def extract_text(file_path, **pdf_limits):
+    extension = file_extension(file_path)
+    if extension == 'pdf':
+        return extract_text_from_pdf(file_path, **pdf_limits)
+    elif extension in ('docx', 'doc'):
+        return extract_text_from_docx(file_path)
+    return ""
+
+
+def extract_text_from_bytes(data, extension, **pdf_limits):
+    """Extract text from an in-memory PDF or DOCX."""
+    if extension == 'pdf':
+        return extract_text_from_pdf(data=data, **pdf_limits)
+    elif extension in ('docx', 'doc'):
+        return extract_text_from_docx(data=data)
+    return ""
+
+
+def hash_file(file_path):
+    """Return the SHA-256 of a file, read in chunks; the same digest UploadedResume.content_hash gives."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadedResume:
+    """
+    An uploaded resume read once from its stream and hashed on the way in.
+
+    Files up to `spill_threshold` bytes stay in memory and are extracted without
+    touching disk; larger ones are spilled to a temporary file. Call close() when
+    done to remove the temporary file.
+    """
+
+    def __init__(self, stream, filename, spill_threshold=DEFAULT_SPILL_THRESHOLD):
+        self.filename = filename
+        self.extension = file_extension(filename)
+        self.data = None
+        self.path = None
+        self.size = 0
+
+        digest = hashlib.sha256()
+        buffer = io.BytesIO()
+        spill_file = None
+        try:
+            for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                self.size += len(chunk)
+                if spill_file is None and self.size > spill_threshold:
+                    spill_file = tempfile.NamedTemporaryFile(suffix=f'.{self.extension}', delete=False)
+                    spill_file.write(buffer.getvalue())
+                    buffer = None
+                (spill_file or buffer).write(chunk)
+        finally:
+            if spill_file is not None:
+                spill_file.close()
+                self.path = spill_file.name
+
+        if spill_file is None:
+            self.data = buffer.getvalue()
+        self.content_hash = digest.hexdigest()
+
+    @classmethod
+    def from_path(cls, file_path, spill_threshold=DEFAULT_SPILL_THRESHOLD):
+        """Read a resume that is already on disk."""
+        with open(file_path, 'rb') as f:
+            return cls(f, os.path.basename(file_path), spill_threshold)
+
+    def extract_text(self, **pdf_limits):
+        """Extract the text; max_pages/max_chars/parallel_threshold are passed on for PDFs."""
+        if self.data is not None:
+            return extract_text_from_bytes(self.data, self.extension, **pdf_limits)
+        return extract_text(self.path, **pdf_limits)
+
+    def archive(self, archive_dir):
+        """
+        Keep a copy of the original file, named by its content hash.
+
+        Identical uploads share one file and different uploads can never overwrite
+        each other, whatever their names.
+
+        Returns:
+            str: Path of the archived file
+        """
+        os.makedirs(archive_dir, exist_ok=True)
+        archive_path = os.path.join(archive_dir, f"{self.content_hash}.{self.extension}")
+        if not os.path.exists(archive_path):
+            tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+            if self.data is not None:
+                with open(tmp_path, 'wb') as f:
+                    f.write(self.data)
+            else:
+                shutil.copyfile(self.path, tmp_path)
+            os.replace(tmp_path, archive_path)
+        return archive_path
+
+    def close(self):
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
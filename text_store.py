@@ -0,0 +1,118 @@
+"""
+Compressed cold storage for extracted resume text.
+
+raw_text is the largest value of a resume but only full-text indexing, batch
+re-ranking and reprocessing read it, so it lives in resume_texts, compressed with
+zstd when the zstandard package is installed and zlib otherwise. The codec is
+stored per row, so a database can mix both.
+
+Every connection from db.connect registers decompress_text(codec, body) as a SQL
+function; the resume_documents view uses it to present resumes with their text
+again, which is what the full-text index reads.
+"""
+import zlib
+
+from resume_search import create_document_fts_index, drop_fts_index
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'zlib'
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def compress_text(text, codec=DEFAULT_CODEC):
+    """Compress `text` with `codec` ('zstd' or 'zlib') and return the bytes."""
+    data = text.encode('utf-8')
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("The zstd codec needs the zstandard package")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == 'zlib':
+        return zlib.compress(data, ZLIB_LEVEL)
+    raise ValueError(f"Unknown text codec: {codec}")
+
+
+def decompress_text(codec, body):
+    """Inverse of compress_text; NULL bodies stay None."""
+    if body is None:
+        return None
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("The zstd codec needs the zstandard package")
+        data = zstandard.ZstdDecompressor().decompress(body)
+    elif codec == 'zlib':
+        data = zlib.decompress(body)
+    else:
+        raise ValueError(f"Unknown text codec: {codec}")
+    return data.decode('utf-8')
+
+
+def register_functions(conn):
+    """Make decompress_text(codec, body) available to SQL on `conn`."""
+    conn.create_function('decompress_text', 2, decompress_text, deterministic=True)
+
+
+def create_text_store(cursor):
+    """
+    Create resume_texts and the resume_documents view over resumes and their text.
+
+    The view is the external content table of resumes_fts, so it must keep exposing
+    id, name, email, skills and raw_text.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS resume_texts (
+        resume_id INTEGER PRIMARY KEY,
+        codec TEXT NOT NULL,
+        body BLOB NOT NULL,
+        FOREIGN KEY (resume_id) REFERENCES resumes (id)
+    )
+    ''')
+    cursor.execute('''
+    CREATE VIEW IF NOT EXISTS resume_documents AS
+    SELECT r.id, r.name, r.email, r.skills, decompress_text(t.codec, t.body) AS raw_text
+    FROM resumes r
+    LEFT JOIN resume_texts t ON t.resume_id = r.id
+    ''')
+
+
+def store_text(cursor, resume_id, text, codec=DEFAULT_CODEC):
+    """Store (or replace) the text of one resume (the caller owns the transaction)."""
+    cursor.execute('''
+    INSERT INTO resume_texts (resume_id, codec, body) VALUES (?, ?, ?)
+    ON CONFLICT (resume_id) DO UPDATE SET codec = excluded.codec, body = excluded.body
+    ''', (resume_id, codec, compress_text(text or '', codec)))
+
+
+def load_text(conn, resume_id):
+    """Return the extracted text of a resume, or None if it has none."""
+    row = conn.execute('SELECT codec, body FROM resume_texts WHERE resume_id = ?', (resume_id,)).fetchone()
+    return decompress_text(row[0], row[1]) if row else None
+
+
+def move_raw_text(cursor):
+    """
+    Migrate resumes.raw_text into resume_texts and point the full-text index at it.
+
+    The old FTS triggers read resumes.raw_text, so the index is dropped first and
+    rebuilt over resume_documents afterwards. The raw_text column is cleared.
+    """
+    drop_fts_index(cursor)
+    create_text_store(cursor)
+
+    rows = cursor.execute('SELECT id, raw_text FROM resumes WHERE raw_text IS NOT NULL').fetchall()
+    cursor.executemany('INSERT OR REPLACE INTO resume_texts (resume_id, codec, body) VALUES (?, ?, ?)',
+                       [(resume_id, DEFAULT_CODEC, compress_text(text)) for resume_id, text in rows])
+    cursor.execute('UPDATE resumes SET raw_text = NULL')
+
+    create_document_fts_index(cursor)
+
+    raw_bytes = sum(len(text.encode('utf-8')) for _, text in rows)
+    stored_bytes = cursor.execute('SELECT COALESCE(SUM(LENGTH(body)), 0) FROM resume_texts').fetchone()[0]
+    if rows:
+        print(f"Moved the text of {len(rows)} resumes to resume_texts ({DEFAULT_CODEC}): "
+              f"{raw_bytes / 1024:.0f} KB -> {stored_bytes / 1024:.0f} KB")
@@ -1,228 +1,336 @@
-import spacy
-from spacy.util import minibatch, compounding
-import random
-import json
+"""
+Train the custom resume NER model from the compiled DocBin corpus.
+
+Training examples are built once from data/corpus (see ner_corpus.py) and fed to
+nlp.update in shuffled minibatches whose size compounds from --batch-start to
+--batch-stop. Every epoch logs the loss, epoch time, words/sec and dev scores; the
+best model by dev F1 is kept, and training stops early after --patience epochs
+without improvement.
+
+Two more modes use several cores:
+    --mode spacy   writes a `spacy train` config derived from the model's config.cfg,
+                   reading the corpus shards with --workers loader threads, and runs it
+    --mode sweep   trains the --sweep hyperparameter variants concurrently in
+                   --workers processes and keeps the model with the best dev F1
+
+Usage:
+    python train_ner_model.py --n-iter 30 --patience 5
+    python train_ner_model.py --mode spacy --workers 4
+    python train_ner_model.py --mode sweep --workers 8 --sweep dropout=0.1,0.2,0.3 batch_stop=16,32
+"""
+import argparse
+import itertools
 import os
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from spacy.training import offsets_to_biluo_tags
-def validate_entities(nlp, text, entities):
-    """Validate entity alignment with the text."""
-    doc = nlp.make_doc(text)
-    valid = True
-    non_overlapping_entities = []
-    try:
-        biluo_tags = offsets_to_biluo_tags(doc, entities)
-    except ValueError as e:
-        print(f"Entities: {entities}")
-        print(f"Error: {e}")
-        valid = False
-
-    # Check if entity offsets are within bounds
-    for start, end, label in entities:
-        if start < 0 or end > len(text):
-            print(f"Entity out of bounds: {start}-{end}, {label}, in text: {text}")
-            valid = False
-
-    # Filter out overlapping entities
-    for new_start, new_end, label in entities:
-        if new_start >= 0 and new_end <= len(text) and all(new_start >= end or new_end <= start for start, end, _ in non_overlapping_entities):
-            non_overlapping_entities.append((new_start, new_end, label))
-        else:
-            print(f"Skipping invalid entity: {new_start}-{new_end}, {label}, in text: {text[new_start:new_end]}")
-
-    return valid and len(non_overlapping_entities) > 0
-def prepare_training_data(json_data):
-    """Convert JSON data to spaCy training format."""
-    text = json_data.get("content", "").strip()
-    if not text:
-        print("Skipping example with empty text.")
-        return None
-
-    annotations = {"entities": []}
-    annotation_list = json_data.get("annotation", [])
-    if not isinstance(annotation_list, list):
-        print(f"Invalid or missing 'annotation' key in JSON data: {json_data}")
-        return None
-
-    for annotation in annotation_list:
-        for point in annotation.get("points", []):
-            start = point["start"]
-            end = point["end"]
-            label = annotation.get("label", [])
-            if not label or not isinstance(label, list):
-                print(f"Skipping invalid label in annotation: {annotation}")
-                continue
-            label = label[0]  # Assuming a single label per annotation
-            if start < 0 or end > len(text):
-                print(f"Skipping invalid entity: {start}-{end}, {label}, in text: {text[start:end]}")
-                continue
-            annotations["entities"].append((start, end, label))
-
-    if not annotations["entities"]:
-        print(f"No valid entities found in text: {text}")
-        return None
-
-    return (text, annotations)
-def load_json_file(file_path):
-    """Load a JSON file or line-delimited JSON."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            first_char = f.read(1)
-            f.seek(0)  # Reset file pointer
-            if first_char == '[':  # Standard JSON array
-                return json.load(f)
-            else:  # Line-delimited JSON
-                return [json.loads(line) for line in f]
-    except FileNotFoundError:
-        print(f"File not found: {file_path}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return None
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return None
-
-
-def train_ner_model(training_data, output_dir, n_iter=30):
-    """Train a custom NER model."""
-    # Create output directory
-    output_dir = Path(output_dir)
-    if not output_dir.exists():
-        output_dir.mkdir(parents=True)
-    
-    # Load model or create blank
-    try:
-        nlp = spacy.load("en_core_web_sm")
-        print("Loaded model 'en_core_web_sm'")
-    except OSError:
+
+import spacy
+from spacy.util import compounding, minibatch
+
+from ner_corpus import CORPUS_DIR, SOURCE_PATH, compile_corpus, load_examples
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+MODEL_DIR = "models/resume_ner_model"
+BASE_CONFIG = os.path.join(MODEL_DIR, "config.cfg")
+
+# train_ner_model() arguments a sweep can vary
+SWEEP_PARAMETERS = ("dropout", "batch_start", "batch_stop", "batch_compound")
+
+# Thread pool sizes read by BLAS/OpenMP libraries that load after they are set
+THREAD_LIMIT_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "BLIS_NUM_THREADS",
+                          "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+def create_pipeline(labels, base_model=None):
+    """Load `base_model` (or a blank English pipeline) and add an NER component with `labels`."""
+    if base_model:
+        nlp = spacy.load(base_model)
+        print(f"Loaded model '{base_model}'")
+    else:
         nlp = spacy.blank("en")
         print("Created blank 'en' model")
-    
-    # Create or get NER component
-    if "ner" not in nlp.pipe_names:
-        ner = nlp.create_pipe("ner")
-        nlp.add_pipe("ner", last=True)
-    else:
-        ner = nlp.get_pipe("ner")
-    
-    # Add entity labels
-    entity_types = set()
-    for _, annotations in training_data:
-        for _, _, label in annotations.get("entities", []):
-            entity_types.add(label)
-    
-    for entity_type in entity_types:
-        ner.add_label(entity_type)
-    
-    print(f"Training with {len(training_data)} examples and {len(entity_types)} entity types")
-    print(f"Entity types: {', '.join(entity_types)}")
-    
-    # Get names of other pipes to disable during training
-    pipe_exceptions = ["ner", "trf_wordpiecer", "trf_tok2vec"]
-    other_pipes = [pipe for pipe in nlp.pipe_names if pipe not in pipe_exceptions]
-    
-    # Only train NER
-    with nlp.disable_pipes(*other_pipes), nlp.select_pipes(enable=["ner"]):
-        # Reset and initialize weights
-        if "ner" in nlp.pipe_names:
-            nlp.begin_training()
-        
-        # Training loop
-        for itn in range(n_iter):
-            random.shuffle(training_data)
-            losses = {}
-            
-            for text, annotations in training_data:
-                doc = nlp.make_doc(text)
-                try:
-                    biluo_tags = offsets_to_biluo_tags(doc, annotations["entities"])
-                    # Validate entity offsets before generating BILUO tags
-                    if all(0 <= start < end <= len(text) for start, end, _ in annotations["entities"]):
-                        biluo_tags = offsets_to_biluo_tags(doc, annotations["entities"])
-                    else:
-                        print(f"Skipping invalid entity offsets in text: {text}")
-                        continue
-                except ValueError as e:
-                    print(f"Error generating BILUO tags for text: {text}. Error: {e}")
-                    continue
-
-            # Batch up the examples
-            batches = minibatch(training_data, size=compounding(4.0, 32.0, 1.001))
-            for batch in batches:
-                examples = []
-                for text, annotations in batch:
-                    doc = nlp.make_doc(text)
-                    examples.append(Example.from_dict(doc, annotations))
-
-                # Update model
-                nlp.update(
-                    examples,  # Pass a batch of Example objects
-                    drop=0.5,  # Dropout to prevent overfitting
-                    losses=losses
-                )
-            
-            if itn % 5 == 0:
-                print(f"Iteration {itn}, Losses: {losses}")
-    
-    # Save model
-    nlp.to_disk(output_dir)
-    print(f"Model saved to {output_dir}")
-    
+
+    ner = nlp.get_pipe("ner") if "ner" in nlp.pipe_names else nlp.add_pipe("ner", last=True)
+    for label in labels:
+        ner.add_label(label)
     return nlp
 
 
+def evaluate(nlp, examples):
+    """Return entity precision, recall and F1 of `nlp` on gold examples."""
+    if not examples:
+        return {"ents_p": 0.0, "ents_r": 0.0, "ents_f": 0.0}
+    scores = nlp.evaluate(examples)
+    return {key: scores.get(key) or 0.0 for key in ("ents_p", "ents_r", "ents_f")}
+
+
+def train_ner_model(nlp, train_examples, dev_examples, output_dir=MODEL_DIR, n_iter=30, dropout=0.2,
+                    batch_start=4.0, batch_stop=32.0, batch_compound=1.001, patience=0, seed=0):
+    """
+    Train the NER component of `nlp` and save the best model by dev F1.
+
+    Args:
+        nlp: Pipeline with an NER component whose labels are already added
+        train_examples: Training Examples, built once and reused every epoch
+        dev_examples: Held-out Examples scored after every epoch
+        output_dir: Where the best model is saved
+        n_iter: Maximum number of epochs
+        dropout: Dropout rate for nlp.update
+        batch_start, batch_stop, batch_compound: Compounding minibatch size schedule
+        patience: Stop after this many epochs without a better dev F1 (0 disables early stopping)
+        seed: Seed for shuffling and weight initialization
+
+    Returns:
+        list: One dict per epoch with "epoch", "loss", "seconds", "words_per_sec" and dev scores
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    random.seed(seed)
+    spacy.util.fix_random_seed(seed)
+
+    print(f"Training with {len(train_examples)} examples ({len(dev_examples)} dev), "
+          f"labels: {', '.join(nlp.get_pipe('ner').labels)}")
+
+    log = []
+    best_f = -1.0
+    epochs_without_improvement = 0
+    # Only train NER; other components of a base model are left untouched
+    with nlp.select_pipes(enable=["ner"]):
+        optimizer = nlp.initialize(lambda: train_examples)
+        # The schedule is shared across epochs, so batches keep growing until batch_stop
+        batch_sizes = compounding(batch_start, batch_stop, batch_compound)
+
+        for epoch in range(1, n_iter + 1):
+            random.shuffle(train_examples)
+            losses = {}
+            words = 0
+            start = time.perf_counter()
+            for batch in minibatch(train_examples, size=batch_sizes):
+                nlp.update(batch, drop=dropout, sgd=optimizer, losses=losses)
+                words += sum(len(example.predicted) for example in batch)
+            seconds = time.perf_counter() - start
+
+            scores = evaluate(nlp, dev_examples)
+            entry = {
+                "epoch": epoch,
+                "loss": losses.get("ner", 0.0),
+                "seconds": seconds,
+                "words_per_sec": words / seconds if seconds else 0.0,
+                **scores,
+            }
+            log.append(entry)
+            print(f"Epoch {epoch:3d}  loss {entry['loss']:10.2f}  {seconds:7.1f}s  "
+                  f"{entry['words_per_sec']:8.0f} words/sec  dev P {scores['ents_p']:.3f} "
+                  f"R {scores['ents_r']:.3f} F {scores['ents_f']:.3f}")
+
+            if scores["ents_f"] > best_f:
+                best_f = scores["ents_f"]
+                epochs_without_improvement = 0
+                nlp.to_disk(output_dir)
+            else:
+                epochs_without_improvement += 1
+                if patience and epochs_without_improvement >= patience:
+                    print(f"No dev F1 improvement for {patience} epochs, stopping")
+                    break
+
+    print(f"Best dev F1 {best_f:.3f}, model saved to {output_dir}")
+    return log
+
+
+def write_spacy_config(corpus, config_path, base_config=BASE_CONFIG, workers=4, n_iter=30, dropout=0.2, seed=0):
+    """
+    Write a `spacy train` config for the compiled corpus, based on the model's config.cfg.
+
+    The corpora use the resume_ner.ShardedCorpus.v1 reader, so the train and dev shards
+    are loaded by `workers` threads while the previous batches train.
+
+    Returns:
+        str: Path of the written config
+    """
+    if not os.path.exists(base_config):
+        raise FileNotFoundError(f"Base config not found at {base_config}. Please check the path.")
+    config = spacy.util.load_config(base_config)
+    config["paths"]["train"] = corpus["train_path"]
+    config["paths"]["dev"] = corpus["dev_path"]
+    for split in ("train", "dev"):
+        config["corpora"][split] = {
+            "@readers": "resume_ner.ShardedCorpus.v1",
+            "path": f"${{paths.{split}}}",
+            "workers": workers,
+            "shuffle": split == "train",
+        }
+    config["system"]["seed"] = seed
+    config["training"]["max_epochs"] = n_iter
+    config["training"]["max_steps"] = 0
+    config["training"]["dropout"] = dropout
+
+    os.makedirs(os.path.dirname(config_path) or ".", exist_ok=True)
+    config.to_disk(config_path)
+    return config_path
+
+
+def train_with_spacy(corpus, output_dir=MODEL_DIR, workers=4, n_iter=30, dropout=0.2, seed=0):
+    """
+    Train with `spacy train` and copy its best model to `output_dir`.
+
+    Returns:
+        float: Wall-clock seconds spent in `spacy train`
+    """
+    from spacy.cli.train import train as spacy_train
+
+    config_path = write_spacy_config(corpus, os.path.join(os.path.dirname(corpus["train_path"]), "config.cfg"),
+                                     workers=workers, n_iter=n_iter, dropout=dropout, seed=seed)
+    train_dir = f"{output_dir.rstrip('/')}_spacy_train"
+    print(f"Equivalent command: python -m spacy train {config_path} --output {train_dir} --code ner_corpus.py")
+
+    start = time.perf_counter()
+    spacy_train(config_path, train_dir, use_gpu=-1)
+    seconds = time.perf_counter() - start
+
+    shutil.copytree(os.path.join(train_dir, "model-best"), output_dir, dirs_exist_ok=True)
+    print(f"spacy train finished in {seconds:.1f}s, best model copied to {output_dir}")
+    return seconds
+
+
+def parse_sweep(specs):
+    """
+    Expand "name=v1,v2" specs into the list of every combination of values.
+
+    Example: ["dropout=0.1,0.2", "batch_stop=16,32"] gives 4 variants.
+    """
+    grid = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in SWEEP_PARAMETERS or not values:
+            raise ValueError(f"Invalid sweep parameter '{spec}', expected one of {', '.join(SWEEP_PARAMETERS)}=v1,v2,...")
+        grid.append([(name, float(value)) for value in values.split(",")])
+    return [dict(combination) for combination in itertools.product(*grid)]
+
+
+def _limit_threads():
+    """
+    Keep a sweep worker to one thread, so concurrent variants do not oversubscribe the cores.
+
+    The environment variables cover libraries loaded from here on; numpy's BLAS is
+    already loaded (the pool forks after spaCy is imported), so its pool is capped
+    through threadpoolctl, and torch's through set_num_threads if it is loaded.
+    """
+    for name in THREAD_LIMIT_VARIABLES:
+        os.environ[name] = "1"
+    if threadpool_limits is not None:
+        # Kept for the life of the worker process
+        _limit_threads.limits = threadpool_limits(limits=1)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(1)
+
+
+def _train_variant(task):
+    """Train one sweep variant in a worker process."""
+    variant, corpus, output_dir, base_model, n_iter, patience, seed = task
+    nlp = create_pipeline(corpus["labels"], base_model)
+    train_examples = load_examples(corpus["train_path"], nlp)
+    dev_examples = load_examples(corpus["dev_path"], nlp)
+    log = train_ner_model(nlp, train_examples, dev_examples, output_dir, n_iter=n_iter, patience=patience,
+                          seed=seed, **variant)
+    return {
+        "variant": variant,
+        "output_dir": output_dir,
+        "best_f": max(entry["ents_f"] for entry in log),
+        "epochs": len(log),
+        "seconds": sum(entry["seconds"] for entry in log),
+    }
+
+
+def sweep(corpus, variants, output_dir=MODEL_DIR, workers=None, base_model=None, n_iter=30, patience=0, seed=0):
+    """
+    Train hyperparameter variants concurrently and keep the best one by dev F1.
+
+    Each variant trains in its own process, limited to one BLAS/OpenMP thread (see
+    _limit_threads), and saves its best model under <output_dir>_sweep/variant-<n>;
+    the winner is copied to `output_dir`.
+
+    Returns:
+        list: One result dict per variant, best first
+    """
+    sweep_dir = f"{output_dir.rstrip('/')}_sweep"
+    tasks = [(variant, corpus, os.path.join(sweep_dir, f"variant-{i}"), base_model, n_iter, patience, seed)
+             for i, variant in enumerate(variants)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or min(len(tasks), os.cpu_count() or 1),
+                             initializer=_limit_threads) as pool:
+        results = list(pool.map(_train_variant, tasks))
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda result: -result["best_f"])
+    print(f"\nTrained {len(results)} variants in {elapsed:.1f}s "
+          f"({sum(result['seconds'] for result in results):.1f}s of training summed over variants)")
+    for result in results:
+        print(f"  F {result['best_f']:.3f}  {result['epochs']:3d} epochs  {result['seconds']:7.1f}s  {result['variant']}")
+
+    shutil.copytree(results[0]["output_dir"], output_dir, dirs_exist_ok=True)
+    print(f"Best variant {results[0]['variant']} copied to {output_dir}")
+    return results
+
+
 def main():
-    # Parameters
-    json_file_path = "data/json/traindata.json"  # Path to the single JSON file
-    output_dir = "models/resume_ner_model"
-    n_iter = 30
-
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Load the single JSON file
-    json_data = load_json_file(json_file_path)
-    if not json_data:
-        print(f"Failed to load JSON file: {json_file_path}")
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--mode", choices=("loop", "spacy", "sweep"), default="loop",
+                            help="Training loop in this process, `spacy train`, or a concurrent hyperparameter sweep")
+    arg_parser.add_argument("--workers", type=int, default=4,
+                            help="Corpus loader threads, or concurrent variants in sweep mode")
+    arg_parser.add_argument("--sweep", nargs="+", default=["dropout=0.1,0.2,0.3"],
+                            help="Sweep variants as name=v1,v2 for " + ", ".join(SWEEP_PARAMETERS))
+    arg_parser.add_argument("--source", default=SOURCE_PATH, help="Processed shards or Dataturks export to compile")
+    arg_parser.add_argument("--corpus", default=CORPUS_DIR, help="Compiled corpus directory")
+    arg_parser.add_argument("--output", default=MODEL_DIR, help="Where the best model is saved")
+    arg_parser.add_argument("--base-model", default=None, help="Pipeline to start from (default: blank 'en')")
+    arg_parser.add_argument("--n-iter", type=int, default=30, help="Maximum number of epochs")
+    arg_parser.add_argument("--dropout", type=float, default=0.2)
+    arg_parser.add_argument("--batch-start", type=float, default=4.0, help="Initial minibatch size")
+    arg_parser.add_argument("--batch-stop", type=float, default=32.0, help="Maximum minibatch size")
+    arg_parser.add_argument("--batch-compound", type=float, default=1.001, help="Minibatch size growth per batch")
+    arg_parser.add_argument("--patience", type=int, default=0,
+                            help="Epochs without dev F1 improvement before stopping (0: train all epochs)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    try:
+        corpus = compile_corpus(args.source, args.corpus)
+    except FileNotFoundError as e:
+        print(e)
         return
 
-    # Prepare training data
-    training_data = []
-    for item in json_data:  # Iterate over the list of JSON objects
-        example = prepare_training_data(item)
-        if example:
-            text, annotations = example
-            try:
-                nlp = spacy.blank("en")  # Use a blank model for validation
-                if validate_entities(nlp, text, annotations["entities"]):
-                    training_data.append(example)
-                else:
-                    print("Skipping misaligned example.")
-            except Exception as e:
-                print(f"Error during validation: {e}")
-        else:
-            print("No valid training data found in the JSON file.")
-
-    print(f"Prepared {len(training_data)} training examples")
-
-    if not training_data:
+    os.makedirs(args.output, exist_ok=True)
+    if args.mode == "spacy":
+        train_with_spacy(corpus, args.output, workers=args.workers, n_iter=args.n_iter, dropout=args.dropout,
+                         seed=args.seed)
+        return
+    if args.mode == "sweep":
+        sweep(corpus, parse_sweep(args.sweep), args.output, workers=args.workers, base_model=args.base_model,
+              n_iter=args.n_iter, patience=args.patience, seed=args.seed)
+        return
+
+    nlp = create_pipeline(corpus["labels"], args.base_model)
+    train_examples = load_examples(corpus["train_path"], nlp, workers=args.workers)
+    dev_examples = load_examples(corpus["dev_path"], nlp, workers=args.workers)
+    if not train_examples:
         print("No valid training data found.")
         return
 
-    # Train model
-    model = train_ner_model(training_data, output_dir, n_iter=n_iter)
+    train_ner_model(nlp, train_examples, dev_examples, args.output, n_iter=args.n_iter, dropout=args.dropout,
+                    batch_start=args.batch_start, batch_stop=args.batch_stop,
+                    batch_compound=args.batch_compound, patience=args.patience, seed=args.seed)
 
-    # Test on a sample
-    sample = """
-    Afreen Jamadar
-    Active member of IIIT Committee in Third year
-    Sangli, Maharashtra - Email me on Indeed: indeed.com/r/Afreen-Jamadar/8baf379b705e37c6
-    """
-    doc = model(sample)
-    print("\nEntities in sample text:")
-    for ent in doc.ents:
-        print(f"{ent.text} - {ent.label_} ({ent.start_char}:{ent.end_char})")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()